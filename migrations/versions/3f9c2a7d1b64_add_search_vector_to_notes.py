@@ -0,0 +1,42 @@
+"""add search vector to notes
+
+Revision ID: 3f9c2a7d1b64
+Revises: 128bf2567ae9
+Create Date: 2026-10-18 14:20:11.302514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1b64'
+down_revision: Union[str, Sequence[str], None] = '128bf2567ae9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A coluna é STORED, então o Postgres preenche as notas existentes ao adicioná-la.
+    # Só o início do conteúdo é indexado, já que tsvectors acima de 1 MB são recusados
+    op.add_column('notes', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('portuguese', coalesce(title, '')), 'A')"
+            " || setweight(to_tsvector('portuguese', left(coalesce(content, ''), 100000)), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_notes_search_vector', 'notes', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notes_search_vector', table_name='notes', postgresql_using='gin')
+    op.drop_column('notes', 'search_vector')
@@ -0,0 +1,62 @@
+"""add keyset indexes for note listings
+
+Revision ID: 4a9d2c7e813b
+Revises: e2d84b7f95a1
+Create Date: 2026-10-18 17:12:40.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9d2c7e813b'
+down_revision: Union[str, Sequence[str], None] = 'e2d84b7f95a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Notas atualizadas por transação no preenchimento do updated_at
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('notes', 'updated_at', existing_type=sa.DateTime(timezone=True), server_default=sa.text('now()'))
+    # Notas nunca editadas passam a usar a data de criação como última atualização.
+    # Cada lote é uma transação curta, para não prender as linhas da tabela inteira
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while bind.execute(
+            sa.text(
+                'UPDATE notes SET updated_at = coalesce(created_at, now()) '
+                'WHERE id IN (SELECT id FROM notes WHERE updated_at IS NULL LIMIT :batch_size)'
+            ),
+            {'batch_size': BACKFILL_BATCH_SIZE},
+        ).rowcount:
+            pass
+    # Com um CHECK já validado, o SET NOT NULL não precisa varrer a tabela com o
+    # lock exclusivo. O VALIDATE só bloqueia mudanças de schema, não as escritas
+    op.execute('ALTER TABLE notes ADD CONSTRAINT ck_notes_updated_at_not_null CHECK (updated_at IS NOT NULL) NOT VALID')
+    op.execute('ALTER TABLE notes VALIDATE CONSTRAINT ck_notes_updated_at_not_null')
+    op.alter_column('notes', 'updated_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+    op.drop_constraint('ck_notes_updated_at_not_null', 'notes', type_='check')
+    with op.get_context().autocommit_block():
+        op.create_index('ix_notes_user_id_updated_at_id', 'notes', ['user_id', sa.text('updated_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_notes_notebook_id_updated_at_id', 'notes', ['notebook_id', sa.text('updated_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_notes_notebook_id_updated_at_id', table_name='notes', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_notes_user_id_updated_at_id', table_name='notes', postgresql_concurrently=True, if_exists=True)
+    op.alter_column(
+        'notes',
+        'updated_at',
+        existing_type=sa.DateTime(timezone=True),
+        nullable=True,
+        server_default=None,
+    )
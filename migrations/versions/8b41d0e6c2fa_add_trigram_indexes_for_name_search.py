@@ -0,0 +1,36 @@
+"""add trigram indexes for name search
+
+Revision ID: 8b41d0e6c2fa
+Revises: 3f9c2a7d1b64
+Create Date: 2026-10-18 15:02:47.918305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b41d0e6c2fa'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d1b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_notebooks_name_trgm', 'notebooks', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_tags_name_trgm', 'tags', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_templates_name_trgm', 'templates', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_notes_title_trgm', 'notes', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notes_title_trgm', table_name='notes', postgresql_using='gin')
+    op.drop_index('ix_templates_name_trgm', table_name='templates', postgresql_using='gin')
+    op.drop_index('ix_tags_name_trgm', table_name='tags', postgresql_using='gin')
+    op.drop_index('ix_notebooks_name_trgm', table_name='notebooks', postgresql_using='gin')
+    op.execute('DROP EXTENSION IF EXISTS pg_trgm')
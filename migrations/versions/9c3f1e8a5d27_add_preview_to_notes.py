@@ -0,0 +1,34 @@
+"""add preview to notes
+
+Revision ID: 9c3f1e8a5d27
+Revises: 4a9d2c7e813b
+Create Date: 2026-10-18 17:48:22.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f1e8a5d27'
+down_revision: Union[str, Sequence[str], None] = '4a9d2c7e813b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A coluna é STORED, então o Postgres preenche as notas existentes ao adicioná-la
+    op.add_column('notes', sa.Column(
+        'preview',
+        sa.Text(),
+        sa.Computed('left(content, 200)', persisted=True),
+        nullable=True,
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('notes', 'preview')
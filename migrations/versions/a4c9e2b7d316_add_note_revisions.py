@@ -0,0 +1,42 @@
+"""add note revisions
+
+Revision ID: a4c9e2b7d316
+Revises: f1b6c3d9e482
+Create Date: 2026-10-18 23:12:40.517293
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c9e2b7d316'
+down_revision: Union[str, Sequence[str], None] = 'f1b6c3d9e482'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'note_revisions',
+        sa.Column('note_id', sa.UUID(), nullable=False),
+        sa.Column('number', sa.Integer(), nullable=False),
+        sa.Column('note_version', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('delta', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('saved_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('statement_timestamp()'), nullable=False),
+        sa.CheckConstraint('(content IS NULL) <> (delta IS NULL)', name='ck_note_revisions_content_or_delta'),
+        sa.ForeignKeyConstraint(['note_id'], ['notes.id'], name='fk_note_revision_note_id', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('note_id', 'number'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('note_revisions')
@@ -0,0 +1,28 @@
+"""add version to notes
+
+Revision ID: b7e2f4a91c60
+Revises: 9c3f1e8a5d27
+Create Date: 2026-10-18 18:25:09.871356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2f4a91c60'
+down_revision: Union[str, Sequence[str], None] = '9c3f1e8a5d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('notes', 'version')
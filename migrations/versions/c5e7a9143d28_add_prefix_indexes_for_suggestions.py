@@ -0,0 +1,35 @@
+"""add prefix indexes for suggestions
+
+Revision ID: c5e7a9143d28
+Revises: 8b41d0e6c2fa
+Create Date: 2026-10-18 15:48:36.120947
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e7a9143d28'
+down_revision: Union[str, Sequence[str], None] = '8b41d0e6c2fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Collation "C" permite usar o índice tanto no LIKE 'prefixo%' quanto na ordenação
+    op.create_index('ix_notebooks_user_id_name_prefix', 'notebooks', ['user_id', sa.text('(lower(name) COLLATE "C")')], unique=False)
+    op.create_index('ix_tags_user_id_name_prefix', 'tags', ['user_id', sa.text('(lower(name) COLLATE "C")')], unique=False)
+    op.create_index('ix_templates_user_id_name_prefix', 'templates', ['user_id', sa.text('(lower(name) COLLATE "C")')], unique=False)
+    op.create_index('ix_notes_user_id_title_prefix', 'notes', ['user_id', sa.text('(lower(title) COLLATE "C")')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notes_user_id_title_prefix', table_name='notes')
+    op.drop_index('ix_templates_user_id_name_prefix', table_name='templates')
+    op.drop_index('ix_tags_user_id_name_prefix', table_name='tags')
+    op.drop_index('ix_notebooks_user_id_name_prefix', table_name='notebooks')
@@ -0,0 +1,30 @@
+"""add row version to notes
+
+Revision ID: c8e1f5a3b79d
+Revises: a4c9e2b7d316
+Create Date: 2026-10-18 22:14:37.402915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e1f5a3b79d'
+down_revision: Union[str, Sequence[str], None] = 'a4c9e2b7d316'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Com um default constante o ADD COLUMN só altera o catálogo, sem reescrever
+    # a tabela. A coluna version passa a contar apenas as mudanças do conteúdo
+    op.add_column('notes', sa.Column('row_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('notes', 'row_version')
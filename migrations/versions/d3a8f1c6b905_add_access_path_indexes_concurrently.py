@@ -0,0 +1,41 @@
+"""add access path indexes concurrently
+
+Revision ID: d3a8f1c6b905
+Revises: b7e2f4a91c60
+Create Date: 2026-10-18 20:41:09.573218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8f1c6b905'
+down_revision: Union[str, Sequence[str], None] = 'b7e2f4a91c60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY não roda dentro de transação e não bloqueia as escritas nas
+    # tabelas. O IF NOT EXISTS permite repetir a migration se um build falhar no meio
+    with op.get_context().autocommit_block():
+        op.create_index('ix_notes_user_id_favorite_updated_at_id', 'notes', ['user_id', sa.text('updated_at DESC'), sa.text('id DESC')], unique=False, postgresql_where=sa.text('is_favorite'), postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_notebooks_user_id_favorite_updated_at', 'notebooks', ['user_id', sa.text('updated_at DESC NULLS LAST')], unique=False, postgresql_where=sa.text('is_favorite'), postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_templates_user_id_created_at', 'templates', ['user_id', sa.text('created_at DESC NULLS LAST')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        # Os índices compostos que começam por user_id já atendem as buscas por usuário
+        op.drop_index('ix_notes_user_id', table_name='notes', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_templates_user_id', table_name='templates', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_templates_user_id', 'templates', ['user_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_notes_user_id', 'notes', ['user_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_templates_user_id_created_at', table_name='templates', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_notebooks_user_id_favorite_updated_at', table_name='notebooks', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_notes_user_id_favorite_updated_at_id', table_name='notes', postgresql_concurrently=True, if_exists=True)
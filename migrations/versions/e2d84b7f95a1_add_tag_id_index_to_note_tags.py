@@ -0,0 +1,31 @@
+"""add tag id index to note tags
+
+Revision ID: e2d84b7f95a1
+Revises: c5e7a9143d28
+Create Date: 2026-10-18 16:31:05.774210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2d84b7f95a1'
+down_revision: Union[str, Sequence[str], None] = 'c5e7a9143d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY não bloqueia as escritas em note_tags durante o build
+    with op.get_context().autocommit_block():
+        op.create_index('ix_note_tags_tag_id_note_id', 'note_tags', ['tag_id', 'note_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_note_tags_tag_id_note_id', table_name='note_tags', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,120 @@
+"""add sync tracking
+
+Revision ID: f1b6c3d9e482
+Revises: d3a8f1c6b905
+Create Date: 2026-10-18 21:37:52.104865
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6c3d9e482'
+down_revision: Union[str, Sequence[str], None] = 'd3a8f1c6b905'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = {
+    'notebooks': 'notebook',
+    'notes': 'note',
+    'tags': 'tag',
+    'templates': 'template',
+}
+
+# Cadernos atualizados por transação no preenchimento do updated_at
+BACKFILL_BATCH_SIZE = 10000
+
+# Id da transação que grava a linha, em bigint para ser comparado e indexado
+CURRENT_XACT_ID = sa.text('pg_current_xact_id()::text::bigint')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'tombstones',
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('statement_timestamp()'), nullable=False),
+        sa.Column('sync_xid', sa.BigInteger(), server_default=CURRENT_XACT_ID, nullable=False),
+        sa.PrimaryKeyConstraint('entity_type', 'entity_id'),
+    )
+    op.create_index('ix_tombstones_user_id_sync_xid_entity_id', 'tombstones', ['user_id', 'sync_xid', 'entity_id'], unique=False)
+
+    op.alter_column('notebooks', 'updated_at', existing_type=sa.DateTime(timezone=True), server_default=sa.text('statement_timestamp()'))
+    # Cadernos nunca editados passam a usar a data de criação como última atualização.
+    # Cada lote é uma transação curta, para não prender as linhas da tabela inteira
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while bind.execute(
+            sa.text(
+                'UPDATE notebooks SET updated_at = coalesce(created_at, statement_timestamp()) '
+                'WHERE id IN (SELECT id FROM notebooks WHERE updated_at IS NULL LIMIT :batch_size)'
+            ),
+            {'batch_size': BACKFILL_BATCH_SIZE},
+        ).rowcount:
+            pass
+    # Com um CHECK já validado, o SET NOT NULL não precisa varrer a tabela com o
+    # lock exclusivo. O VALIDATE só bloqueia mudanças de schema, não as escritas
+    op.execute('ALTER TABLE notebooks ADD CONSTRAINT ck_notebooks_updated_at_not_null CHECK (updated_at IS NOT NULL) NOT VALID')
+    op.execute('ALTER TABLE notebooks VALIDATE CONSTRAINT ck_notebooks_updated_at_not_null')
+    op.alter_column('notebooks', 'updated_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+    op.drop_constraint('ck_notebooks_updated_at_not_null', 'notebooks', type_='check')
+    op.alter_column('notes', 'updated_at', existing_type=sa.DateTime(timezone=True), server_default=sa.text('statement_timestamp()'))
+    op.add_column('tags', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('statement_timestamp()'), nullable=False))
+    op.add_column('templates', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('statement_timestamp()'), nullable=False))
+    for table in SYNCED_TABLES:
+        # O default constante só muda o catálogo: as linhas existentes ficam com 0,
+        # já confirmadas, e só as gravadas depois recebem o id da transação
+        op.add_column(table, sa.Column('sync_xid', sa.BigInteger(), server_default='0', nullable=False))
+        op.alter_column(table, 'sync_xid', existing_type=sa.BigInteger(), server_default=CURRENT_XACT_ID)
+
+    # Trigger por comando com a tabela de transição: uma exclusão em cascata de
+    # milhares de notas grava todas as lápides com um único INSERT ... SELECT
+    op.execute("""
+        CREATE FUNCTION record_tombstones() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO tombstones (entity_type, entity_id, user_id)
+            SELECT TG_ARGV[0], deleted_rows.id, deleted_rows.user_id FROM deleted_rows
+            ON CONFLICT (entity_type, entity_id)
+            DO UPDATE SET deleted_at = excluded.deleted_at, user_id = excluded.user_id,
+                sync_xid = excluded.sync_xid;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table, entity_type in SYNCED_TABLES.items():
+        op.execute(
+            f'CREATE TRIGGER {table}_record_tombstones AFTER DELETE ON {table} '
+            'REFERENCING OLD TABLE AS deleted_rows FOR EACH STATEMENT '
+            f"EXECUTE FUNCTION record_tombstones('{entity_type}')"
+        )
+
+    # Os índices das tabelas existentes são criados sem bloquear as escritas
+    with op.get_context().autocommit_block():
+        for table in SYNCED_TABLES:
+            op.create_index(f'ix_{table}_user_id_sync_xid_id', table, ['user_id', 'sync_xid', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in SYNCED_TABLES:
+            op.drop_index(f'ix_{table}_user_id_sync_xid_id', table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table in SYNCED_TABLES:
+        op.execute(f'DROP TRIGGER {table}_record_tombstones ON {table}')
+    op.execute('DROP FUNCTION record_tombstones()')
+
+    for table in SYNCED_TABLES:
+        op.drop_column(table, 'sync_xid')
+
+    op.drop_column('templates', 'updated_at')
+    op.drop_column('tags', 'updated_at')
+    op.alter_column('notes', 'updated_at', existing_type=sa.DateTime(timezone=True), server_default=sa.text('now()'))
+    op.alter_column('notebooks', 'updated_at', existing_type=sa.DateTime(timezone=True), nullable=True, server_default=None)
+    op.drop_index('ix_tombstones_user_id_sync_xid_entity_id', table_name='tombstones')
+    op.drop_table('tombstones')
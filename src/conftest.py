@@ -1,26 +1,82 @@
 """Arquivo de configuração global dos testes com as fixtures"""
 
+import json
+import platform
 import time
 import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
 
 import alembic.command
 import alembic.config
 import pytest
 from fastapi.testclient import TestClient
 from jose import jwt
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete, event
 from sqlalchemy.orm import sessionmaker
 
+from src.core.cache import user_data_generations
 from src.core.config import settings
 from src.core.database import get_db
+from src.core.models import Notebook, Tag, Template, Tombstone
 from src.main import app
+from src.modules.notebooks.service import quick_capture_notebook_ids
+from src.modules.search.service import search_cache
 
 TEST_DATABASE_URL = settings.DATABASE_URL
 engine = create_engine(TEST_DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 TEST_USER_ID = uuid.uuid4()
 
+BENCHMARK_DEFAULT_SIZES = "100,500,2000"
+BENCHMARK_DEFAULT_REPORT = "benchmark_report.json"
+
+
+def pytest_addoption(parser):
+    """Registra as opções de linha de comando dos benchmarks"""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Executa os testes marcados com @pytest.mark.benchmark",
+    )
+    group.addoption(
+        "--benchmark-sizes",
+        default=BENCHMARK_DEFAULT_SIZES,
+        help="Quantidades de notas por usuário no corpus, separadas por vírgula",
+    )
+    group.addoption(
+        "--benchmark-report",
+        default=BENCHMARK_DEFAULT_REPORT,
+        help="Caminho do relatório JSON gerado pelos benchmarks",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Pula os benchmarks quando a opção --benchmark não é passada"""
+    if config.getoption("--benchmark"):
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="use --benchmark para executar")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+def pytest_generate_tests(metafunc):
+    """Parametriza os benchmarks com os tamanhos de corpus pedidos"""
+    if "corpus_size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--benchmark-sizes")
+        metafunc.parametrize(
+            "corpus_size", [int(size) for size in sizes.split(",") if size.strip()]
+        )
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_database():
@@ -32,6 +88,32 @@ def setup_database():
     alembic.command.downgrade(alembic_cfg, "base")
 
 
+@pytest.fixture(scope="session")
+def benchmark_report(request):
+    """Acumula as medições dos benchmarks e grava o relatório JSON no fim da sessão"""
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "results": [],
+    }
+    yield report
+
+    if report["results"]:
+        path = Path(request.config.getoption("--benchmark-report"))
+        path.write_text(
+            json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+
+
+@pytest.fixture(autouse=True)
+def clear_in_memory_caches():
+    """Limpa os caches em memória para que um teste não reaproveite dados de outro"""
+    search_cache.clear()
+    quick_capture_notebook_ids.clear()
+    user_data_generations.clear()
+    yield
+
+
 @pytest.fixture
 def db_session():
     """Fornece uma sessão limpa do banco para cada teste"""
@@ -45,6 +127,54 @@ def db_session():
     connection.close()
 
 
+@pytest.fixture
+def committed_db_session():
+    """
+    Fornece uma sessão cujos commits são confirmados de fato, para os testes que
+    dependem de transações separadas. No fim apaga os dados do usuário de teste
+    """
+    session = TestingSessionLocal()
+    yield session
+    session.rollback()
+    # As notas são apagadas em cascata com os cadernos, e as lápides por último
+    for model in (Notebook, Tag, Template, Tombstone):
+        session.execute(delete(model).where(model.user_id == TEST_USER_ID))
+    session.commit()
+    session.close()
+
+
+@pytest.fixture
+def other_db_session():
+    """Fornece uma segunda sessão, com conexão própria, para simular outro cliente"""
+    session = TestingSessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Fornece um gerenciador de contexto que registra os comandos SQL executados
+    dentro dele, para detectar consultas repetidas como o N+1
+    """
+
+    @contextmanager
+    def counter():
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return counter
+
+
 @pytest.fixture
 def client(db_session):
     """Fornece um TestClient com a dependência do Banco sobrescrita"""
@@ -74,6 +204,16 @@ def auth_headers() -> dict[str, str]:
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def auth_headers_for() -> Callable[[uuid.UUID], dict[str, str]]:
+    """Fixture que retorna uma função que cria headers de autenticação por user_id"""
+
+    def make_headers(user_id: uuid.UUID) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_test_access_token(user_id)}"}
+
+    return make_headers
+
+
 @pytest.fixture
 def created_notebook(client: TestClient, auth_headers: dict) -> dict:
     """
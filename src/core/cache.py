@@ -0,0 +1,98 @@
+"""Arquivo com os caches em memória compartilhados pelos módulos da aplicação"""
+
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from src.core.config import settings
+
+
+class TTLCache:
+    """
+    Cache LRU com tamanho máximo em que cada entrada expira depois de ttl segundos.
+    É protegido por lock porque as rotas síncronas rodam em uma threadpool.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Retorna o valor salvo na chave ou None se ele não existir ou já tiver expirado"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Salva o valor na chave, descartando as entradas menos usadas se passar do limite"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """Remove a chave do cache, caso ela exista"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        with self._lock:
+            self._entries.clear()
+
+
+class UserGenerations:
+    """
+    Contador de geração por usuário. Toda escrita nos dados de um usuário incrementa
+    a geração dele, e os caches que usam a geração na chave deixam de ser usados.
+
+    As gerações ficam em um TTLCache com o TTL do cache de busca, que já descartou
+    as entradas de uma geração quando ela expira. Uma geração expirada ou descartada
+    é trocada por um número nunca usado, para não coincidir com chaves antigas.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._generations = TTLCache(max_entries=max_entries, ttl=ttl)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, user_id: uuid.UUID) -> int:
+        """Retorna a geração atual dos dados do usuário"""
+        with self._lock:
+            generation = self._generations.get(user_id)
+            if generation is None:
+                generation = next(self._counter)
+                self._generations.set(user_id, generation)
+            return generation
+
+    def bump(self, user_id: uuid.UUID):
+        """Troca a geração dos dados do usuário após uma escrita"""
+        with self._lock:
+            self._generations.set(user_id, next(self._counter))
+
+    def clear(self):
+        """Descarta as gerações de todos os usuários"""
+        self._generations.clear()
+
+
+user_data_generations = UserGenerations(
+    max_entries=settings.USER_GENERATIONS_MAX_ENTRIES,
+    ttl=settings.SEARCH_CACHE_TTL_SECONDS,
+)
@@ -19,6 +19,19 @@ class Settings(BaseSettings):
 
     CLIENT_ORIGIN_URL: str
 
+    SEARCH_SNIPPET_MIN_WORDS: int = 15
+    SEARCH_SNIPPET_MAX_WORDS: int = 35
+    SEARCH_SNIPPET_MAX_FRAGMENTS: int = 2
+
+    SEARCH_FUZZY_THRESHOLD: float = 0.4
+
+    SEARCH_CACHE_MAX_ENTRIES: int = 1024
+    SEARCH_CACHE_TTL_SECONDS: float = 60.0
+    USER_GENERATIONS_MAX_ENTRIES: int = 10000
+
+    QUICK_CAPTURE_CACHE_MAX_ENTRIES: int = 10000
+    QUICK_CAPTURE_CACHE_TTL_SECONDS: float = 3600.0
+
     @property
     def DATABASE_URL(self) -> str:
         """Retorna a URL do banco de dados"""
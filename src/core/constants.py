@@ -1,3 +1,44 @@
 """Arquivo com definição das constantes utilizadas pela aplicação"""
 
 QUICK_CAPTURE_NOTEBOOK_NAME = "Capturas Rápidas"
+
+TEXT_SEARCH_CONFIG = "portuguese"
+# Só o início do conteúdo entra no search_vector: o Postgres recusa tsvectors
+# acima de 1 MB, e 100 mil caracteres geram no máximo cerca de metade disso
+SEARCH_INDEXED_CONTENT_LENGTH = 100_000
+
+SEARCH_HIGHLIGHT_START = "<mark>"
+SEARCH_HIGHLIGHT_STOP = "</mark>"
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+SUGGEST_DEFAULT_LIMIT = 5
+SUGGEST_MAX_LIMIT = 20
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SEARCH_STREAM_BATCH_SIZE = 500
+
+NOTES_DEFAULT_LIMIT = 50
+NOTES_MAX_LIMIT = 200
+NOTE_PREVIEW_LENGTH = 200
+NOTES_BULK_MAX_ITEMS = 1000
+
+SYNC_DEFAULT_LIMIT = 500
+SYNC_MAX_LIMIT = 1000
+
+ZIP_MEDIA_TYPE = "application/zip"
+EXPORT_FORMAT_VERSION = 1
+EXPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+IMPORT_MAX_ARCHIVE_SIZE = 100 * 1024 * 1024
+IMPORT_MAX_NOTE_SIZE = 5 * 1024 * 1024
+IMPORT_SPOOL_SIZE = 8 * 1024 * 1024
+IMPORT_BATCH_SIZE = 500
+IMPORT_DEFAULT_NOTEBOOK_NAME = "Importadas"
+
+NOTE_REVISION_SNAPSHOT_INTERVAL = 10
+NOTE_REVISION_COALESCE_SECONDS = 300
+NOTE_REVISIONS_DEFAULT_LIMIT = 50
+NOTE_REVISIONS_MAX_LIMIT = 200
@@ -7,7 +7,11 @@ from .config import settings
 
 engine = create_engine(settings.DATABASE_URL)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Os objetos continuam válidos após o commit: as colunas geradas pelo banco já
+# voltam no RETURNING, então não é preciso recarregá-los com um novo SELECT
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 Base = declarative_base()
 
@@ -0,0 +1,40 @@
+"""Arquivo com as funções das requisições condicionais (ETag / If-None-Match)"""
+
+import hashlib
+
+from fastapi import Response, status
+
+# As respostas dependem do usuário autenticado e devem ser revalidadas a cada uso
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Gera uma ETag forte a partir das partes que identificam a versão da resposta"""
+    raw = ":".join("" if part is None else str(part) for part in parts)
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Verifica se a ETag atual está entre as enviadas no If-None-Match"""
+    if if_none_match is None:
+        return False
+
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+
+    # O If-None-Match usa a comparação fraca, então o prefixo W/ é ignorado
+    return etag in {candidate.removeprefix("W/") for candidate in candidates}
+
+
+def set_etag_headers(response: Response, etag: str):
+    """Adiciona a ETag e o Cache-Control a uma resposta"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified_response(etag: str) -> Response:
+    """Cria a resposta 304, sem corpo, para quando o cliente já tem a versão atual"""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag_headers(response, etag)
+    return response
@@ -0,0 +1,44 @@
+"""Arquivo com as funções do delta de linhas usado no histórico das notas"""
+
+from difflib import SequenceMatcher
+
+# Um delta é uma lista de operações aplicadas em ordem sobre as linhas do texto
+# base: um inteiro positivo copia essa quantidade de linhas, um negativo pula
+# essa quantidade de linhas e uma lista de strings insere essas linhas
+LineDelta = list[int | list[str]]
+
+
+def make_line_delta(base: str, target: str) -> LineDelta:
+    """Calcula o delta que transforma o texto base no texto alvo"""
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+
+    delta: LineDelta = []
+    for tag, base_start, base_end, target_start, target_end in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append(base_end - base_start)
+            continue
+        if base_end > base_start:
+            delta.append(base_start - base_end)
+        if target_end > target_start:
+            delta.append(target_lines[target_start:target_end])
+
+    return delta
+
+
+def apply_line_delta(base: str, delta: LineDelta) -> str:
+    """Aplica ao texto base um delta gerado por make_line_delta"""
+    base_lines = base.splitlines(keepends=True)
+    lines: list[str] = []
+    position = 0
+    for operation in delta:
+        if isinstance(operation, list):
+            lines.extend(operation)
+        elif operation > 0:
+            lines.extend(base_lines[position : position + operation])
+            position += operation
+        else:
+            position -= operation
+
+    return "".join(lines)
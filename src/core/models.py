@@ -3,19 +3,31 @@
 import uuid
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
+    CheckConstraint,
     Column,
+    Computed,
     DateTime,
     ForeignKey,
+    Index,
+    Integer,
     String,
     Table,
     Text,
     UniqueConstraint,
+    cast,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 
+from .constants import (
+    NOTE_PREVIEW_LENGTH,
+    SEARCH_INDEXED_CONTENT_LENGTH,
+    TEXT_SEARCH_CONFIG,
+)
 from .database import Base
 
 note_tags = Table(
@@ -33,25 +45,75 @@ note_tags = Table(
         ForeignKey("tags.id", ondelete="CASCADE", name="fk_notetag_tag_id"),
         primary_key=True,
     ),
+    Index("ix_note_tags_tag_id_note_id", "tag_id", "note_id"),
 )
 
 
+def updated_at_column() -> Column:
+    """
+    Cria a coluna updated_at usada pela ordenação das listagens.
+    Usa o horário do comando, e não o do início da transação (now()), para que
+    as alterações feitas em comandos diferentes de uma transação fiquem em ordem
+    """
+    return Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.statement_timestamp(),
+        onupdate=func.statement_timestamp(),
+    )
+
+
+def sync_xid_column() -> Column:
+    """
+    Cria a coluna sync_xid com o id da última transação que gravou a linha. O
+    /sync só entrega as linhas de transações mais antigas que todas as que ainda
+    estão em andamento, e por isso já confirmadas
+    """
+    return Column(
+        BigInteger,
+        nullable=False,
+        server_default=text("pg_current_xact_id()::text::bigint"),
+        onupdate=cast(cast(func.pg_current_xact_id(), Text), BigInteger),
+    )
+
+
 class Notebook(Base):
     """Tabela para Notebooks"""
 
     __tablename__ = "notebooks"
+    # Traz as colunas geradas pelo banco no próprio INSERT/UPDATE via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     name = Column(String(100), nullable=False, index=True)
     is_favorite = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = updated_at_column()
+    sync_xid = sync_xid_column()
 
     notes = relationship("Note", back_populates="notebook", passive_deletes=True)
 
     __table_args__ = (
         UniqueConstraint("user_id", "name", name="uq_user_notebook_name"),
+        Index(
+            "ix_notebooks_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_notebooks_user_id_name_prefix",
+            "user_id",
+            func.lower(name).collate("C"),
+        ),
+        Index(
+            "ix_notebooks_user_id_favorite_updated_at",
+            "user_id",
+            updated_at.desc().nulls_last(),
+            postgresql_where=is_favorite,
+        ),
+        Index("ix_notebooks_user_id_sync_xid_id", "user_id", "sync_xid", "id"),
     )
 
 
@@ -61,12 +123,15 @@ class Note(Base):
     __tablename__ = "notes"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    # Sem índice próprio: os índices compostos começam por user_id
+    user_id = Column(UUID(as_uuid=True), nullable=False)
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=True)
     is_favorite = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Sempre preenchida para que a paginação por (updated_at, id) não lide com NULL
+    updated_at = updated_at_column()
+    sync_xid = sync_xid_column()
 
     notebook_id = Column(
         UUID(as_uuid=True),
@@ -77,32 +142,202 @@ class Note(Base):
 
     tags = relationship("Tag", secondary=note_tags, back_populates="notes")
 
+    # Coluna gerada pelo Postgres: o título tem peso maior que o conteúdo na busca.
+    # Fica fora do mapeamento (exclude_properties) para não voltar no RETURNING
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A')"
+            f" || setweight(to_tsvector('{TEXT_SEARCH_CONFIG}',"
+            f" left(coalesce(content, ''), {SEARCH_INDEXED_CONTENT_LENGTH})), 'B')",
+            persisted=True,
+        ),
+    )
+
+    # Início do conteúdo guardado fora do TOAST, para as listagens resumidas
+    preview = deferred(
+        Column(
+            Text,
+            Computed(f"left(content, {NOTE_PREVIEW_LENGTH})", persisted=True),
+        )
+    )
+
+    # Versão do conteúdo: só muda quando o conteúdo muda, e é a base das edições
+    # enviadas no content_patch
+    version = Column(Integer, nullable=False, server_default="1")
+    # Incrementada pelo SQLAlchemy a cada UPDATE, que só é aplicado se a versão
+    # da linha no banco ainda for a que foi lida
+    row_version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {
+        "eager_defaults": True,
+        "exclude_properties": ["search_vector"],
+        "version_id_col": row_version,
+    }
+
+    __table_args__ = (
+        Index("ix_notes_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_notes_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_notes_user_id_title_prefix",
+            "user_id",
+            func.lower(title).collate("C"),
+        ),
+        Index(
+            "ix_notes_user_id_updated_at_id",
+            "user_id",
+            updated_at.desc(),
+            id.desc(),
+        ),
+        Index(
+            "ix_notes_notebook_id_updated_at_id",
+            "notebook_id",
+            updated_at.desc(),
+            id.desc(),
+        ),
+        Index(
+            "ix_notes_user_id_favorite_updated_at_id",
+            "user_id",
+            updated_at.desc(),
+            id.desc(),
+            postgresql_where=is_favorite,
+        ),
+        Index("ix_notes_user_id_sync_xid_id", "user_id", "sync_xid", "id"),
+    )
+
 
 class Tag(Base):
     """Tabela para Tags"""
 
     __tablename__ = "tags"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     name = Column(String(20), nullable=False)
+    updated_at = updated_at_column()
+    sync_xid = sync_xid_column()
 
     notes = relationship("Note", secondary=note_tags, back_populates="tags")
 
-    __table_args__ = (UniqueConstraint("user_id", "name", name="uq_user_tag_name"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_user_tag_name"),
+        Index(
+            "ix_tags_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index("ix_tags_user_id_name_prefix", "user_id", func.lower(name).collate("C")),
+        Index("ix_tags_user_id_sync_xid_id", "user_id", "sync_xid", "id"),
+    )
 
 
 class Template(Base):
     """Tabela para Templates"""
 
     __tablename__ = "templates"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    # Sem índice próprio: os índices compostos começam por user_id
+    user_id = Column(UUID(as_uuid=True), nullable=False)
     name = Column(String(200), index=True)
     content = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = updated_at_column()
+    sync_xid = sync_xid_column()
 
     __table_args__ = (
         UniqueConstraint("user_id", "name", name="uq_user_template_name"),
+        Index(
+            "ix_templates_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_templates_user_id_name_prefix",
+            "user_id",
+            func.lower(name).collate("C"),
+        ),
+        Index(
+            "ix_templates_user_id_created_at",
+            "user_id",
+            created_at.desc().nulls_last(),
+        ),
+        Index("ix_templates_user_id_sync_xid_id", "user_id", "sync_xid", "id"),
+    )
+
+
+class Tombstone(Base):
+    """
+    Tabela com os registros apagados, preenchida por triggers no banco para que
+    as exclusões em cascata também sejam registradas. É lida pelo /sync
+    """
+
+    __tablename__ = "tombstones"
+
+    entity_type = Column(String(20), primary_key=True)
+    entity_id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    deleted_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.statement_timestamp(),
+    )
+    # Id da transação que apagou a entidade, preenchido pelo default no trigger
+    sync_xid = Column(
+        BigInteger,
+        nullable=False,
+        server_default=text("pg_current_xact_id()::text::bigint"),
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_tombstones_user_id_sync_xid_entity_id",
+            "user_id",
+            "sync_xid",
+            "entity_id",
+        ),
+    )
+
+
+class NoteRevision(Base):
+    """
+    Tabela com as versões anteriores das notas. A cada NOTE_REVISION_SNAPSHOT_INTERVAL
+    revisões uma guarda o conteúdo completo, e as do meio guardam só o delta de
+    linhas em relação à revisão anterior
+    """
+
+    __tablename__ = "note_revisions"
+
+    note_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("notes.id", ondelete="CASCADE", name="fk_note_revision_note_id"),
+        primary_key=True,
+    )
+    number = Column(Integer, primary_key=True)
+    note_version = Column(Integer, nullable=False)
+    title = Column(String(200), nullable=False)
+    content = Column(Text, nullable=True)
+    delta = Column(JSONB, nullable=True)
+    # Quando a nota ficou com esse conteúdo e quando ele foi guardado no histórico
+    saved_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.statement_timestamp(),
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            "(content IS NULL) <> (delta IS NULL)",
+            name="ck_note_revisions_content_or_delta",
+        ),
     )
@@ -0,0 +1,49 @@
+"""Arquivo com as funções que codificam os cursores opacos de paginação"""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(position: dict) -> str:
+    """Codifica a posição da última página em um cursor opaco"""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decodifica um cursor gerado por encode_cursor e retorna a posição salva nele"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError) as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        ) from err
+
+    if not isinstance(position, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        )
+
+    return position
+
+
+def encode_keyset_cursor(timestamp_key: str, timestamp: datetime, row_id: uuid.UUID) -> str:
+    """Codifica a posição (timestamp, id) da última linha de uma página por keyset"""
+    return encode_cursor({timestamp_key: timestamp.isoformat(), "id": str(row_id)})
+
+
+def decode_keyset_cursor(cursor: str, timestamp_key: str) -> tuple[datetime, uuid.UUID]:
+    """Decodifica um cursor gerado por encode_keyset_cursor na posição (timestamp, id)"""
+    position = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(position[timestamp_key]), uuid.UUID(position["id"])
+    except (KeyError, TypeError, ValueError) as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        ) from err
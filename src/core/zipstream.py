@@ -0,0 +1,63 @@
+"""Arquivo com o gerador de arquivos zip enviados em stream"""
+
+import io
+import zipfile
+from datetime import datetime
+from typing import IO
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """
+    Saída do zipfile que só acumula os bytes escritos até serem retirados.
+    Não é seekable, então o zipfile grava os tamanhos em data descriptors
+    depois de cada arquivo em vez de voltar para corrigir o cabeçalho
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.data.extend(b)
+        return len(b)
+
+
+class ZipStream(zipfile.ZipFile):
+    """
+    Zip montado aos poucos: cada arquivo é comprimido ao ser adicionado e os
+    bytes já prontos são retirados com flush, sem manter o zip inteiro em memória
+    """
+
+    def __init__(self):
+        self._buffer = _ChunkBuffer()
+        super().__init__(self._buffer, mode="w", compression=zipfile.ZIP_DEFLATED)
+
+    @property
+    def pending_size(self) -> int:
+        """Quantidade de bytes prontos que ainda não foram retirados"""
+        return len(self._buffer.data)
+
+    def open_entry(self, name: str, date_time: datetime | None = None) -> IO[bytes]:
+        """Abre um arquivo do zip para ser escrito em partes"""
+        info = zipfile.ZipInfo(name, (date_time or datetime.now()).timetuple()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return self.open(info, mode="w")
+
+    def write_text(self, name: str, data: str, date_time: datetime | None = None):
+        """Adiciona ao zip um arquivo de texto completo"""
+        with self.open_entry(name, date_time) as file:
+            file.write(data.encode())
+
+    def flush(self) -> bytes:
+        """Retira os bytes prontos do zip"""
+        chunk = bytes(self._buffer.data)
+        self._buffer.data.clear()
+        return chunk
+
+    def finish(self) -> bytes:
+        """Grava o diretório central do zip e retorna os últimos bytes"""
+        self.close()
+        return self.flush()
@@ -7,10 +7,12 @@ from .core.config import settings
 
 # Routers
 from .modules.dashboard.router import router as dashboard_router
+from .modules.note_revisions.router import router as note_revision_router
 from .modules.notebooks.router import router as notebook_router
 from .modules.notes.router import base_router as base_notes_router
 from .modules.notes.router import router as note_router
 from .modules.search.router import router as search_router
+from .modules.sync.router import router as sync_router
 from .modules.tags.router import router as tag_router
 from .modules.templates.router import router as template_router
 from .modules.users.router import router as user_router
@@ -30,8 +32,10 @@ app.add_middleware(
 app.include_router(notebook_router)
 app.include_router(note_router)
 app.include_router(base_notes_router)
+app.include_router(note_revision_router)
 app.include_router(tag_router)
 app.include_router(template_router)
 app.include_router(dashboard_router)
 app.include_router(search_router)
+app.include_router(sync_router)
 app.include_router(user_router)
@@ -3,7 +3,7 @@
 import uuid
 
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from src.core.models import Note, Notebook, Tag, Template, note_tags
 
@@ -16,8 +16,9 @@ class DashboardRepository:
         """Busca as 5 notas mais recentemente atualizadas no banco de dados."""
         return (
             db.query(Note)
+            .options(selectinload(Note.tags))
             .filter(Note.user_id == user_id)
-            .order_by(Note.updated_at.desc().nulls_last())
+            .order_by(Note.updated_at.desc(), Note.id.desc())
             .limit(limit)
             .all()
         )
@@ -29,8 +30,9 @@ class DashboardRepository:
         """Busca 5 notas marcadas como favorita ordenadas pela data de atualização"""
         return (
             db.query(Note)
+            .options(selectinload(Note.tags))
             .filter(Note.is_favorite, Note.user_id == user_id)
-            .order_by(Note.updated_at.desc().nulls_last())
+            .order_by(Note.updated_at.desc(), Note.id.desc())
             .limit(limit)
             .all()
         )
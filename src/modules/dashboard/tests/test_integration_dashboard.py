@@ -76,3 +76,48 @@ class TestDashboardRoutes:
 
         assert len(data["recent_templates"]) > 0
         assert data["recent_templates"][0]["id"] == template_id
+
+    def test_dashboard_loads_note_tags_without_one_query_per_note(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        auth_headers: dict,
+        count_queries,
+    ):
+        """
+        Testa se a quantidade de consultas do dashboard não cresce com o número de
+        notas exibidas, ou seja, se as tags das notas são carregadas em lote
+        """
+        notebook_id = created_notebook["id"]
+        tag_id = client.post(
+            "/tags/", json={"name": "Tag em lote"}, headers=auth_headers
+        ).json()["id"]
+
+        def create_tagged_favorite_notes(amount: int):
+            for index in range(amount):
+                note_id = client.post(
+                    f"/notebooks/{notebook_id}/notes/",
+                    json={"title": f"Nota favorita {index}"},
+                    headers=auth_headers,
+                ).json()["id"]
+                client.patch(
+                    f"/notebooks/{notebook_id}/notes/{note_id}",
+                    json={"is_favorite": True},
+                    headers=auth_headers,
+                )
+                client.post(
+                    f"/notebooks/{notebook_id}/notes/{note_id}/tags/{tag_id}",
+                    headers=auth_headers,
+                )
+
+        def count_dashboard_queries() -> int:
+            with count_queries() as statements:
+                response = client.get("/dashboard/", headers=auth_headers)
+            assert response.status_code == 200
+            return len(statements)
+
+        create_tagged_favorite_notes(1)
+        queries_with_one_note = count_dashboard_queries()
+        create_tagged_favorite_notes(4)
+
+        assert count_dashboard_queries() == queries_with_one_note
@@ -38,6 +38,7 @@ class TestUnitDashboardService:
             notebook_id=notebook_id,
             created_at=now,
             updated_at=now,
+            version=1,
             user_id=TEST_USER_ID,
         )
         mock_fav_note = Note(
@@ -47,6 +48,7 @@ class TestUnitDashboardService:
             notebook_id=notebook_id,
             created_at=now,
             updated_at=now,
+            version=1,
             user_id=TEST_USER_ID,
         )
         mock_fav_notebook = Notebook(
@@ -0,0 +1,140 @@
+"""Repository do Módulo de Note Revisions"""
+
+import json
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.orm import Session, load_only
+
+from src.core.constants import (
+    NOTE_REVISION_COALESCE_SECONDS,
+    NOTE_REVISION_SNAPSHOT_INTERVAL,
+)
+from src.core.line_delta import apply_line_delta, make_line_delta
+from src.core.models import NoteRevision
+
+
+class NoteRevisionRepository:
+    """Classe do Repository de Note Revisions com os métodos que conversam com o banco"""
+
+    @staticmethod
+    def get_latest_revision(db: Session, note_id: uuid.UUID) -> Row | None:
+        """
+        Retorna o número da última revisão da nota e se ela foi guardada há menos
+        de NOTE_REVISION_COALESCE_SECONDS
+        """
+        window = timedelta(seconds=NOTE_REVISION_COALESCE_SECONDS)
+        query = (
+            select(
+                NoteRevision.number,
+                (NoteRevision.created_at > func.statement_timestamp() - window).label(
+                    "is_recent"
+                ),
+            )
+            .where(NoteRevision.note_id == note_id)
+            .order_by(NoteRevision.number.desc())
+            .limit(1)
+        )
+        return db.execute(query).first()
+
+    @staticmethod
+    def get_revision(
+        db: Session, note_id: uuid.UUID, number: int
+    ) -> NoteRevision | None:
+        """Busca uma revisão da nota pelo número"""
+        return db.get(NoteRevision, (note_id, number))
+
+    @staticmethod
+    def get_revision_content(
+        db: Session, note_id: uuid.UUID, number: int
+    ) -> str | None:
+        """
+        Reconstrói o conteúdo de uma revisão em uma consulta, partindo da última
+        revisão completa antes dela e aplicando os deltas seguintes, que são no
+        máximo NOTE_REVISION_SNAPSHOT_INTERVAL - 1
+        """
+        snapshot_number = (
+            select(func.max(NoteRevision.number))
+            .where(
+                NoteRevision.note_id == note_id,
+                NoteRevision.number <= number,
+                NoteRevision.content.is_not(None),
+            )
+            .scalar_subquery()
+        )
+        chain = db.execute(
+            select(NoteRevision.number, NoteRevision.content, NoteRevision.delta)
+            .where(
+                NoteRevision.note_id == note_id,
+                NoteRevision.number.between(snapshot_number, number),
+            )
+            .order_by(NoteRevision.number)
+        ).all()
+        if not chain or chain[-1].number != number:
+            return None
+
+        content = chain[0].content
+        for revision in chain[1:]:
+            content = apply_line_delta(content, revision.delta)
+        return content
+
+    @staticmethod
+    def list_revisions(
+        db: Session, note_id: uuid.UUID, limit: int, before: int | None = None
+    ) -> list[NoteRevision]:
+        """
+        Retorna até limit + 1 revisões da nota, da mais recente para a mais antiga,
+        sem carregar o conteúdo. O item extra indica se há uma próxima página
+        """
+        query = (
+            select(NoteRevision)
+            .options(
+                load_only(
+                    NoteRevision.number,
+                    NoteRevision.note_version,
+                    NoteRevision.title,
+                    NoteRevision.saved_at,
+                    NoteRevision.created_at,
+                )
+            )
+            .where(NoteRevision.note_id == note_id)
+            .order_by(NoteRevision.number.desc())
+            .limit(limit + 1)
+        )
+        if before is not None:
+            query = query.where(NoteRevision.number < before)
+
+        return list(db.scalars(query))
+
+    @staticmethod
+    def record_revision(
+        db: Session, revision: NoteRevision, content: str, coalesce: bool = True
+    ) -> bool:
+        """
+        Guarda no histórico o estado anterior de uma nota, sem fazer o commit. Com
+        coalesce, as edições feitas até NOTE_REVISION_COALESCE_SECONDS depois da
+        última revisão não geram outra, então uma sequência de autosaves deixa
+        só o estado de antes da primeira. Retorna se a revisão foi guardada
+        """
+        latest = NoteRevisionRepository.get_latest_revision(db, revision.note_id)
+        if latest is None:
+            revision.number = 1
+        elif coalesce and latest.is_recent:
+            return False
+        else:
+            revision.number = latest.number + 1
+
+        if (revision.number - 1) % NOTE_REVISION_SNAPSHOT_INTERVAL:
+            previous_content = NoteRevisionRepository.get_revision_content(
+                db, revision.note_id, revision.number - 1
+            )
+            delta = make_line_delta(previous_content, content)
+            # O delta só é guardado quando ocupa menos que o conteúdo completo
+            if len(json.dumps(delta)) < len(content):
+                revision.delta = delta
+        if revision.delta is None:
+            revision.content = content
+
+        db.add(revision)
+        return True
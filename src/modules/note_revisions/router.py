@@ -0,0 +1,85 @@
+"""Router do módulo Note Revisions"""
+
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from src.core.constants import NOTE_REVISIONS_DEFAULT_LIMIT, NOTE_REVISIONS_MAX_LIMIT
+from src.core.database import get_db
+from src.core.models import Note
+from src.core.security import get_current_user_id
+from src.modules.notes.schemas import NoteResponse
+
+from .schemas import NoteRevisionListResponse, NoteRevisionResponse
+from .service import NoteRevisionService as note_revision_service
+
+router = APIRouter(
+    prefix="/notebooks/{notebook_id}/notes/{note_id}/revisions", tags=["Notes"]
+)
+
+
+@router.get(
+    "/",
+    response_model=NoteRevisionListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Lista as versões anteriores de uma nota",
+)
+def list_note_revisions(
+    notebook_id: uuid.UUID,
+    note_id: uuid.UUID,
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    limit: Annotated[
+        int,
+        Query(
+            description="Quantidade máxima de revisões",
+            ge=1,
+            le=NOTE_REVISIONS_MAX_LIMIT,
+        ),
+    ] = NOTE_REVISIONS_DEFAULT_LIMIT,
+    cursor: Annotated[
+        str | None, Query(description="Cursor retornado pela página anterior")
+    ] = None,
+) -> NoteRevisionListResponse:
+    """Retorna as revisões da nota, da mais recente à mais antiga, sem o conteúdo"""
+    return note_revision_service.list_revisions(
+        db, note_id, notebook_id, user_id, limit, cursor
+    )
+
+
+@router.get(
+    "/{number}",
+    response_model=NoteRevisionResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Retorna uma versão anterior de uma nota",
+)
+def get_note_revision(
+    notebook_id: uuid.UUID,
+    note_id: uuid.UUID,
+    number: int,
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+) -> NoteRevisionResponse:
+    """Retorna o título e o conteúdo da nota na revisão pedida"""
+    return note_revision_service.get_revision(db, note_id, notebook_id, number, user_id)
+
+
+@router.post(
+    "/{number}/restore",
+    response_model=NoteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Restaura uma versão anterior de uma nota",
+)
+def restore_note_revision(
+    notebook_id: uuid.UUID,
+    note_id: uuid.UUID,
+    number: int,
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+) -> Note:
+    """Volta o título e o conteúdo da nota para os da revisão pedida"""
+    return note_revision_service.restore_revision(
+        db, note_id, notebook_id, number, user_id
+    )
@@ -0,0 +1,30 @@
+"""Schemas para o módulo note_revisions"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class NoteRevisionSummary(BaseModel):
+    """Schema de retorno com os dados de uma revisão, sem o conteúdo"""
+
+    number: int
+    note_version: int
+    title: str
+    saved_at: datetime
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NoteRevisionResponse(NoteRevisionSummary):
+    """Schema de retorno com uma revisão e o conteúdo da nota naquela versão"""
+
+    content: str
+
+
+class NoteRevisionListResponse(BaseModel):
+    """Schema de retorno com uma página de revisões e o próximo cursor"""
+
+    revisions: list[NoteRevisionSummary]
+    next_cursor: str | None = None
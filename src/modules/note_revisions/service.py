@@ -0,0 +1,117 @@
+"""Service do Módulo Note Revisions"""
+
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.core.cache import user_data_generations
+from src.core.constants import NOTE_REVISIONS_DEFAULT_LIMIT
+from src.core.models import Note
+from src.core.pagination import decode_cursor, encode_cursor
+from src.modules.notes.repository import NoteRepository as note_repository
+from src.modules.notes.schemas import NoteUpdate
+from src.modules.notes.service import NoteService as note_service
+
+from .repository import NoteRevisionRepository as note_revision_repository
+from .schemas import NoteRevisionListResponse, NoteRevisionResponse
+
+
+class NoteRevisionService:
+    """Classe do Service que conversa com o repository e retorna o resultado pro router"""
+
+    @staticmethod
+    def list_revisions(
+        db: Session,
+        note_id: uuid.UUID,
+        notebook_id: uuid.UUID,
+        user_id: uuid.UUID,
+        limit: int = NOTE_REVISIONS_DEFAULT_LIMIT,
+        cursor: str | None = None,
+    ) -> NoteRevisionListResponse:
+        """Retorna uma página das revisões da nota, da mais recente à mais antiga"""
+        note_service.get_note_by_id(db, note_id, notebook_id, user_id)
+
+        before = None
+        if cursor:
+            before = decode_cursor(cursor).get("number")
+            if not isinstance(before, int):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+                )
+
+        revisions = note_revision_repository.list_revisions(db, note_id, limit, before)
+        next_cursor = None
+        if len(revisions) > limit:
+            revisions = revisions[:limit]
+            next_cursor = encode_cursor({"number": revisions[-1].number})
+
+        return NoteRevisionListResponse(revisions=revisions, next_cursor=next_cursor)
+
+    @staticmethod
+    def _get_revision_with_content(
+        db: Session, note_id: uuid.UUID, number: int
+    ) -> NoteRevisionResponse:
+        """Busca uma revisão da nota e reconstrói o conteúdo dela"""
+        revision = note_revision_repository.get_revision(db, note_id, number)
+        if revision is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="A revisão não foi encontrada",
+            )
+
+        content = note_revision_repository.get_revision_content(db, note_id, number)
+        return NoteRevisionResponse(
+            number=revision.number,
+            note_version=revision.note_version,
+            title=revision.title,
+            saved_at=revision.saved_at,
+            created_at=revision.created_at,
+            content=content,
+        )
+
+    @staticmethod
+    def get_revision(
+        db: Session,
+        note_id: uuid.UUID,
+        notebook_id: uuid.UUID,
+        number: int,
+        user_id: uuid.UUID,
+    ) -> NoteRevisionResponse:
+        """Retorna uma revisão da nota com o conteúdo reconstruído"""
+        note_service.get_note_by_id(db, note_id, notebook_id, user_id)
+        return NoteRevisionService._get_revision_with_content(db, note_id, number)
+
+    @staticmethod
+    def restore_revision(
+        db: Session,
+        note_id: uuid.UUID,
+        notebook_id: uuid.UUID,
+        number: int,
+        user_id: uuid.UUID,
+    ) -> Note:
+        """
+        Volta o título e o conteúdo da nota para os de uma revisão. O estado
+        atual sempre entra no histórico, mesmo dentro da janela de coalescência,
+        para que a restauração possa ser desfeita
+        """
+        note = note_service.get_note_by_id(db, note_id, notebook_id, user_id)
+        revision = NoteRevisionService._get_revision_with_content(db, note_id, number)
+
+        try:
+            restored_note = note_repository.update_note(
+                db,
+                note,
+                NoteUpdate(title=revision.title, content=revision.content),
+                coalesce_revision=False,
+            )
+        except StaleDataError as err:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A nota foi alterada durante a restauração",
+            ) from err
+
+        user_data_generations.bump(user_id)
+        return restored_note
@@ -0,0 +1,131 @@
+"""Arquivo com os testes de integração dos endpoints de Note Revisions"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.core.models import NoteRevision
+
+
+@pytest.fixture
+def without_coalescing():
+    """Desliga a janela de coalescência para que cada edição gere uma revisão"""
+    with patch(
+        "src.modules.note_revisions.repository.NOTE_REVISION_COALESCE_SECONDS", 0
+    ):
+        yield
+
+
+class TestNoteRevisionRoutes:
+    """Agrupa todos os testes para as rotas do módulo Note Revisions."""
+
+    def test_rapid_edits_are_coalesced_into_one_revision(
+        self, client: TestClient, created_note: dict, auth_headers: dict
+    ):
+        """
+        Testa se edições seguidas geram uma só revisão, com o estado anterior à
+        primeira delas, e se mudar só o favorito não gera revisão
+        """
+        note_url = f"/notebooks/{created_note['notebook_id']}/notes/{created_note['id']}"
+        for content in ["Rascunho 1", "Rascunho 2", "Rascunho 3"]:
+            client.patch(note_url, json={"content": content}, headers=auth_headers)
+        client.patch(note_url, json={"is_favorite": True}, headers=auth_headers)
+
+        response = client.get(f"{note_url}/revisions/", headers=auth_headers)
+
+        assert response.status_code == 200
+        revisions = response.json()["revisions"]
+        assert [revision["number"] for revision in revisions] == [1]
+        assert revisions[0]["note_version"] == created_note["version"]
+        assert revisions[0]["title"] == created_note["title"]
+        revision = client.get(f"{note_url}/revisions/1", headers=auth_headers).json()
+        assert revision["content"] == ""
+
+    @pytest.mark.usefixtures("without_coalescing")
+    def test_revisions_store_snapshots_and_deltas(
+        self,
+        client: TestClient,
+        db_session: Session,
+        created_note: dict,
+        auth_headers: dict,
+    ):
+        """
+        Testa se só algumas revisões guardam o conteúdo completo e se o conteúdo
+        de todas é reconstruído a partir dos deltas
+        """
+        note_url = f"/notebooks/{created_note['notebook_id']}/notes/{created_note['id']}"
+        lines = [f"Linha {index} com texto para o delta valer\n" for index in range(40)]
+        contents = []
+        for index in range(12):
+            lines[index] = f"Linha {index} editada\n"
+            contents.append("".join(lines))
+            client.patch(
+                note_url, json={"content": contents[-1]}, headers=auth_headers
+            )
+
+        snapshots = db_session.scalars(
+            select(NoteRevision.number)
+            .where(NoteRevision.content.is_not(None))
+            .order_by(NoteRevision.number)
+        ).all()
+        assert snapshots == [1, 2, 11]
+
+        for number in range(2, 12):
+            revision = client.get(
+                f"{note_url}/revisions/{number}", headers=auth_headers
+            ).json()
+            assert revision["content"] == contents[number - 2]
+
+        first_page = client.get(
+            f"{note_url}/revisions/", params={"limit": 8}, headers=auth_headers
+        ).json()
+        second_page = client.get(
+            f"{note_url}/revisions/",
+            params={"limit": 8, "cursor": first_page["next_cursor"]},
+            headers=auth_headers,
+        ).json()
+        numbers = [item["number"] for item in first_page["revisions"]]
+        numbers += [item["number"] for item in second_page["revisions"]]
+        assert numbers == list(range(12, 0, -1))
+        assert second_page["next_cursor"] is None
+
+    def test_restore_revision_keeps_current_state_in_history(
+        self, client: TestClient, created_note: dict, auth_headers: dict
+    ):
+        """
+        Testa se restaurar uma revisão volta o título e o conteúdo e guarda o
+        estado atual, mesmo dentro da janela de coalescência
+        """
+        note_url = f"/notebooks/{created_note['notebook_id']}/notes/{created_note['id']}"
+        client.patch(
+            note_url,
+            json={"title": "Versão 2", "content": "Texto 2"},
+            headers=auth_headers,
+        )
+
+        response = client.post(f"{note_url}/revisions/1/restore", headers=auth_headers)
+
+        assert response.status_code == 200
+        restored = response.json()
+        assert restored["title"] == created_note["title"]
+        assert restored["content"] == ""
+        assert restored["version"] == created_note["version"] + 2
+        revision = client.get(f"{note_url}/revisions/2", headers=auth_headers).json()
+        assert (revision["title"], revision["content"]) == ("Versão 2", "Texto 2")
+
+    def test_missing_revision_returns_404(
+        self, client: TestClient, created_note: dict, auth_headers: dict
+    ):
+        """Testa se uma revisão inexistente retorna 404 na leitura e na restauração"""
+        note_url = f"/notebooks/{created_note['notebook_id']}/notes/{created_note['id']}"
+
+        get_response = client.get(f"{note_url}/revisions/1", headers=auth_headers)
+        restore_response = client.post(
+            f"{note_url}/revisions/1/restore", headers=auth_headers
+        )
+
+        assert get_response.status_code == 404
+        assert restore_response.status_code == 404
@@ -0,0 +1,117 @@
+"""Arquivo com os testes unitários do service de Note Revisions"""
+
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.line_delta import apply_line_delta, make_line_delta
+from src.core.models import NoteRevision
+from src.core.pagination import decode_cursor, encode_cursor
+from src.modules.note_revisions.service import NoteRevisionService
+
+TEST_USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def mock_revision_repo():
+    """Retorna um mock do repository de note revisions"""
+    with patch(
+        "src.modules.note_revisions.service.note_revision_repository",
+        new_callable=MagicMock,
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_note_service():
+    """Retorna um mock do service de notes"""
+    with patch(
+        "src.modules.note_revisions.service.note_service", new_callable=MagicMock
+    ) as mock:
+        yield mock
+
+
+def make_revision(number: int) -> NoteRevision:
+    """Cria uma revisão como a retornada pelo repository"""
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return NoteRevision(
+        number=number, note_version=number, title="Nota", saved_at=now, created_at=now
+    )
+
+
+class TestUnitNoteRevisionService:
+    """Agrupa todos os testes unitários para o NoteRevisionService."""
+
+    @pytest.mark.parametrize(
+        "base, target",
+        [
+            ("", ""),
+            ("", "uma linha"),
+            ("a\nb\nc\n", "a\nb\nc\n"),
+            ("a\nb\nc\n", "a\nB\nc\nd"),
+            ("título\n\ncorpo\nfim", "corpo\nfim\ntítulo\n"),
+            ("a\r\nb\r\n", "a\nb\n"),
+        ],
+    )
+    def test_line_delta_round_trip(self, base: str, target: str):
+        """Testa se aplicar o delta ao texto base sempre resulta no texto alvo"""
+        assert apply_line_delta(base, make_line_delta(base, target)) == target
+
+    def test_line_delta_copies_unchanged_lines(self):
+        """Testa se as linhas que não mudaram viram contagens, e não texto"""
+        base = "".join(f"linha {index}\n" for index in range(100))
+        target = base.replace("linha 50\n", "linha cinquenta\n")
+
+        assert make_line_delta(base, target) == [50, -1, ["linha cinquenta\n"], 49]
+
+    def test_list_revisions_returns_next_cursor(
+        self, mock_revision_repo: MagicMock, mock_note_service: MagicMock
+    ):
+        """
+        Testa se a página é cortada no limite e se o cursor aponta para a
+        última revisão retornada
+        """
+        note_id = uuid.uuid4()
+        notebook_id = uuid.uuid4()
+        mock_db_session = MagicMock()
+        mock_revision_repo.list_revisions.return_value = [
+            make_revision(number) for number in (9, 8, 7)
+        ]
+
+        result = NoteRevisionService.list_revisions(
+            mock_db_session,
+            note_id,
+            notebook_id,
+            TEST_USER_ID,
+            limit=2,
+            cursor=encode_cursor({"number": 10}),
+        )
+
+        mock_note_service.get_note_by_id.assert_called_once_with(
+            mock_db_session, note_id, notebook_id, TEST_USER_ID
+        )
+        mock_revision_repo.list_revisions.assert_called_once_with(
+            mock_db_session, note_id, 2, 10
+        )
+        assert [revision.number for revision in result.revisions] == [9, 8]
+        assert decode_cursor(result.next_cursor) == {"number": 8}
+
+    @pytest.mark.usefixtures("mock_note_service")
+    def test_list_revisions_with_invalid_cursor_raises_400(
+        self, mock_revision_repo: MagicMock
+    ):
+        """Testa se um cursor sem o número da revisão é recusado"""
+        with pytest.raises(HTTPException) as exc_info:
+            NoteRevisionService.list_revisions(
+                MagicMock(),
+                uuid.uuid4(),
+                uuid.uuid4(),
+                TEST_USER_ID,
+                cursor=encode_cursor({"number": "1"}),
+            )
+
+        assert exc_info.value.status_code == 400
+        mock_revision_repo.list_revisions.assert_not_called()
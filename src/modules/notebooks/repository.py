@@ -2,6 +2,8 @@
 
 import uuid
 
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from src.core.models import Notebook
@@ -21,7 +23,6 @@ class NotebookRepository:
 
         db.add(new_notebook)
         db.commit()
-        db.refresh(new_notebook)
 
         return new_notebook
 
@@ -42,14 +43,28 @@ class NotebookRepository:
         )
 
     @staticmethod
-    def get_notebook_by_name(
+    def get_or_create_notebook_id(
         db: Session, notebook_name: str, user_id: uuid.UUID
-    ) -> Notebook | None:
-        """Busca e retorna um notebook com o nome passado pelo parâmetro da função"""
-        return (
-            db.query(Notebook)
-            .filter(Notebook.name == notebook_name, Notebook.user_id == user_id)
-            .first()
+    ) -> uuid.UUID:
+        """
+        Cria o caderno com INSERT ... ON CONFLICT DO NOTHING e, se ele já existir,
+        busca o ID pelo nome. Em requisições simultâneas, o INSERT da segunda
+        espera a primeira e a busca encontra o caderno criado por ela. O commit
+        fica para a escrita seguinte, que usa o caderno
+        """
+        created_id = db.scalar(
+            insert(Notebook)
+            .values(name=notebook_name, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["user_id", "name"])
+            .returning(Notebook.id)
+        )
+        if created_id is not None:
+            return created_id
+
+        return db.scalar(
+            select(Notebook.id).where(
+                Notebook.user_id == user_id, Notebook.name == notebook_name
+            )
         )
 
     @staticmethod
@@ -62,7 +77,6 @@ class NotebookRepository:
             setattr(notebook, key, value)
 
         db.commit()
-        db.refresh(notebook)
         return notebook
 
     @staticmethod
@@ -29,6 +29,6 @@ class NotebookResponse(BaseModel):
     name: str
     is_favorite: bool
     created_at: datetime
-    updated_at: datetime | None
+    updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
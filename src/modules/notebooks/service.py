@@ -6,12 +6,21 @@ from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.core.cache import TTLCache, user_data_generations
+from src.core.config import settings
 from src.core.constants import QUICK_CAPTURE_NOTEBOOK_NAME
 from src.core.models import Notebook
 
 from .repository import NotebookRepository as notebook_repository
 from .schemas import NotebookCreate, NotebookUpdate
 
+# ID do caderno de captura rápida de cada usuário, para a nota ser criada sem
+# buscar o caderno. Um ID desatualizado é detectado na criação da nota
+quick_capture_notebook_ids = TTLCache(
+    max_entries=settings.QUICK_CAPTURE_CACHE_MAX_ENTRIES,
+    ttl=settings.QUICK_CAPTURE_CACHE_TTL_SECONDS,
+)
+
 
 class NotebookService:
     """Classe do Service que conversa com o repository e retorna o resultado pro router"""
@@ -25,6 +34,7 @@ class NotebookService:
             new_notebook = notebook_repository.create_notebook(
                 db, notebook_data, user_id
             )
+            user_data_generations.bump(user_id)
             return new_notebook
         except IntegrityError as err:
             db.rollback()
@@ -67,6 +77,7 @@ class NotebookService:
             updated_notebook = notebook_repository.update_notebook(
                 db, notebook_to_update, notebook_update_data
             )
+            user_data_generations.bump(user_id)
             return updated_notebook
         except IntegrityError as err:
             db.rollback()
@@ -89,20 +100,23 @@ class NotebookService:
             )
 
         notebook_repository.delete_notebook(db, notebook_to_delete)
+        user_data_generations.bump(user_id)
 
     @staticmethod
-    def get_or_create_quick_capture_notebook(
-        db: Session, user_id: uuid.UUID
-    ) -> Notebook:
-        """Busca o caderno de captura rápida e, caso não exista, cria ele"""
-
-        quick_capture_notebook = notebook_repository.get_notebook_by_name(
+    def get_quick_capture_notebook_id(
+        db: Session, user_id: uuid.UUID, use_cache: bool = True
+    ) -> uuid.UUID:
+        """
+        Retorna o ID do caderno de captura rápida, do cache ou do banco, criando
+        o caderno caso ele não exista. Quem cria a nota faz o commit do caderno
+        """
+        if use_cache:
+            cached_id = quick_capture_notebook_ids.get(user_id)
+            if cached_id is not None:
+                return cached_id
+
+        notebook_id = notebook_repository.get_or_create_notebook_id(
             db, QUICK_CAPTURE_NOTEBOOK_NAME, user_id
         )
-
-        if quick_capture_notebook:
-            return quick_capture_notebook
-
-        return notebook_repository.create_notebook(
-            db, NotebookCreate(name=QUICK_CAPTURE_NOTEBOOK_NAME), user_id
-        )
+        quick_capture_notebook_ids.set(user_id, notebook_id)
+        return notebook_id
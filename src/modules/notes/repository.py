@@ -1,12 +1,19 @@
 """Repository do Módulo de Notes"""
 
 import uuid
+from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, delete, func, literal, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Query, Session, defer, selectinload, undefer
+from sqlalchemy.orm.attributes import set_committed_value
 
-from src.core.models import Note, Tag
+from src.core.models import Note, Notebook, NoteRevision, Tag, note_tags
+from src.modules.note_revisions.repository import (
+    NoteRevisionRepository as note_revision_repository,
+)
 
-from .schemas import NoteCreate, NoteUpdate
+from .schemas import NoteBulkCreateItem, NoteCreate, NoteUpdate
 
 
 class NoteRepository:
@@ -18,15 +25,85 @@ class NoteRepository:
     ) -> Note:
         """Cria e adiciona uma nova Nota no Banco"""
         new_note = Note(
-            **note_data.model_dump(), notebook_id=notebook_id, user_id=user_id
+            **note_data.model_dump(), notebook_id=notebook_id, user_id=user_id, tags=[]
         )
 
         db.add(new_note)
         db.commit()
-        db.refresh(new_note)
 
         return new_note
 
+    @staticmethod
+    def create_note_in_named_notebook(
+        db: Session,
+        note_data: NoteCreate,
+        notebook_id: uuid.UUID,
+        notebook_name: str,
+        user_id: uuid.UUID,
+    ) -> Note | None:
+        """
+        Cria a Nota com um único INSERT ... SELECT, que só insere se o caderno
+        ainda existir com esse nome, e faz o commit. Retorna None, sem inserir
+        nada, se o caderno foi apagado ou renomeado
+        """
+        notebook = select(
+            literal(note_data.title),
+            literal(note_data.content),
+            Notebook.id,
+            Notebook.user_id,
+        ).where(
+            Notebook.id == notebook_id,
+            Notebook.user_id == user_id,
+            Notebook.name == notebook_name,
+        )
+        new_note = db.scalars(
+            insert(Note)
+            .from_select(["title", "content", "notebook_id", "user_id"], notebook)
+            .returning(Note)
+        ).first()
+        if new_note is None:
+            return None
+
+        db.commit()
+        # A nota acabou de ser criada, então não há tags para buscar
+        set_committed_value(new_note, "tags", [])
+        return new_note
+
+    @staticmethod
+    def bulk_create_notes(
+        db: Session,
+        notes_data: list[NoteBulkCreateItem],
+        notebook_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> list[uuid.UUID]:
+        """
+        Cria várias Notas com um único INSERT de várias linhas, e as suas tags com
+        outro, fazendo um só commit. Os IDs são gerados aqui para ligar as tags
+        """
+        note_ids = [uuid.uuid4() for _ in notes_data]
+        note_rows = [
+            {
+                "id": note_id,
+                **note_data.model_dump(exclude={"tag_ids"}),
+                "is_favorite": False,
+                "notebook_id": notebook_id,
+                "user_id": user_id,
+            }
+            for note_id, note_data in zip(note_ids, notes_data)
+        ]
+        tag_rows = [
+            {"note_id": note_id, "tag_id": tag_id}
+            for note_id, note_data in zip(note_ids, notes_data)
+            for tag_id in set(note_data.tag_ids)
+        ]
+
+        db.execute(insert(Note).values(note_rows))
+        if tag_rows:
+            db.execute(insert(note_tags).values(tag_rows))
+        db.commit()
+
+        return note_ids
+
     @staticmethod
     def get_note_by_id(
         db: Session, note_id: uuid.UUID, notebook_id: uuid.UUID, user_id: uuid.UUID
@@ -43,26 +120,155 @@ class NoteRepository:
         )
 
     @staticmethod
-    def get_all_notes_from_notebook_id(
-        db: Session, notebook_id: uuid.UUID, user_id: uuid.UUID
+    def get_note_versions(
+        db: Session, note_id: uuid.UUID, notebook_id: uuid.UUID, user_id: uuid.UUID
+    ) -> Row | None:
+        """
+        Retorna apenas a versão do conteúdo e a versão da linha de uma Nota, sem
+        ler o conteúdo
+        """
+        return (
+            db.query(Note.version, Note.row_version)
+            .filter(
+                Note.id == note_id,
+                Note.notebook_id == notebook_id,
+                Note.user_id == user_id,
+            )
+            .first()
+        )
+
+    @staticmethod
+    def get_notes_validator(
+        db: Session, user_id: uuid.UUID, notebook_id: uuid.UUID | None = None
+    ) -> tuple[int, datetime | None, int | None, int | None]:
+        """
+        Resume as Notas de um usuário, ou de um caderno, em (quantidade, maior
+        updated_at, soma das versões do conteúdo, soma das versões das linhas).
+        Criar ou apagar uma Nota muda a quantidade ou o maior updated_at, e
+        qualquer outra escrita aumenta a soma das versões das linhas
+        """
+        query = db.query(
+            func.count(Note.id),
+            func.max(Note.updated_at),
+            func.sum(Note.version),
+            func.sum(Note.row_version),
+        ).filter(Note.user_id == user_id)
+        if notebook_id is not None:
+            query = query.filter(Note.notebook_id == notebook_id)
+
+        count, last_updated_at, version_sum, row_version_sum = query.one()
+        return count, last_updated_at, version_sum, row_version_sum
+
+    @staticmethod
+    def bump_note_row_versions(db: Session, note_ids: set[uuid.UUID]):
+        """
+        Incrementa a versão da linha das Notas cujas tags mudaram com um único
+        UPDATE, para que as ETags das Notas e das listagens deixem de valer. A
+        versão do conteúdo fica igual, e as edições em andamento continuam válidas
+        """
+        if note_ids:
+            db.execute(
+                update(Note)
+                .where(Note.id.in_(note_ids))
+                .values(row_version=Note.row_version + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def _paginate_notes(
+        query: Query, limit: int, position: tuple[datetime, uuid.UUID] | None
     ) -> list[Note]:
-        """Retorna todas as Notas de um Caderno a partir do ID"""
+        """
+        Ordena as Notas da mais para a menos recente e aplica o keyset
+        (updated_at, id) da última página, buscando uma Nota a mais para indicar
+        se ainda existem resultados. As tags da página vêm em uma única consulta
+        """
+        if position is not None:
+            query = query.filter(tuple_(Note.updated_at, Note.id) < tuple_(*position))
+
         return (
-            db.query(Note)
-            .filter(Note.notebook_id == notebook_id, Note.user_id == user_id)
+            query.options(selectinload(Note.tags))
+            .order_by(Note.updated_at.desc(), Note.id.desc())
+            .limit(limit + 1)
             .all()
         )
 
     @staticmethod
-    def update_note(db: Session, note: Note, note_updated_data: NoteUpdate) -> Note:
-        """Atualiza os atributos de uma Nota"""
-        updated_data = note_updated_data.model_dump(exclude_unset=True)
+    def get_all_notes_from_notebook_id(
+        db: Session,
+        notebook_id: uuid.UUID,
+        user_id: uuid.UUID,
+        limit: int,
+        position: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[Note]:
+        """Retorna uma página das Notas de um Caderno a partir do ID"""
+        query = db.query(Note).filter(
+            Note.notebook_id == notebook_id, Note.user_id == user_id
+        )
+        return NoteRepository._paginate_notes(query, limit, position)
+
+    @staticmethod
+    def _summary_query(db: Session) -> Query:
+        """
+        Cria a consulta de Notas para as listagens resumidas, que lê apenas o
+        preview e nunca o conteúdo, evitando buscar os dados do TOAST
+        """
+        return db.query(Note).options(
+            defer(Note.content, raiseload=True), undefer(Note.preview)
+        )
+
+    @staticmethod
+    def get_note_summaries_from_notebook_id(
+        db: Session,
+        notebook_id: uuid.UUID,
+        user_id: uuid.UUID,
+        limit: int,
+        position: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[Note]:
+        """Retorna uma página das Notas de um Caderno sem o conteúdo"""
+        query = NoteRepository._summary_query(db).filter(
+            Note.notebook_id == notebook_id, Note.user_id == user_id
+        )
+        return NoteRepository._paginate_notes(query, limit, position)
+
+    @staticmethod
+    def update_note(
+        db: Session,
+        note: Note,
+        note_updated_data: NoteUpdate,
+        coalesce_revision: bool = True,
+    ) -> Note:
+        """
+        Atualiza os atributos de uma Nota. Se o título ou o conteúdo mudarem, o
+        estado anterior é guardado no histórico de revisões na mesma transação
+        """
+        updated_data = note_updated_data.model_dump(
+            exclude_unset=True, exclude={"content_patch"}
+        )
+        previous = NoteRevision(
+            note_id=note.id,
+            note_version=note.version,
+            title=note.title,
+            saved_at=note.updated_at,
+        )
+        previous_content = note.content or ""
 
         for key, value in updated_data.items():
             setattr(note, key, value)
 
+        content_changed = (note.content or "") != previous_content
+        if content_changed:
+            note.version += 1
+
+        if note.title != previous.title or content_changed:
+            # O UPDATE vem antes: o lock da linha da nota ordena as revisões de
+            # edições simultâneas, e a perdedora falha no version_id antes
+            db.flush()
+            note_revision_repository.record_revision(
+                db, previous, previous_content, coalesce=coalesce_revision
+            )
+
         db.commit()
-        db.refresh(note)
 
         return note
 
@@ -77,6 +283,7 @@ class NoteRepository:
         """Adiciona uma tag à lista de tags de uma nota"""
         if tag not in note.tags:
             note.tags.append(tag)
+            note.row_version += 1
             db.commit()
 
     @staticmethod
@@ -84,14 +291,111 @@ class NoteRepository:
         """Remove uma tag da lista de tags de uma nota"""
         if tag in note.tags:
             note.tags.remove(tag)
+            note.row_version += 1
             db.commit()
 
     @staticmethod
-    def get_all_notes(db: Session, user_id: uuid.UUID) -> list[Note]:
-        """Retorna todas as Notas de um usuário"""
-        return (
-            db.query(Note)
-            .filter(Note.user_id == user_id)
-            .order_by(Note.updated_at.desc().nulls_last())
-            .all()
+    def get_existing_note_ids(
+        db: Session, note_ids: set[uuid.UUID], user_id: uuid.UUID
+    ) -> set[uuid.UUID]:
+        """Retorna, entre os IDs passados, os das Notas que existem para o usuário"""
+        rows = db.query(Note.id).filter(Note.id.in_(note_ids), Note.user_id == user_id)
+        return {note_id for (note_id,) in rows}
+
+    @staticmethod
+    def bulk_add_tags_to_notes(
+        db: Session, note_ids: set[uuid.UUID], tag_ids: set[uuid.UUID], user_id: uuid.UUID
+    ) -> int:
+        """
+        Associa todas as tags a todas as Notas com um único INSERT ... SELECT,
+        ignorando as associações que já existem. Retorna quantas foram criadas
+        """
+        pairs = (
+            select(Note.id, Tag.id)
+            .join(Tag, true())
+            .where(
+                Note.id.in_(note_ids),
+                Note.user_id == user_id,
+                Tag.id.in_(tag_ids),
+                Tag.user_id == user_id,
+            )
         )
+        created = db.execute(
+            insert(note_tags)
+            .from_select(["note_id", "tag_id"], pairs)
+            .on_conflict_do_nothing()
+            .returning(note_tags.c.note_id)
+        ).all()
+        NoteRepository.bump_note_row_versions(db, {note_id for (note_id,) in created})
+        db.commit()
+
+        return len(created)
+
+    @staticmethod
+    def bulk_delete_tags_from_notes(
+        db: Session, note_ids: set[uuid.UUID], tag_ids: set[uuid.UUID]
+    ) -> int:
+        """
+        Remove todas as tags de todas as Notas com um único DELETE.
+        Retorna quantas associações foram removidas
+        """
+        removed = db.execute(
+            delete(note_tags)
+            .where(note_tags.c.note_id.in_(note_ids), note_tags.c.tag_id.in_(tag_ids))
+            .returning(note_tags.c.note_id)
+        ).all()
+        NoteRepository.bump_note_row_versions(db, {note_id for (note_id,) in removed})
+        db.commit()
+
+        return len(removed)
+
+    @staticmethod
+    def bulk_move_notes(
+        db: Session,
+        destination_notebook_id: uuid.UUID,
+        user_id: uuid.UUID,
+        note_ids: set[uuid.UUID] | None = None,
+        source_notebook_id: uuid.UUID | None = None,
+    ) -> int:
+        """
+        Move as Notas escolhidas pelos IDs, ou todas as de um caderno de origem,
+        com um único UPDATE. Retorna quantas Notas foram movidas
+        """
+        query = db.query(Note).filter(Note.user_id == user_id)
+        if note_ids is not None:
+            query = query.filter(Note.id.in_(note_ids))
+        if source_notebook_id is not None:
+            query = query.filter(Note.notebook_id == source_notebook_id)
+
+        moved = query.update(
+            {
+                Note.notebook_id: destination_notebook_id,
+                Note.row_version: Note.row_version + 1,
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+
+        return moved
+
+    @staticmethod
+    def get_all_notes(
+        db: Session,
+        user_id: uuid.UUID,
+        limit: int,
+        position: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[Note]:
+        """Retorna uma página das Notas de um usuário"""
+        query = db.query(Note).filter(Note.user_id == user_id)
+        return NoteRepository._paginate_notes(query, limit, position)
+
+    @staticmethod
+    def get_all_note_summaries(
+        db: Session,
+        user_id: uuid.UUID,
+        limit: int,
+        position: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[Note]:
+        """Retorna uma página das Notas de um usuário sem o conteúdo"""
+        query = NoteRepository._summary_query(db).filter(Note.user_id == user_id)
+        return NoteRepository._paginate_notes(query, limit, position)
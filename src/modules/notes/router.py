@@ -3,19 +3,29 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.orm import Session
 
+from src.core.constants import NOTES_DEFAULT_LIMIT, NOTES_MAX_LIMIT
 from src.core.database import get_db
+from src.core.etag import etag_matches, not_modified_response, set_etag_headers
 from src.core.models import Note, Template
 from src.core.security import get_current_user_id
 from src.modules.templates.schemas import TemplateFromNoteCreate, TemplateResponse
 
 from .schemas import (
+    NoteBulkCreate,
+    NoteBulkCreateResponse,
+    NoteBulkMove,
+    NoteBulkMoveResponse,
     NoteCreate,
     NoteFromTemplateCreate,
+    NoteListResponse,
     NoteResponse,
+    NoteSummaryListResponse,
     NoteTagResponse,
+    NoteTagsBulkResponse,
+    NoteTagsBulkUpdate,
     NoteUpdate,
     QuickNoteCreate,
 )
@@ -42,16 +52,105 @@ def create_quick_note(
 
 @base_router.get(
     "/",
-    response_model=list[NoteResponse],
+    response_model=NoteListResponse,
     status_code=status.HTTP_200_OK,
-    summary="Lista todas as notas do usuário",
+    summary="Lista as notas do usuário",
 )
 def get_all_notes(
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-) -> list[Note]:
-    """Retorna uma lista com todas as notas do usuário"""
-    return note_service.get_all_notes(db, user_id)
+    response: Response,
+    limit: Annotated[
+        int,
+        Query(description="Quantidade máxima de notas", ge=1, le=NOTES_MAX_LIMIT),
+    ] = NOTES_DEFAULT_LIMIT,
+    cursor: Annotated[
+        str | None,
+        Query(description="Cursor retornado pela página anterior"),
+    ] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> NoteListResponse | Response:
+    """Retorna uma página das notas do usuário, da mais para a menos recente"""
+    etag = note_service.get_notes_etag(db, user_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    set_etag_headers(response, etag)
+    return note_service.get_all_notes(db, user_id, limit, cursor)
+
+
+@base_router.get(
+    "/summary",
+    response_model=NoteSummaryListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Lista os resumos das notas do usuário",
+)
+def get_all_note_summaries(
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    response: Response,
+    limit: Annotated[
+        int,
+        Query(description="Quantidade máxima de notas", ge=1, le=NOTES_MAX_LIMIT),
+    ] = NOTES_DEFAULT_LIMIT,
+    cursor: Annotated[
+        str | None,
+        Query(description="Cursor retornado pela página anterior"),
+    ] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> NoteSummaryListResponse | Response:
+    """Retorna uma página das notas do usuário com o preview no lugar do conteúdo"""
+    etag = note_service.get_notes_etag(db, user_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    set_etag_headers(response, etag)
+    return note_service.get_all_note_summaries(db, user_id, limit, cursor)
+
+
+@base_router.post(
+    "/tags:bulk",
+    response_model=NoteTagsBulkResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Atribui várias tags a várias notas de uma só vez",
+)
+def bulk_add_tags_to_notes(
+    bulk_data: NoteTagsBulkUpdate,
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+) -> NoteTagsBulkResponse:
+    """Associa cada tag enviada a cada nota enviada, ignorando as já associadas"""
+    return note_service.bulk_add_tags_to_notes(db, bulk_data, user_id)
+
+
+@base_router.delete(
+    "/tags:bulk",
+    response_model=NoteTagsBulkResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Remove várias tags de várias notas de uma só vez",
+)
+def bulk_delete_tags_from_notes(
+    bulk_data: NoteTagsBulkUpdate,
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+) -> NoteTagsBulkResponse:
+    """Remove cada tag enviada de cada nota enviada"""
+    return note_service.bulk_delete_tags_from_notes(db, bulk_data, user_id)
+
+
+@base_router.post(
+    "/move:bulk",
+    response_model=NoteBulkMoveResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Move várias notas para outro caderno de uma só vez",
+)
+def bulk_move_notes(
+    move_data: NoteBulkMove,
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+) -> NoteBulkMoveResponse:
+    """Move as notas enviadas, ou todas as de um caderno, para o caderno de destino"""
+    return note_service.bulk_move_notes(db, move_data, user_id)
 
 
 @router.post(
@@ -70,19 +169,84 @@ def create_note(
     return note_service.create_note(db, note_data, notebook_id, user_id)
 
 
+@router.post(
+    "/bulk",
+    response_model=NoteBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Cria várias notas em um caderno de uma só vez",
+)
+def bulk_create_notes(
+    notebook_id: uuid.UUID,
+    bulk_data: NoteBulkCreate,
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+) -> NoteBulkCreateResponse:
+    """Cria todas as notas enviadas no caderno, com as suas tags, em uma só transação"""
+    return note_service.bulk_create_notes(db, bulk_data, notebook_id, user_id)
+
+
 @router.get(
     "/",
-    response_model=list[NoteResponse],
+    response_model=NoteListResponse,
     status_code=status.HTTP_200_OK,
-    summary="Lista todas as notas de um caderno",
+    summary="Lista as notas de um caderno",
 )
 def get_all_notes_from_notebook_id(
     notebook_id: uuid.UUID,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-) -> list[Note]:
-    """Retorna uma lista com todas as notas associadas a um caderno"""
-    return note_service.get_all_notes_from_notebook_id(db, notebook_id, user_id)
+    response: Response,
+    limit: Annotated[
+        int,
+        Query(description="Quantidade máxima de notas", ge=1, le=NOTES_MAX_LIMIT),
+    ] = NOTES_DEFAULT_LIMIT,
+    cursor: Annotated[
+        str | None,
+        Query(description="Cursor retornado pela página anterior"),
+    ] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> NoteListResponse | Response:
+    """Retorna uma página das notas de um caderno, da mais para a menos recente"""
+    etag = note_service.get_notes_etag(db, user_id, notebook_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    set_etag_headers(response, etag)
+    return note_service.get_all_notes_from_notebook_id(
+        db, notebook_id, user_id, limit, cursor
+    )
+
+
+@router.get(
+    "/summary",
+    response_model=NoteSummaryListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Lista os resumos das notas de um caderno",
+)
+def get_note_summaries_from_notebook_id(
+    notebook_id: uuid.UUID,
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    response: Response,
+    limit: Annotated[
+        int,
+        Query(description="Quantidade máxima de notas", ge=1, le=NOTES_MAX_LIMIT),
+    ] = NOTES_DEFAULT_LIMIT,
+    cursor: Annotated[
+        str | None,
+        Query(description="Cursor retornado pela página anterior"),
+    ] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> NoteSummaryListResponse | Response:
+    """Retorna uma página das notas de um caderno com o preview no lugar do conteúdo"""
+    etag = note_service.get_notes_etag(db, user_id, notebook_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    set_etag_headers(response, etag)
+    return note_service.get_note_summaries_from_notebook_id(
+        db, notebook_id, user_id, limit, cursor
+    )
 
 
 @router.get(
@@ -96,8 +260,18 @@ def get_note_by_id(
     notebook_id: uuid.UUID,
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-) -> Note:
-    """Busca e retorna uma nota específica pelo ID"""
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Note | Response:
+    """
+    Busca e retorna uma nota específica pelo ID. A versão é comparada antes de
+    carregar a nota, e a resposta é 304 se ela não mudou
+    """
+    etag = note_service.get_note_etag(db, note_id, notebook_id, user_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    set_etag_headers(response, etag)
     return note_service.get_note_by_id(db, note_id, notebook_id, user_id)
 
 
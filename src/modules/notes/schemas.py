@@ -4,8 +4,9 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+from src.core.constants import NOTES_BULK_MAX_ITEMS
 from src.modules.tags.schemas import TagResponse
 
 
@@ -16,6 +17,103 @@ class NoteCreate(BaseModel):
     content: Optional[str] = Field(None, description="Conteúdo inicial da Nota")
 
 
+class NoteBulkCreateItem(NoteCreate):
+    """Schema de uma das notas criadas em lote"""
+
+    tag_ids: list[uuid.UUID] = Field(
+        default_factory=list, description="Tags atribuídas à nota"
+    )
+
+
+class NoteBulkCreate(BaseModel):
+    """Schema para a criação de várias notas em um caderno de uma só vez"""
+
+    notes: list[NoteBulkCreateItem] = Field(
+        ..., min_length=1, max_length=NOTES_BULK_MAX_ITEMS, description="Notas a criar"
+    )
+
+
+class NoteBulkCreateResponse(BaseModel):
+    """Schema de retorno com os IDs das notas criadas em lote, na ordem enviada"""
+
+    ids: list[uuid.UUID]
+
+
+class NoteTagsBulkUpdate(BaseModel):
+    """Schema para atribuir ou remover várias tags de várias notas de uma só vez"""
+
+    note_ids: set[uuid.UUID] = Field(
+        ..., min_length=1, max_length=NOTES_BULK_MAX_ITEMS, description="Notas alteradas"
+    )
+    tag_ids: set[uuid.UUID] = Field(
+        ..., min_length=1, max_length=NOTES_BULK_MAX_ITEMS, description="Tags aplicadas"
+    )
+
+
+class NoteTagsBulkResponse(BaseModel):
+    """Schema de retorno com a quantidade de associações criadas ou removidas"""
+
+    affected: int
+
+
+class NoteBulkMove(BaseModel):
+    """
+    Schema para mover notas para outro caderno de uma só vez, escolhidas pelos
+    IDs ou todas as notas de um caderno de origem
+    """
+
+    destination_notebook_id: uuid.UUID = Field(..., description="Caderno de destino")
+    note_ids: set[uuid.UUID] | None = Field(
+        None, min_length=1, max_length=NOTES_BULK_MAX_ITEMS, description="Notas movidas"
+    )
+    source_notebook_id: uuid.UUID | None = Field(
+        None, description="Caderno de onde todas as notas são movidas"
+    )
+
+    @model_validator(mode="after")
+    def check_single_selection(self) -> "NoteBulkMove":
+        """Garante que as notas sejam escolhidas de exatamente uma das formas"""
+        if (self.note_ids is None) == (self.source_notebook_id is None):
+            raise ValueError("Informe note_ids ou source_notebook_id, mas não ambos")
+        return self
+
+
+class NoteBulkMoveResponse(BaseModel):
+    """Schema de retorno com a quantidade de notas movidas"""
+
+    moved: int
+
+
+class NoteContentSplice(BaseModel):
+    """
+    Schema de uma edição no conteúdo: remove delete_count unidades a partir de
+    offset e insere insert_text no lugar. Posições e quantidades contam unidades
+    UTF-16, como o length das strings em JavaScript
+    """
+
+    offset: int = Field(
+        ..., ge=0, description="Posição em unidades UTF-16 onde a edição começa"
+    )
+    delete_count: int = Field(
+        0, ge=0, description="Quantidade de unidades UTF-16 removidas"
+    )
+    insert_text: str = Field("", description="Texto inserido na posição")
+
+
+class NoteContentPatch(BaseModel):
+    """
+    Schema para editar o conteúdo de uma nota enviando apenas as alterações.
+    As edições são aplicadas em ordem, cada uma sobre o resultado da anterior
+    """
+
+    base_version: int = Field(
+        ..., ge=1, description="Versão do conteúdo da nota que foi editado"
+    )
+    operations: list[NoteContentSplice] = Field(
+        ..., min_length=1, description="Edições aplicadas ao conteúdo"
+    )
+
+
 class NoteUpdate(BaseModel):
     """Schema para a atualização dos dados de uma nota"""
 
@@ -23,11 +121,21 @@ class NoteUpdate(BaseModel):
         None, min_length=1, max_length=200, description="Novo título da Nota"
     )
     content: Optional[str] = Field(None, description="Novo conteúdo da Nota")
+    content_patch: Optional[NoteContentPatch] = Field(
+        None, description="Edições no conteúdo, no lugar do conteúdo completo"
+    )
     notebook_id: Optional[str] = Field(
         None, description="ID do novo caderno para mover a nota"
     )
     is_favorite: Optional[bool] = None
 
+    @model_validator(mode="after")
+    def check_single_content_mode(self) -> "NoteUpdate":
+        """Garante que o conteúdo venha completo ou como edições, mas não ambos"""
+        if self.content is not None and self.content_patch is not None:
+            raise ValueError("Informe content ou content_patch, mas não ambos")
+        return self
+
 
 class NoteTagResponse(BaseModel):
     """Schema de retorno com os dados da nota associada a uma tag"""
@@ -61,7 +169,37 @@ class NoteResponse(BaseModel):
     is_favorite: bool
     notebook_id: uuid.UUID
     created_at: datetime
-    updated_at: datetime | None
+    updated_at: datetime
+    version: int
+    tags: list[TagResponse] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NoteListResponse(BaseModel):
+    """Schema de retorno com uma página de notas e o cursor da próxima página"""
+
+    notes: list[NoteResponse]
+    next_cursor: str | None = None
+
+
+class NoteSummaryResponse(BaseModel):
+    """Schema de retorno com o resumo de uma nota, sem o conteúdo completo"""
+
+    id: uuid.UUID
+    title: str
+    preview: str | None
+    is_favorite: bool
+    notebook_id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
     tags: list[TagResponse] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class NoteSummaryListResponse(BaseModel):
+    """Schema de retorno com uma página de resumos de notas e o próximo cursor"""
+
+    notes: list[NoteSummaryResponse]
+    next_cursor: str | None = None
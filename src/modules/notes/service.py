@@ -4,15 +4,34 @@ import uuid
 
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
+from src.core.cache import user_data_generations
+from src.core.constants import NOTES_DEFAULT_LIMIT, QUICK_CAPTURE_NOTEBOOK_NAME
+from src.core.etag import make_etag
 from src.core.models import Note, Template
+from src.core.pagination import decode_keyset_cursor, encode_keyset_cursor
 from src.modules.notebooks.service import NotebookService as notebook_service
 from src.modules.tags.service import TagService as tag_service
 from src.modules.templates.schemas import TemplateCreate, TemplateFromNoteCreate
 from src.modules.templates.service import TemplateService as template_service
 
 from .repository import NoteRepository as note_repository
-from .schemas import NoteCreate, NoteFromTemplateCreate, NoteUpdate, QuickNoteCreate
+from .schemas import (
+    NoteBulkCreate,
+    NoteBulkCreateResponse,
+    NoteBulkMove,
+    NoteBulkMoveResponse,
+    NoteContentPatch,
+    NoteCreate,
+    NoteFromTemplateCreate,
+    NoteListResponse,
+    NoteSummaryListResponse,
+    NoteTagsBulkResponse,
+    NoteTagsBulkUpdate,
+    NoteUpdate,
+    QuickNoteCreate,
+)
 
 
 class NoteService:
@@ -25,8 +44,27 @@ class NoteService:
         """Cria uma nova nota"""
         notebook_service.get_notebook_by_id(db, notebook_id, user_id)
         new_note = note_repository.create_note(db, note_data, notebook_id, user_id)
+        user_data_generations.bump(user_id)
         return new_note
 
+    @staticmethod
+    def bulk_create_notes(
+        db: Session,
+        bulk_data: NoteBulkCreate,
+        notebook_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> NoteBulkCreateResponse:
+        """Cria várias notas em um caderno, validando o caderno e as tags uma só vez"""
+        notebook_service.get_notebook_by_id(db, notebook_id, user_id)
+        tag_ids = {tag_id for note in bulk_data.notes for tag_id in note.tag_ids}
+        tag_service.ensure_tags_exist(db, tag_ids, user_id)
+
+        note_ids = note_repository.bulk_create_notes(
+            db, bulk_data.notes, notebook_id, user_id
+        )
+        user_data_generations.bump(user_id)
+        return NoteBulkCreateResponse(ids=note_ids)
+
     @staticmethod
     def get_note_by_id(
         db: Session, note_id: uuid.UUID, notebook_id: uuid.UUID, user_id: uuid.UUID
@@ -40,13 +78,114 @@ class NoteService:
             )
         return note
 
+    @staticmethod
+    def get_note_etag(
+        db: Session, note_id: uuid.UUID, notebook_id: uuid.UUID, user_id: uuid.UUID
+    ) -> str:
+        """Calcula a ETag de uma nota a partir das versões, sem carregar o conteúdo"""
+        versions = note_repository.get_note_versions(db, note_id, notebook_id, user_id)
+        if versions is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="A nota não foi encontrada",
+            )
+        return make_etag(note_id, *versions)
+
+    @staticmethod
+    def get_notes_etag(
+        db: Session, user_id: uuid.UUID, notebook_id: uuid.UUID | None = None
+    ) -> str:
+        """
+        Calcula a ETag das listagens de notas de um usuário, ou de um caderno,
+        a partir de um resumo das notas que não lê o conteúdo delas
+        """
+        if notebook_id is not None:
+            notebook_service.get_notebook_by_id(db, notebook_id, user_id)
+        validator = note_repository.get_notes_validator(db, user_id, notebook_id)
+        return make_etag(user_id, notebook_id, *validator)
+
+    @staticmethod
+    def _build_notes_page(
+        notes: list[Note],
+        limit: int,
+        page_schema: type[NoteListResponse | NoteSummaryListResponse] = NoteListResponse,
+    ) -> NoteListResponse | NoteSummaryListResponse:
+        """Mantém até limit notas e gera o cursor com a posição da última mantida"""
+        if len(notes) <= limit:
+            return page_schema(notes=notes)
+
+        last_note = notes[limit - 1]
+        next_cursor = encode_keyset_cursor(
+            "updated_at", last_note.updated_at, last_note.id
+        )
+        return page_schema(notes=notes[:limit], next_cursor=next_cursor)
+
     @staticmethod
     def get_all_notes_from_notebook_id(
-        db: Session, notebook_id: uuid.UUID, user_id: uuid.UUID
-    ) -> list[Note]:
-        """Retorna todas as notas de um caderno"""
+        db: Session,
+        notebook_id: uuid.UUID,
+        user_id: uuid.UUID,
+        limit: int = NOTES_DEFAULT_LIMIT,
+        cursor: str | None = None,
+    ) -> NoteListResponse:
+        """Retorna uma página das notas de um caderno"""
+        position = decode_keyset_cursor(cursor, "updated_at") if cursor else None
         notebook_service.get_notebook_by_id(db, notebook_id, user_id)
-        return note_repository.get_all_notes_from_notebook_id(db, notebook_id, user_id)
+        notes = note_repository.get_all_notes_from_notebook_id(
+            db, notebook_id, user_id, limit, position
+        )
+        return NoteService._build_notes_page(notes, limit)
+
+    @staticmethod
+    def get_note_summaries_from_notebook_id(
+        db: Session,
+        notebook_id: uuid.UUID,
+        user_id: uuid.UUID,
+        limit: int = NOTES_DEFAULT_LIMIT,
+        cursor: str | None = None,
+    ) -> NoteSummaryListResponse:
+        """Retorna uma página dos resumos das notas de um caderno"""
+        position = decode_keyset_cursor(cursor, "updated_at") if cursor else None
+        notebook_service.get_notebook_by_id(db, notebook_id, user_id)
+        notes = note_repository.get_note_summaries_from_notebook_id(
+            db, notebook_id, user_id, limit, position
+        )
+        return NoteService._build_notes_page(notes, limit, NoteSummaryListResponse)
+
+    @staticmethod
+    def apply_content_patch(note: Note, content_patch: NoteContentPatch) -> str:
+        """
+        Aplica as edições ao conteúdo da nota e retorna o novo conteúdo,
+        recusando as edições feitas sobre um conteúdo que não é mais o atual.
+        Mudanças só no título, nas tags, no favorito ou no caderno não contam
+        """
+        if note.version != content_patch.base_version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="O conteúdo da nota foi alterado desde a versão editada",
+            )
+
+        # As posições contam unidades UTF-16, como nos editores do navegador, então
+        # as edições são feitas sobre o conteúdo em UTF-16, com 2 bytes por unidade
+        content = (note.content or "").encode("utf-16-le")
+        for splice in content_patch.operations:
+            start = splice.offset * 2
+            end = start + splice.delete_count * 2
+            if end > len(content):
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="A edição está fora do conteúdo da nota",
+                )
+            insert_text = splice.insert_text.encode("utf-16-le", "surrogatepass")
+            content = content[:start] + insert_text + content[end:]
+
+        try:
+            return content.decode("utf-16-le")
+        except UnicodeDecodeError as err:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="A edição divide um caractere do conteúdo da nota",
+            ) from err
 
     @staticmethod
     def update_note_data_by_id(
@@ -56,7 +195,10 @@ class NoteService:
         note_update_data: NoteUpdate,
         user_id: uuid.UUID,
     ) -> Note:
-        """Atualiza os dados de uma nota existente"""
+        """
+        Atualiza os dados de uma nota existente. O conteúdo pode vir completo ou
+        como edições sobre uma versão da nota
+        """
 
         if note_update_data.notebook_id:
             notebook_service.get_notebook_by_id(
@@ -64,7 +206,26 @@ class NoteService:
             )
 
         note_to_update = NoteService.get_note_by_id(db, note_id, notebook_id, user_id)
-        return note_repository.update_note(db, note_to_update, note_update_data)
+
+        if note_update_data.content_patch is not None:
+            content = NoteService.apply_content_patch(
+                note_to_update, note_update_data.content_patch
+            )
+            note_update_data = note_update_data.model_copy(update={"content": content})
+
+        try:
+            updated_note = note_repository.update_note(
+                db, note_to_update, note_update_data
+            )
+        except StaleDataError as err:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A nota foi alterada desde a versão editada",
+            ) from err
+
+        user_data_generations.bump(user_id)
+        return updated_note
 
     @staticmethod
     def delete_note_by_id(
@@ -73,6 +234,7 @@ class NoteService:
         """Deleta uma nota existente"""
         note_to_delete = NoteService.get_note_by_id(db, note_id, notebook_id, user_id)
         note_repository.delete_note(db, note_to_delete)
+        user_data_generations.bump(user_id)
 
     @staticmethod
     def add_tag_to_note(
@@ -86,6 +248,7 @@ class NoteService:
         note = NoteService.get_note_by_id(db, note_id, notebook_id, user_id)
         tag = tag_service.get_tag_by_id(db, tag_id, user_id)
         note_repository.add_tag_to_note(db, note, tag)
+        user_data_generations.bump(user_id)
         return note, tag
 
     @staticmethod
@@ -100,6 +263,69 @@ class NoteService:
         note = NoteService.get_note_by_id(db, note_id, notebook_id, user_id)
         tag = tag_service.get_tag_by_id(db, tag_id, user_id)
         note_repository.delete_tag_from_note(db, note, tag)
+        user_data_generations.bump(user_id)
+
+    @staticmethod
+    def _ensure_notes_exist(db: Session, note_ids: set[uuid.UUID], user_id: uuid.UUID):
+        """Verifica com uma única consulta se todas as notas pertencem ao usuário"""
+        if note_repository.get_existing_note_ids(db, note_ids, user_id) != note_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="A nota não foi encontrada",
+            )
+
+    @staticmethod
+    def bulk_add_tags_to_notes(
+        db: Session, bulk_data: NoteTagsBulkUpdate, user_id: uuid.UUID
+    ) -> NoteTagsBulkResponse:
+        """Atribui todas as tags a todas as notas enviadas"""
+        NoteService._ensure_notes_exist(db, bulk_data.note_ids, user_id)
+        tag_service.ensure_tags_exist(db, bulk_data.tag_ids, user_id)
+
+        affected = note_repository.bulk_add_tags_to_notes(
+            db, bulk_data.note_ids, bulk_data.tag_ids, user_id
+        )
+        user_data_generations.bump(user_id)
+        return NoteTagsBulkResponse(affected=affected)
+
+    @staticmethod
+    def bulk_delete_tags_from_notes(
+        db: Session, bulk_data: NoteTagsBulkUpdate, user_id: uuid.UUID
+    ) -> NoteTagsBulkResponse:
+        """Remove todas as tags de todas as notas enviadas"""
+        NoteService._ensure_notes_exist(db, bulk_data.note_ids, user_id)
+        tag_service.ensure_tags_exist(db, bulk_data.tag_ids, user_id)
+
+        affected = note_repository.bulk_delete_tags_from_notes(
+            db, bulk_data.note_ids, bulk_data.tag_ids
+        )
+        user_data_generations.bump(user_id)
+        return NoteTagsBulkResponse(affected=affected)
+
+    @staticmethod
+    def bulk_move_notes(
+        db: Session, move_data: NoteBulkMove, user_id: uuid.UUID
+    ) -> NoteBulkMoveResponse:
+        """Move várias notas, ou todas as de um caderno, para o caderno de destino"""
+        notebook_service.get_notebook_by_id(
+            db, move_data.destination_notebook_id, user_id
+        )
+        if move_data.note_ids is not None:
+            NoteService._ensure_notes_exist(db, move_data.note_ids, user_id)
+        else:
+            notebook_service.get_notebook_by_id(
+                db, move_data.source_notebook_id, user_id
+            )
+
+        moved = note_repository.bulk_move_notes(
+            db,
+            move_data.destination_notebook_id,
+            user_id,
+            move_data.note_ids,
+            move_data.source_notebook_id,
+        )
+        user_data_generations.bump(user_id)
+        return NoteBulkMoveResponse(moved=moved)
 
     @staticmethod
     def create_template_from_note(
@@ -137,11 +363,11 @@ class NoteService:
     def create_quick_note(
         db: Session, quick_note_data: QuickNoteCreate, user_id: uuid.UUID
     ) -> Note:
-        """Cria uma nota de captura rápida"""
-        standard_notebook = notebook_service.get_or_create_quick_capture_notebook(
-            db, user_id
-        )
-
+        """
+        Cria uma nota de captura rápida. Com o ID do caderno em cache, é um único
+        INSERT, que confere se o caderno ainda é o de captura rápida. Se não for,
+        o caderno é buscado ou criado de novo e o INSERT é repetido
+        """
         content = quick_note_data.content
         title: str
 
@@ -150,11 +376,47 @@ class NoteService:
         else:
             title = content
 
-        return NoteService.create_note(
-            db, NoteCreate(title=title, content=content), standard_notebook.id, user_id
-        )
+        note_data = NoteCreate(title=title, content=content)
+        new_note = None
+        for use_cache in (True, False):
+            notebook_id = notebook_service.get_quick_capture_notebook_id(
+                db, user_id, use_cache=use_cache
+            )
+            new_note = note_repository.create_note_in_named_notebook(
+                db, note_data, notebook_id, QUICK_CAPTURE_NOTEBOOK_NAME, user_id
+            )
+            if new_note is not None:
+                break
+
+        if new_note is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="O caderno de captura rápida foi alterado, tente novamente",
+            )
+
+        user_data_generations.bump(user_id)
+        return new_note
+
+    @staticmethod
+    def get_all_notes(
+        db: Session,
+        user_id: uuid.UUID,
+        limit: int = NOTES_DEFAULT_LIMIT,
+        cursor: str | None = None,
+    ) -> NoteListResponse:
+        """Retorna uma página das notas de um usuário"""
+        position = decode_keyset_cursor(cursor, "updated_at") if cursor else None
+        notes = note_repository.get_all_notes(db, user_id, limit, position)
+        return NoteService._build_notes_page(notes, limit)
 
     @staticmethod
-    def get_all_notes(db: Session, user_id: uuid.UUID) -> list[Note]:
-        """Retorna todas as notas de um usuário"""
-        return note_repository.get_all_notes(db, user_id)
+    def get_all_note_summaries(
+        db: Session,
+        user_id: uuid.UUID,
+        limit: int = NOTES_DEFAULT_LIMIT,
+        cursor: str | None = None,
+    ) -> NoteSummaryListResponse:
+        """Retorna uma página dos resumos das notas de um usuário"""
+        position = decode_keyset_cursor(cursor, "updated_at") if cursor else None
+        notes = note_repository.get_all_note_summaries(db, user_id, limit, position)
+        return NoteService._build_notes_page(notes, limit, NoteSummaryListResponse)
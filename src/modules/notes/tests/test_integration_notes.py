@@ -1,5 +1,6 @@
 """Arquivo com os testes de integração dos endpoints de Notes"""
 
+import secrets
 import uuid
 
 import pytest
@@ -40,6 +41,73 @@ class TestNoteRoutes:
         assert response.status_code == 404
         assert "O caderno não foi encontrado" in response.json()["detail"]
 
+    def test_bulk_create_notes_returns_201_with_one_insert(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        auth_headers: dict,
+        count_queries,
+    ):
+        """
+        Testa se a criação em lote cria todas as notas, com as suas tags, usando
+        um único INSERT para as notas e devolvendo os IDs na ordem enviada
+        """
+        notebook_id = created_notebook["id"]
+        tag_id = client.post(
+            "/tags/", json={"name": "Importada"}, headers=auth_headers
+        ).json()["id"]
+        payload = {
+            "notes": [
+                {"title": "Importada 1", "content": "Conteúdo 1", "tag_ids": [tag_id]},
+                {"title": "Importada 2"},
+                {"title": "Importada 3", "tag_ids": [tag_id, tag_id]},
+            ]
+        }
+
+        with count_queries() as statements:
+            response = client.post(
+                f"/notebooks/{notebook_id}/notes/bulk", json=payload, headers=auth_headers
+            )
+        ids = response.json()["ids"]
+
+        assert response.status_code == 201
+        assert len(ids) == 3
+        assert sum(s.startswith("INSERT INTO notes") for s in statements) == 1
+
+        notes = {
+            note["id"]: note
+            for note in client.get(
+                f"/notebooks/{notebook_id}/notes/", headers=auth_headers
+            ).json()["notes"]
+        }
+        assert [notes[note_id]["title"] for note_id in ids] == [
+            "Importada 1",
+            "Importada 2",
+            "Importada 3",
+        ]
+        assert [len(notes[note_id]["tags"]) for note_id in ids] == [1, 0, 1]
+
+    def test_bulk_create_notes_with_unknown_tag_returns_404(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """Testa se o lote inteiro é rejeitado quando uma das tags não existe"""
+        notebook_id = created_notebook["id"]
+        payload = {
+            "notes": [
+                {"title": "Sem tag"},
+                {"title": "Tag inexistente", "tag_ids": [str(uuid.uuid4())]},
+            ]
+        }
+
+        response = client.post(
+            f"/notebooks/{notebook_id}/notes/bulk", json=payload, headers=auth_headers
+        )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "A tag não foi encontrada"
+        listed = client.get(f"/notebooks/{notebook_id}/notes/", headers=auth_headers)
+        assert listed.json()["notes"] == []
+
     def test_list_notes_from_existing_notebook_returns_200(
         self,
         client: TestClient,
@@ -54,9 +122,144 @@ class TestNoteRoutes:
         data = response.json()
 
         assert response.status_code == 200
-        assert isinstance(data, list)
-        assert len(data) >= 1
-        assert created_note["id"] in [note["id"] for note in data]
+        assert isinstance(data["notes"], list)
+        assert len(data["notes"]) >= 1
+        assert created_note["id"] in [note["id"] for note in data["notes"]]
+        assert data["next_cursor"] is None
+
+    @pytest.mark.parametrize("list_url", ["/notes/", "/notebooks/{notebook_id}/notes/"])
+    def test_list_notes_paginates_with_cursor(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        auth_headers: dict,
+        list_url: str,
+    ):
+        """
+        Testa se a listagem devolve páginas de no máximo limit notas, da mais
+        para a menos recente, sem repetir nem pular notas entre as páginas
+        """
+        notebook_id = created_notebook["id"]
+        created_ids = [
+            client.post(
+                f"/notebooks/{notebook_id}/notes/",
+                json={"title": f"Nota paginada {index}"},
+                headers=auth_headers,
+            ).json()["id"]
+            for index in range(5)
+        ]
+
+        list_url = list_url.format(notebook_id=notebook_id)
+        pages = []
+        cursor = None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = client.get(list_url, params=params, headers=auth_headers)
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["notes"]) <= 2
+            pages.append(data["notes"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        listed = [note for page in pages for note in page]
+        listed_ids = [note["id"] for note in listed]
+        assert len(pages) == 3
+        assert sorted(listed_ids) == sorted(created_ids)
+        positions = [(note["updated_at"], note["id"]) for note in listed]
+        assert positions == sorted(positions, reverse=True)
+
+    @pytest.mark.parametrize("list_url", ["/notes/", "/notebooks/{notebook_id}/notes/"])
+    def test_list_notes_loads_tags_without_one_query_per_note(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        auth_headers: dict,
+        count_queries,
+        list_url: str,
+    ):
+        """
+        Testa se a quantidade de consultas da listagem não cresce com o número de
+        notas, ou seja, se as tags são carregadas em lote e não nota a nota
+        """
+        notebook_id = created_notebook["id"]
+        tag_id = client.post(
+            "/tags/", json={"name": "Tag em lote"}, headers=auth_headers
+        ).json()["id"]
+        url = list_url.format(notebook_id=notebook_id)
+
+        def create_tagged_notes(amount: int):
+            for index in range(amount):
+                note_id = client.post(
+                    f"/notebooks/{notebook_id}/notes/",
+                    json={"title": f"Nota com tag {index}"},
+                    headers=auth_headers,
+                ).json()["id"]
+                client.post(
+                    f"/notebooks/{notebook_id}/notes/{note_id}/tags/{tag_id}",
+                    headers=auth_headers,
+                )
+
+        def count_listing_queries() -> int:
+            with count_queries() as statements:
+                response = client.get(url, headers=auth_headers)
+            assert response.status_code == 200
+            assert all(note["tags"] for note in response.json()["notes"])
+            return len(statements)
+
+        create_tagged_notes(2)
+        queries_with_few_notes = count_listing_queries()
+        create_tagged_notes(5)
+
+        assert count_listing_queries() == queries_with_few_notes
+
+    @pytest.mark.parametrize(
+        "summary_url", ["/notes/summary", "/notebooks/{notebook_id}/notes/summary"]
+    )
+    def test_list_note_summaries_returns_preview_without_reading_content(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        auth_headers: dict,
+        count_queries,
+        summary_url: str,
+    ):
+        """
+        Testa se a listagem resumida devolve o preview no lugar do conteúdo e se
+        nenhuma consulta feita por ela lê a coluna content
+        """
+        notebook_id = created_notebook["id"]
+        content = "Conteúdo longo " * 100
+        note_id = client.post(
+            f"/notebooks/{notebook_id}/notes/",
+            json={"title": "Nota resumida", "content": content},
+            headers=auth_headers,
+        ).json()["id"]
+
+        with count_queries() as statements:
+            response = client.get(
+                summary_url.format(notebook_id=notebook_id), headers=auth_headers
+            )
+        summaries = response.json()["notes"]
+
+        assert response.status_code == 200
+        summary = next(note for note in summaries if note["id"] == note_id)
+        assert "content" not in summary
+        assert content.startswith(summary["preview"])
+        assert len(summary["preview"]) < len(content)
+        assert not any("notes.content" in statement for statement in statements)
+
+    def test_list_notes_with_invalid_cursor_returns_400(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """Testa se um cursor que não foi gerado pela listagem é rejeitado"""
+        response = client.get(
+            "/notes/", params={"cursor": "invalido"}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Cursor inválido"
 
     def test_get_note_by_id_returns_200(
         self,
@@ -218,6 +421,70 @@ class TestNoteRoutes:
         )
         assert response.status_code == 204
 
+    def test_bulk_add_and_remove_tags_across_notes(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        auth_headers: dict,
+        count_queries,
+    ):
+        """
+        Testa se as tags são atribuídas e removidas de várias notas com um único
+        comando, ignorando as associações que já existiam
+        """
+        notebook_id = created_notebook["id"]
+        note_ids = client.post(
+            f"/notebooks/{notebook_id}/notes/bulk",
+            json={"notes": [{"title": f"Nota {index}"} for index in range(3)]},
+            headers=auth_headers,
+        ).json()["ids"]
+        tag_ids = [
+            client.post("/tags/", json={"name": name}, headers=auth_headers).json()["id"]
+            for name in ("lote-a", "lote-b")
+        ]
+        client.post(
+            f"/notebooks/{notebook_id}/notes/{note_ids[0]}/tags/{tag_ids[0]}",
+            headers=auth_headers,
+        )
+        payload = {"note_ids": note_ids, "tag_ids": tag_ids}
+
+        with count_queries() as statements:
+            add_response = client.post(
+                "/notes/tags:bulk", json=payload, headers=auth_headers
+            )
+
+        assert add_response.status_code == 200
+        assert add_response.json()["affected"] == 5
+        assert sum(s.startswith("INSERT INTO note_tags") for s in statements) == 1
+        notes = client.get("/notes/", headers=auth_headers).json()["notes"]
+        assert all(len(note["tags"]) == 2 for note in notes)
+
+        remove_response = client.request(
+            "DELETE", "/notes/tags:bulk", json=payload, headers=auth_headers
+        )
+
+        assert remove_response.status_code == 200
+        assert remove_response.json()["affected"] == 6
+        notes = client.get("/notes/", headers=auth_headers).json()["notes"]
+        assert all(note["tags"] == [] for note in notes)
+
+    def test_bulk_add_tags_with_unknown_note_returns_404(
+        self, client: TestClient, created_note: dict, auth_headers: dict
+    ):
+        """Testa se nenhuma tag é atribuída quando uma das notas não existe"""
+        tag_id = client.post(
+            "/tags/", json={"name": "lote-c"}, headers=auth_headers
+        ).json()["id"]
+        payload = {
+            "note_ids": [created_note["id"], str(uuid.uuid4())],
+            "tag_ids": [tag_id],
+        }
+
+        response = client.post("/notes/tags:bulk", json=payload, headers=auth_headers)
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "A nota não foi encontrada"
+
     def test_move_note_to_another_notebook(
         self, client: TestClient, created_note: dict, auth_headers: dict
     ):
@@ -293,3 +560,395 @@ class TestNoteRoutes:
         )
         assert notebook_response.status_code == 200
         assert notebook_response.json()["name"] == QUICK_CAPTURE_NOTEBOOK_NAME
+
+    def test_quick_notes_reuse_notebook_until_it_is_renamed(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """
+        Testa se as capturas seguintes usam o mesmo caderno e se, depois que ele
+        é renomeado, um novo caderno de captura rápida é criado
+        """
+
+        def capture(content: str) -> dict:
+            response = client.post(
+                "/notes/quick-capture", json={"content": content}, headers=auth_headers
+            )
+            assert response.status_code == 201
+            return response.json()
+
+        first = capture("Primeira")
+        second = capture("Segunda")
+        client.patch(
+            f"/notebooks/{first['notebook_id']}",
+            json={"name": "Arquivo de capturas"},
+            headers=auth_headers,
+        )
+        third = capture("Terceira")
+
+        assert second["notebook_id"] == first["notebook_id"]
+        assert second["tags"] == []
+        assert third["notebook_id"] != first["notebook_id"]
+        notebook = client.get(
+            f"/notebooks/{third['notebook_id']}", headers=auth_headers
+        ).json()
+        assert notebook["name"] == QUICK_CAPTURE_NOTEBOOK_NAME
+
+
+class TestNoteContentRoutes:
+    """Agrupa os testes da gravação do conteúdo das notas."""
+
+    def test_create_and_update_note_with_token_dense_content(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se uma nota com cerca de 2 MB de palavras distintas é salva, já que
+        só o início do conteúdo entra no search_vector, e se ele continua buscável
+        """
+        tokens = [secrets.token_hex(4) for _ in range(200_000)]
+        notes_url = f"/notebooks/{created_notebook['id']}/notes/"
+
+        create_response = client.post(
+            notes_url,
+            json={"title": "Log", "content": " ".join(tokens)},
+            headers=auth_headers,
+        )
+        update_response = client.patch(
+            f"{notes_url}{create_response.json()['id']}",
+            json={"content": " ".join(reversed(tokens))},
+            headers=auth_headers,
+        )
+        search_response = client.get(
+            "/search/", params={"q": tokens[-1]}, headers=auth_headers
+        )
+
+        assert create_response.status_code == 201
+        assert update_response.status_code == 200
+        assert [item["id"] for item in search_response.json()["results"]] == [
+            create_response.json()["id"]
+        ]
+
+    def test_update_note_returns_server_columns_without_reloading(
+        self,
+        client: TestClient,
+        created_note: dict,
+        auth_headers: dict,
+        count_queries,
+    ):
+        """
+        Testa se o updated_at gerado pelo banco volta no RETURNING do UPDATE,
+        sem um novo SELECT da nota depois do commit
+        """
+        url = f"/notebooks/{created_note['notebook_id']}/notes/{created_note['id']}"
+
+        with count_queries() as statements:
+            response = client.patch(url, json={"content": "autosave"}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["updated_at"] is not None
+        updates = [s for s in statements if s.startswith("UPDATE notes")]
+        assert len(updates) == 1
+        assert "RETURNING notes.updated_at" in updates[0]
+        assert sum(s.startswith("SELECT notes.") for s in statements) == 1
+
+    def test_update_note_with_content_patch_checks_base_version(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se o conteúdo pode ser editado enviando apenas as alterações e se
+        uma edição feita sobre uma versão antiga é recusada
+        """
+        notebook_id = created_notebook["id"]
+        note = client.post(
+            f"/notebooks/{notebook_id}/notes/",
+            json={"title": "Nota editada", "content": "Primeira linha"},
+            headers=auth_headers,
+        ).json()
+        url = f"/notebooks/{notebook_id}/notes/{note['id']}"
+        content_patch = {
+            "base_version": note["version"],
+            "operations": [{"offset": 14, "insert_text": "\nSegunda linha"}],
+        }
+
+        response = client.patch(
+            url, json={"content_patch": content_patch}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["content"] == "Primeira linha\nSegunda linha"
+        assert response.json()["version"] == note["version"] + 1
+
+        stale_response = client.patch(
+            url, json={"content_patch": content_patch}, headers=auth_headers
+        )
+
+        assert stale_response.status_code == 409
+        current = client.get(url, headers=auth_headers).json()
+        assert current["content"] == "Primeira linha\nSegunda linha"
+
+    def test_content_patch_ignores_changes_outside_the_content(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se mudar o título, o favorito ou o caderno da nota, inclusive pela
+        movimentação em lote, não invalida uma edição sobre o conteúdo atual
+        """
+        note = client.post(
+            f"/notebooks/{created_notebook['id']}/notes/",
+            json={"title": "Rascunho", "content": "Texto"},
+            headers=auth_headers,
+        ).json()
+        destination_id = client.post(
+            "/notebooks/", json={"name": "Outro caderno"}, headers=auth_headers
+        ).json()["id"]
+        client.patch(
+            f"/notebooks/{created_notebook['id']}/notes/{note['id']}",
+            json={"title": "Rascunho final", "is_favorite": True},
+            headers=auth_headers,
+        )
+        client.patch(
+            f"/notebooks/{created_notebook['id']}/notes/{note['id']}",
+            json={"notebook_id": destination_id},
+            headers=auth_headers,
+        )
+        client.post(
+            "/notes/move:bulk",
+            json={
+                "destination_notebook_id": created_notebook["id"],
+                "note_ids": [note["id"]],
+            },
+            headers=auth_headers,
+        )
+
+        response = client.patch(
+            f"/notebooks/{created_notebook['id']}/notes/{note['id']}",
+            json={
+                "content_patch": {
+                    "base_version": note["version"],
+                    "operations": [{"offset": 5, "insert_text": " revisado"}],
+                }
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["content"] == "Texto revisado"
+        assert response.json()["title"] == "Rascunho final"
+        assert response.json()["version"] == note["version"] + 1
+
+
+    def test_content_patch_ignores_tag_changes(
+        self, client: TestClient, created_note: dict, auth_headers: dict
+    ):
+        """
+        Testa se adicionar, renomear e remover tags da nota, também em lote, troca
+        a ETag sem invalidar uma edição sobre o conteúdo atual
+        """
+        url = f"/notebooks/{created_note['notebook_id']}/notes/{created_note['id']}"
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+        first_tag_id = client.post(
+            "/tags/", json={"name": "Primeira"}, headers=auth_headers
+        ).json()["id"]
+        second_tag_id = client.post(
+            "/tags/", json={"name": "Segunda"}, headers=auth_headers
+        ).json()["id"]
+        client.post(f"{url}/tags/{first_tag_id}", headers=auth_headers)
+        client.post(
+            "/notes/tags:bulk",
+            json={"note_ids": [created_note["id"]], "tag_ids": [second_tag_id]},
+            headers=auth_headers,
+        )
+        client.patch(
+            f"/tags/{first_tag_id}", json={"name": "Renomeada"}, headers=auth_headers
+        )
+        client.delete(f"{url}/tags/{second_tag_id}", headers=auth_headers)
+
+        response = client.patch(
+            url,
+            json={
+                "content_patch": {
+                    "base_version": created_note["version"],
+                    "operations": [{"offset": 0, "insert_text": "Novo"}],
+                }
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert [tag["name"] for tag in response.json()["tags"]] == ["Renomeada"]
+        assert client.get(url, headers=auth_headers).headers["ETag"] != etag
+
+
+class TestNoteBulkMoveRoutes:
+    """Agrupa os testes da rota que move várias notas de uma só vez."""
+
+    def test_bulk_move_notes_by_ids_and_by_source_notebook(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        auth_headers: dict,
+        count_queries,
+    ):
+        """
+        Testa se as notas escolhidas pelos IDs, e depois todas as notas de um
+        caderno, são movidas com um único UPDATE
+        """
+        source_id = created_notebook["id"]
+        destination_id = client.post(
+            "/notebooks/", json={"name": "Destino em lote"}, headers=auth_headers
+        ).json()["id"]
+        note_ids = client.post(
+            f"/notebooks/{source_id}/notes/bulk",
+            json={"notes": [{"title": f"Movida {index}"} for index in range(4)]},
+            headers=auth_headers,
+        ).json()["ids"]
+
+        with count_queries() as statements:
+            response = client.post(
+                "/notes/move:bulk",
+                json={"destination_notebook_id": destination_id, "note_ids": note_ids[:2]},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["moved"] == 2
+        assert sum(s.startswith("UPDATE notes") for s in statements) == 1
+
+        response = client.post(
+            "/notes/move:bulk",
+            json={
+                "destination_notebook_id": destination_id,
+                "source_notebook_id": source_id,
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["moved"] == 2
+        source_notes = client.get(f"/notebooks/{source_id}/notes/", headers=auth_headers)
+        destination_notes = client.get(
+            f"/notebooks/{destination_id}/notes/", headers=auth_headers
+        )
+        assert source_notes.json()["notes"] == []
+        assert {note["id"] for note in destination_notes.json()["notes"]} == set(
+            note_ids
+        )
+
+    @pytest.mark.parametrize(
+        "selection",
+        [{}, {"note_ids": [str(uuid.uuid4())], "source_notebook_id": str(uuid.uuid4())}],
+    )
+    def test_bulk_move_requires_exactly_one_selection(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        auth_headers: dict,
+        selection: dict,
+    ):
+        """Testa se o lote exige os IDs das notas ou o caderno de origem, não ambos"""
+        response = client.post(
+            "/notes/move:bulk",
+            json={"destination_notebook_id": created_notebook["id"], **selection},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422
+
+
+class TestNoteConditionalRoutes:
+    """Agrupa os testes das leituras condicionais (ETag / If-None-Match) de notas"""
+
+    def test_get_note_returns_304_while_version_is_unchanged(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        auth_headers: dict,
+        count_queries,
+    ):
+        """
+        Testa se a leitura de uma nota responde 304 sem carregar o conteúdo
+        enquanto a versão não muda, e se editar a nota ou as tags troca a ETag
+        """
+        notebook_id = created_notebook["id"]
+        note_id = client.post(
+            f"/notebooks/{notebook_id}/notes/",
+            json={"title": "Nota consultada", "content": "Conteúdo " * 100},
+            headers=auth_headers,
+        ).json()["id"]
+        url = f"/notebooks/{notebook_id}/notes/{note_id}"
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+
+        with count_queries() as statements:
+            response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        assert not any("notes.content" in statement for statement in statements)
+
+        client.patch(url, json={"is_favorite": True}, headers=auth_headers)
+        edited = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+
+        assert edited.status_code == 200
+        assert edited.json()["is_favorite"] is True
+        assert edited.headers["ETag"] != etag
+
+        tag_id = client.post(
+            "/tags/", json={"name": "Tag condicional"}, headers=auth_headers
+        ).json()["id"]
+        client.post(f"{url}/tags/{tag_id}", headers=auth_headers)
+        tagged = client.get(
+            url, headers={**auth_headers, "If-None-Match": edited.headers["ETag"]}
+        )
+
+        assert tagged.status_code == 200
+        assert [tag["id"] for tag in tagged.json()["tags"]] == [tag_id]
+
+    @pytest.mark.parametrize(
+        "list_url",
+        ["/notes/", "/notes/summary", "/notebooks/{notebook_id}/notes/"],
+    )
+    def test_list_notes_returns_304_until_notes_change(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        created_note: dict,
+        auth_headers: dict,
+        list_url: str,
+    ):
+        """
+        Testa se a listagem responde 304 enquanto as notas não mudam e se criar,
+        apagar uma nota ou renomear uma tag dela troca a ETag
+        """
+        notebook_id = created_notebook["id"]
+        url = list_url.format(notebook_id=notebook_id)
+        tag_id = client.post(
+            "/tags/", json={"name": "Tag listada"}, headers=auth_headers
+        ).json()["id"]
+        client.post(
+            f"/notebooks/{notebook_id}/notes/{created_note['id']}/tags/{tag_id}",
+            headers=auth_headers,
+        )
+
+        def get_with_etag(etag: str) -> tuple[int, str]:
+            response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+            return response.status_code, response.headers["ETag"]
+
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+        assert get_with_etag(etag) == (304, etag)
+
+        new_note_id = client.post(
+            f"/notebooks/{notebook_id}/notes/",
+            json={"title": "Nota nova"},
+            headers=auth_headers,
+        ).json()["id"]
+        status_code, etag = get_with_etag(etag)
+        assert status_code == 200
+
+        client.delete(f"/notebooks/{notebook_id}/notes/{new_note_id}", headers=auth_headers)
+        status_code, etag = get_with_etag(etag)
+        assert status_code == 200
+
+        client.patch(f"/tags/{tag_id}", json={"name": "Renomeada"}, headers=auth_headers)
+        status_code, etag = get_with_etag(etag)
+        assert status_code == 200
+        assert get_with_etag(etag) == (304, etag)
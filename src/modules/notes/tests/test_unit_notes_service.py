@@ -8,7 +8,13 @@ from fastapi import HTTPException
 
 from src.core.constants import QUICK_CAPTURE_NOTEBOOK_NAME
 from src.core.models import Note, Notebook
-from src.modules.notes.schemas import NoteCreate, NoteUpdate, QuickNoteCreate
+from src.modules.notes.schemas import (
+    NoteBulkCreate,
+    NoteContentPatch,
+    NoteCreate,
+    NoteUpdate,
+    QuickNoteCreate,
+)
 from src.modules.notes.service import NoteService
 
 TEST_USER_ID = uuid.uuid4()
@@ -85,6 +91,38 @@ class TestUnitNoteService:
         assert exc_info.value.status_code == 404
         mock_note_repo.create_note.assert_not_called()
 
+    def test_bulk_create_notes_validates_notebook_and_tags_once(
+        self, mock_note_repo: MagicMock, mock_notebook_service: MagicMock
+    ):
+        """Testa se o caderno e as tags são validados uma única vez para todo o lote"""
+        notebook_id = uuid.uuid4()
+        tag_id = uuid.uuid4()
+        bulk_data = NoteBulkCreate(
+            notes=[
+                {"title": "Nota 1", "tag_ids": [tag_id]},
+                {"title": "Nota 2", "tag_ids": [tag_id]},
+            ]
+        )
+        note_ids = [uuid.uuid4(), uuid.uuid4()]
+        mock_note_repo.bulk_create_notes.return_value = note_ids
+        mock_db_session = MagicMock()
+
+        with patch("src.modules.notes.service.tag_service") as mock_tag_service:
+            result = NoteService.bulk_create_notes(
+                mock_db_session, bulk_data, notebook_id, TEST_USER_ID
+            )
+
+        mock_notebook_service.get_notebook_by_id.assert_called_once_with(
+            mock_db_session, notebook_id, TEST_USER_ID
+        )
+        mock_tag_service.ensure_tags_exist.assert_called_once_with(
+            mock_db_session, {tag_id}, TEST_USER_ID
+        )
+        mock_note_repo.bulk_create_notes.assert_called_once_with(
+            mock_db_session, bulk_data.notes, notebook_id, TEST_USER_ID
+        )
+        assert result.ids == note_ids
+
     def test_get_note_by_id_success(self, mock_note_repo: MagicMock):
         """Testa se a busca por uma nota pelo id tem sucesso"""
         notebook_id = uuid.uuid4()
@@ -123,6 +161,33 @@ class TestUnitNoteService:
         assert exc_info.value.status_code == 404
         assert "A nota não foi encontrada" in exc_info.value.detail
 
+    def test_get_note_etag_follows_version(self, mock_note_repo: MagicMock):
+        """
+        Testa se a ETag muda junto com a versão da nota e se uma nota
+        inexistente levanta um 404
+        """
+        notebook_id = uuid.uuid4()
+        note_id = uuid.uuid4()
+        mock_db_session = MagicMock()
+
+        def get_etag() -> str:
+            return NoteService.get_note_etag(
+                mock_db_session, note_id, notebook_id, TEST_USER_ID
+            )
+
+        mock_note_repo.get_note_versions.return_value = (3, 5)
+        etag = get_etag()
+
+        assert get_etag() == etag
+        mock_note_repo.get_note_versions.return_value = (3, 6)
+        assert get_etag() != etag
+
+        mock_note_repo.get_note_versions.return_value = None
+        with pytest.raises(HTTPException) as exc_info:
+            get_etag()
+
+        assert exc_info.value.status_code == 404
+
     @pytest.mark.parametrize(
         "update_data, expected_title, expected_content",
         [
@@ -176,6 +241,60 @@ class TestUnitNoteService:
         assert result.title == expected_title
         assert result.content == expected_content
 
+    def test_apply_content_patch_applies_splices_in_order(self):
+        """Testa se as edições são aplicadas em ordem, cada uma sobre a anterior"""
+        note = Note(content="Olá mundo", version=3)
+        content_patch = NoteContentPatch(
+            base_version=3,
+            operations=[
+                {"offset": 4, "delete_count": 5, "insert_text": "Estrato"},
+                {"offset": 11, "insert_text": "!"},
+                {"offset": 0, "delete_count": 3, "insert_text": "Oi,"},
+            ],
+        )
+
+        assert NoteService.apply_content_patch(note, content_patch) == "Oi, Estrato!"
+
+    def test_apply_content_patch_counts_utf16_code_units(self):
+        """
+        Testa se as posições contam unidades UTF-16, em que um emoji fora do plano
+        básico ocupa duas, como no JavaScript
+        """
+        note = Note(content="🚀 Olá mundo", version=3)
+        content_patch = NoteContentPatch(
+            base_version=3,
+            operations=[
+                {"offset": 7, "delete_count": 5, "insert_text": "Estrato"},
+                {"offset": 0, "delete_count": 2, "insert_text": "✨"},
+            ],
+        )
+
+        assert NoteService.apply_content_patch(note, content_patch) == "✨ Olá Estrato"
+
+    @pytest.mark.parametrize(
+        "base_version, operation, expected_status",
+        [
+            (2, {"offset": 0, "insert_text": "x"}, 409),
+            (3, {"offset": 5, "delete_count": 10}, 422),
+            (3, {"offset": 1, "insert_text": "x"}, 422),
+        ],
+    )
+    def test_apply_content_patch_rejects_stale_or_out_of_range_edits(
+        self, base_version: int, operation: dict, expected_status: int
+    ):
+        """
+        Testa se edições sobre outra versão, fora do conteúdo ou no meio de um
+        caractere são recusadas
+        """
+        note = Note(content="🚀 Olá", version=3)
+        content_patch = NoteContentPatch(
+            base_version=base_version, operations=[operation]
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            NoteService.apply_content_patch(note, content_patch)
+        assert exc_info.value.status_code == expected_status
+
     def test_delete_note_by_id(self, mock_note_repo: MagicMock):
         """Testa a deleção de uma nota pelo id"""
         notebook_id = uuid.uuid4()
@@ -221,21 +340,17 @@ class TestUnitNoteService:
         content: str,
         expected_title: str,
     ):
-        """Testa a criação de uma nota rápida"""
+        """Testa a criação de uma nota rápida com o ID do caderno em cache"""
         mock_db_session = MagicMock()
         quick_note_data = QuickNoteCreate(content=content)
-        mock_quick_capture_notebook = Notebook(
-            id=uuid.uuid4(), name=QUICK_CAPTURE_NOTEBOOK_NAME, user_id=TEST_USER_ID
-        )
+        notebook_id = uuid.uuid4()
 
-        mock_notebook_service.get_or_create_quick_capture_notebook.return_value = (
-            mock_quick_capture_notebook
-        )
-        mock_note_repo.create_note.return_value = Note(
+        mock_notebook_service.get_quick_capture_notebook_id.return_value = notebook_id
+        mock_note_repo.create_note_in_named_notebook.return_value = Note(
             id=uuid.uuid4(),
             title=expected_title,
             content=content,
-            notebook_id=mock_quick_capture_notebook.id,
+            notebook_id=notebook_id,
             user_id=TEST_USER_ID,
         )
 
@@ -243,16 +358,46 @@ class TestUnitNoteService:
             mock_db_session, quick_note_data, TEST_USER_ID
         )
 
-        mock_notebook_service.get_or_create_quick_capture_notebook.assert_called_once_with(
-            mock_db_session, TEST_USER_ID
+        mock_notebook_service.get_quick_capture_notebook_id.assert_called_once_with(
+            mock_db_session, TEST_USER_ID, use_cache=True
         )
-
-        assert len(mock_note_repo.create_note.call_args_list) == 1
-        call_args = mock_note_repo.create_note.call_args[0]
+        mock_note_repo.create_note_in_named_notebook.assert_called_once()
+        call_args = mock_note_repo.create_note_in_named_notebook.call_args[0]
         assert call_args[1].title == expected_title
         assert call_args[1].content == content
-        assert call_args[2] == mock_quick_capture_notebook.id
-        assert call_args[3] == TEST_USER_ID
+        assert call_args[2:] == (notebook_id, QUICK_CAPTURE_NOTEBOOK_NAME, TEST_USER_ID)
 
         assert result.title == expected_title
-        assert result.notebook_id == mock_quick_capture_notebook.id
+        assert result.notebook_id == notebook_id
+
+    def test_create_quick_note_with_stale_notebook_id_retries_without_cache(
+        self, mock_note_repo: MagicMock, mock_notebook_service: MagicMock
+    ):
+        """
+        Testa se, quando o caderno em cache não é mais o de captura rápida, o ID
+        é buscado de novo no banco e a nota é criada no caderno atual
+        """
+        mock_db_session = MagicMock()
+        stale_id = uuid.uuid4()
+        current_id = uuid.uuid4()
+        new_note = Note(id=uuid.uuid4(), notebook_id=current_id, user_id=TEST_USER_ID)
+
+        mock_notebook_service.get_quick_capture_notebook_id.side_effect = [
+            stale_id,
+            current_id,
+        ]
+        mock_note_repo.create_note_in_named_notebook.side_effect = [None, new_note]
+
+        result = NoteService.create_quick_note(
+            mock_db_session, QuickNoteCreate(content="Ideia"), TEST_USER_ID
+        )
+
+        assert result is new_note
+        assert [
+            call.kwargs["use_cache"]
+            for call in mock_notebook_service.get_quick_capture_notebook_id.call_args_list
+        ] == [True, False]
+        assert [
+            call.args[2]
+            for call in mock_note_repo.create_note_in_named_notebook.call_args_list
+        ] == [stale_id, current_id]
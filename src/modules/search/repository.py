@@ -1,74 +1,416 @@
 """Repository do Módulo de Search"""
 
 import uuid
+from collections.abc import Iterator
 
-from sqlalchemy import or_, select, union_all
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, and_, cast, func, or_, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import InstrumentedAttribute, Session
 from sqlalchemy.sql import literal_column
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.selectable import Select
 
-from src.core.models import Note, Notebook, Tag, Template
+from src.core.config import settings
+from src.core.constants import (
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_HIGHLIGHT_START,
+    SEARCH_HIGHLIGHT_STOP,
+    SEARCH_STREAM_BATCH_SIZE,
+    SUGGEST_DEFAULT_LIMIT,
+    TEXT_SEARCH_CONFIG,
+)
+from src.core.models import Note, Notebook, Tag, Template, note_tags
+
+from .schemas import SearchFilters, SearchMode, SearchResultType, TagMatch
 
 
 class SearchRepository:
     """Classe do Repository de Search com os métodos que fazem as buscas no banco"""
 
     @staticmethod
-    def notes_subquery(search_pattern: str, user_id: uuid.UUID) -> Select:
-        """Cria a subconsulta para buscar em Notas (titulo e conteudo)"""
-        return select(
+    def text_search_query(query_term: str) -> ColumnElement:
+        """Converte o termo buscado em uma tsquery usando a configuração do projeto"""
+        return func.websearch_to_tsquery(
+            cast(TEXT_SEARCH_CONFIG, REGCONFIG), query_term
+        )
+
+    @staticmethod
+    def snippet_options() -> str:
+        """Monta as opções do ts_headline com a janela configurada para os trechos"""
+        return (
+            f"StartSel={SEARCH_HIGHLIGHT_START}, StopSel={SEARCH_HIGHLIGHT_STOP}, "
+            f"MinWords={settings.SEARCH_SNIPPET_MIN_WORDS}, "
+            f"MaxWords={settings.SEARCH_SNIPPET_MAX_WORDS}, "
+            f"MaxFragments={settings.SEARCH_SNIPPET_MAX_FRAGMENTS}"
+        )
+
+    @staticmethod
+    def escape_html(column: ColumnElement) -> ColumnElement:
+        """
+        Escapa &, < e > do texto, para que o trecho destacado com <mark> possa ser
+        exibido como HTML sem executar o HTML salvo na nota
+        """
+        for character, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+            column = func.replace(column, character, entity)
+        return column
+
+    @staticmethod
+    def apply_note_filters(query: Select, filters: SearchFilters) -> Select:
+        """Aplica à subconsulta de notas os filtros de caderno, tags e favoritas"""
+        if filters.notebook_id:
+            query = query.where(Note.notebook_id == filters.notebook_id)
+
+        if filters.favorites_only:
+            # Sem IS TRUE, para o planner usar o índice parcial das favoritas
+            query = query.where(Note.is_favorite)
+
+        if filters.tag_ids:
+            tag_ids = set(filters.tag_ids)
+            tagged_notes = select(note_tags.c.note_id).where(
+                note_tags.c.tag_id.in_(tag_ids)
+            )
+
+            if filters.tag_match == TagMatch.ALL:
+                tagged_notes = tagged_notes.group_by(note_tags.c.note_id).having(
+                    func.count() == len(tag_ids)
+                )
+
+            query = query.where(Note.id.in_(tagged_notes))
+
+        return query
+
+    @staticmethod
+    def notes_subquery(
+        search_pattern: str,
+        query_term: str,
+        user_id: uuid.UUID,
+        filters: SearchFilters | None = None,
+    ) -> Select:
+        """Cria a subconsulta para buscar em Notas (search_vector e trecho do titulo)"""
+        text_query = SearchRepository.text_search_query(query_term)
+
+        query = select(
             Note.id,
             Note.title.label("name"),
             literal_column("'note'").label("type"),
-            Note.content.label("snippet"),
+            func.ts_headline(
+                cast(TEXT_SEARCH_CONFIG, REGCONFIG),
+                SearchRepository.escape_html(Note.content),
+                text_query,
+                SearchRepository.snippet_options(),
+            ).label("snippet"),
+            cast(func.ts_rank(Note.search_vector, text_query), Float).label("score"),
         ).where(
-            or_(Note.title.ilike(search_pattern), Note.content.ilike(search_pattern)),
+            or_(
+                Note.search_vector.bool_op("@@")(text_query),
+                Note.title.ilike(search_pattern),
+            ),
             Note.user_id == user_id,
         )
 
+        if filters is not None:
+            query = SearchRepository.apply_note_filters(query, filters)
+
+        return query
+
     @staticmethod
-    def notebooks_subquery(search_pattern: str, user_id: uuid.UUID) -> Select:
+    def notebooks_subquery(
+        search_pattern: str, query_term: str, user_id: uuid.UUID
+    ) -> Select:
         """Cria a subconsulta para buscar em Notebooks (nome)"""
         return select(
             Notebook.id,
             Notebook.name.label("name"),
             literal_column("'notebook'").label("type"),
             literal_column("NULL").label("snippet"),
+            cast(func.similarity(Notebook.name, query_term), Float).label("score"),
         ).where(Notebook.name.ilike(search_pattern), Notebook.user_id == user_id)
 
     @staticmethod
-    def tag_subquery(search_pattern: str, user_id: uuid.UUID) -> Select:
+    def tag_subquery(search_pattern: str, query_term: str, user_id: uuid.UUID) -> Select:
         """Cria a subconsulta para buscar em Tags (nome)"""
         return select(
             Tag.id,
             Tag.name.label("name"),
             literal_column("'tag'").label("type"),
             literal_column("NULL").label("snippet"),
+            cast(func.similarity(Tag.name, query_term), Float).label("score"),
         ).where(Tag.name.ilike(search_pattern), Tag.user_id == user_id)
 
     @staticmethod
-    def template_subquery(search_pattern: str, user_id: uuid.UUID) -> Select:
+    def template_subquery(
+        search_pattern: str, query_term: str, user_id: uuid.UUID
+    ) -> Select:
         """Cria a subconsulta para buscar em Templates (nome)"""
         return select(
             Template.id,
             Template.name.label("name"),
             literal_column("'template'").label("type"),
             literal_column("NULL").label("snippet"),
+            cast(func.similarity(Template.name, query_term), Float).label("score"),
         ).where(Template.name.ilike(search_pattern), Template.user_id == user_id)
 
     @staticmethod
-    def search_query(db: Session, query_term: str, user_id: uuid.UUID) -> list:
-        """Executa uma busca unificada com as subqueries em Nota, Notebook, Template e Tag"""
+    def fuzzy_subquery(
+        entity: type,
+        name_column: InstrumentedAttribute,
+        result_type: SearchResultType,
+        query_term: str,
+        user_id: uuid.UUID,
+    ) -> Select:
+        """
+        Cria a subconsulta tolerante a erros de digitação, que encontra os nomes com
+        similaridade de trigramas acima do limiar (operador %>, coberto pelo índice
+        GIN gin_trgm_ops) e usa essa similaridade como score
+        """
+        return select(
+            entity.id,
+            name_column.label("name"),
+            literal_column(f"'{result_type.value}'").label("type"),
+            literal_column("NULL").label("snippet"),
+            cast(func.word_similarity(query_term, name_column), Float).label("score"),
+        ).where(name_column.op("%>")(query_term), entity.user_id == user_id)
+
+    @staticmethod
+    def set_fuzzy_threshold(db: Session):
+        """Define, apenas para a transação atual, o limiar de similaridade do %>"""
+        db.execute(
+            select(
+                func.set_config(
+                    "pg_trgm.word_similarity_threshold",
+                    str(settings.SEARCH_FUZZY_THRESHOLD),
+                    True,
+                )
+            )
+        )
+
+    @staticmethod
+    def paginate_subquery(
+        subquery: Select, limit: int, position: tuple[float, uuid.UUID] | None
+    ) -> Select:
+        """
+        Ordena uma subconsulta pela relevância e aplica o limite e o keyset
+        (score, id) da última página, buscando um item a mais para indicar
+        se ainda existem resultados
+        """
+        ranked = subquery.subquery()
+        page = select(ranked)
+
+        if position is not None:
+            last_score, last_id = position
+            page = page.where(
+                or_(
+                    ranked.c.score < last_score,
+                    and_(ranked.c.score == last_score, ranked.c.id > last_id),
+                )
+            )
+
+        return page.order_by(ranked.c.score.desc(), ranked.c.id).limit(limit + 1)
+
+    @staticmethod
+    def fuzzy_subqueries_by_type(
+        query_term: str, user_id: uuid.UUID, filters: SearchFilters | None = None
+    ) -> dict[SearchResultType, Select]:
+        """Monta a subconsulta por similaridade de cada tipo de resultado"""
+        notes = SearchRepository.fuzzy_subquery(
+            Note, Note.title, SearchResultType.NOTE, query_term, user_id
+        )
+        if filters is not None:
+            notes = SearchRepository.apply_note_filters(notes, filters)
+
+        if filters is not None and filters.is_active:
+            return {SearchResultType.NOTE: notes}
+
+        name_columns = {
+            SearchResultType.NOTEBOOK: (Notebook, Notebook.name),
+            SearchResultType.TAG: (Tag, Tag.name),
+            SearchResultType.TEMPLATE: (Template, Template.name),
+        }
+
+        return {
+            SearchResultType.NOTE: notes,
+            **{
+                result_type: SearchRepository.fuzzy_subquery(
+                    entity, name_column, result_type, query_term, user_id
+                )
+                for result_type, (entity, name_column) in name_columns.items()
+            },
+        }
+
+    @staticmethod
+    def subqueries_by_type(
+        query_term: str,
+        user_id: uuid.UUID,
+        filters: SearchFilters | None = None,
+        mode: SearchMode = SearchMode.EXACT,
+    ) -> dict[SearchResultType, Select]:
+        """
+        Monta a subconsulta de cada tipo de resultado. Como os filtros só se aplicam
+        às notas, apenas elas são buscadas quando algum filtro é informado
+        """
+        if mode == SearchMode.FUZZY:
+            return SearchRepository.fuzzy_subqueries_by_type(
+                query_term, user_id, filters
+            )
+
+        search_pattern = f"%{query_term}%"
+        notes = SearchRepository.notes_subquery(
+            search_pattern, query_term, user_id, filters
+        )
+
+        if filters is not None and filters.is_active:
+            return {SearchResultType.NOTE: notes}
+
+        return {
+            SearchResultType.NOTE: notes,
+            SearchResultType.NOTEBOOK: SearchRepository.notebooks_subquery(
+                search_pattern, query_term, user_id
+            ),
+            SearchResultType.TAG: SearchRepository.tag_subquery(
+                search_pattern, query_term, user_id
+            ),
+            SearchResultType.TEMPLATE: SearchRepository.template_subquery(
+                search_pattern, query_term, user_id
+            ),
+        }
+
+    @staticmethod
+    def search_query(
+        db: Session,
+        query_term: str,
+        user_id: uuid.UUID,
+        limit: int = SEARCH_DEFAULT_LIMIT,
+        positions: dict[SearchResultType, tuple[float, uuid.UUID] | None] | None = None,
+        filters: SearchFilters | None = None,
+        mode: SearchMode = SearchMode.EXACT,
+    ) -> list:
+        """
+        Executa uma busca unificada com as subqueries em Nota, Notebook, Template e Tag,
+        trazendo no máximo limit + 1 itens de cada tipo ordenados pela relevância.
+        Quando positions é passado, busca apenas os tipos presentes nele a partir
+        da posição salva.
+        """
         if not query_term:
             return []
 
-        search_pattern = f"%{query_term}%"
+        if mode == SearchMode.FUZZY:
+            SearchRepository.set_fuzzy_threshold(db)
+
+        subqueries = SearchRepository.subqueries_by_type(
+            query_term, user_id, filters, mode
+        )
 
-        notes = SearchRepository.notes_subquery(search_pattern, user_id)
-        notebooks = SearchRepository.notebooks_subquery(search_pattern, user_id)
-        tags = SearchRepository.tag_subquery(search_pattern, user_id)
-        templates = SearchRepository.template_subquery(search_pattern, user_id)
+        if positions is None:
+            positions = dict.fromkeys(subqueries)
 
-        unified_query = union_all(notes, notebooks, tags, templates)
+        pages = []
+        for result_type, subquery in subqueries.items():
+            if result_type not in positions:
+                continue
+
+            pages.append(
+                SearchRepository.paginate_subquery(
+                    subquery, limit, positions[result_type]
+                )
+            )
+
+        if not pages:
+            return []
+
+        unified = union_all(*pages).subquery()
+        unified_query = select(unified).order_by(
+            unified.c.score.desc(), unified.c.id
+        )
 
         return db.execute(unified_query).all()
+
+    @staticmethod
+    def stream_search_query(
+        db: Session,
+        query_term: str,
+        user_id: uuid.UUID,
+        filters: SearchFilters | None = None,
+        mode: SearchMode = SearchMode.EXACT,
+    ) -> Iterator[Row]:
+        """
+        Executa a busca unificada sem limite usando um cursor no servidor, trazendo
+        as linhas em lotes para que a memória não cresça com o número de resultados.
+        Cada tipo vem ordenado pela relevância, um tipo após o outro.
+        """
+        if not query_term:
+            return
+
+        if mode == SearchMode.FUZZY:
+            SearchRepository.set_fuzzy_threshold(db)
+
+        subqueries = SearchRepository.subqueries_by_type(
+            query_term, user_id, filters, mode
+        )
+        pages = [
+            subquery.order_by(literal_column("score").desc())
+            for subquery in subqueries.values()
+        ]
+        unified_query = union_all(*pages).execution_options(
+            yield_per=SEARCH_STREAM_BATCH_SIZE
+        )
+
+        yield from db.execute(unified_query)
+
+    @staticmethod
+    def prefix_subquery(
+        entity: type,
+        name_column: InstrumentedAttribute,
+        result_type: SearchResultType,
+        prefix: str,
+        user_id: uuid.UUID,
+        limit: int,
+    ) -> Select:
+        """
+        Cria a subconsulta de sugestões para os nomes que começam com o prefixo,
+        usando o índice (user_id, lower(nome) COLLATE "C") para filtrar e ordenar
+        """
+        name_key = func.lower(name_column).collate("C")
+
+        return (
+            select(
+                entity.id,
+                name_column.label("name"),
+                literal_column(f"'{result_type.value}'").label("type"),
+                literal_column("NULL").label("snippet"),
+                literal_column("NULL").label("score"),
+            )
+            .where(
+                entity.user_id == user_id,
+                name_key.startswith(prefix, autoescape=True),
+            )
+            .order_by(name_key)
+            .limit(limit)
+        )
+
+    @staticmethod
+    def suggest_query(
+        db: Session,
+        prefix: str,
+        user_id: uuid.UUID,
+        limit: int = SUGGEST_DEFAULT_LIMIT,
+    ) -> list:
+        """Busca até limit nomes de cada tipo que começam com o prefixo informado"""
+        if not prefix:
+            return []
+
+        name_columns = {
+            SearchResultType.NOTEBOOK: (Notebook, Notebook.name),
+            SearchResultType.TAG: (Tag, Tag.name),
+            SearchResultType.TEMPLATE: (Template, Template.name),
+            SearchResultType.NOTE: (Note, Note.title),
+        }
+
+        pages = [
+            SearchRepository.prefix_subquery(
+                entity, name_column, result_type, prefix, user_id, limit
+            )
+            for result_type, (entity, name_column) in name_columns.items()
+        ]
+
+        return db.execute(union_all(*pages)).all()
@@ -3,13 +3,27 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from src.core.constants import (
+    NDJSON_MEDIA_TYPE,
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_MAX_LIMIT,
+    SUGGEST_DEFAULT_LIMIT,
+    SUGGEST_MAX_LIMIT,
+)
 from src.core.database import get_db
 from src.core.security import get_current_user_id
 
-from .schemas import SearchResponse
+from .schemas import (
+    SearchFilters,
+    SearchMode,
+    SearchResponse,
+    SuggestResponse,
+    TagMatch,
+)
 from .service import SearchService as search_service
 
 router = APIRouter(prefix="/search", tags=["Search"])
@@ -20,6 +34,15 @@ router = APIRouter(prefix="/search", tags=["Search"])
     status_code=status.HTTP_200_OK,
     response_model=SearchResponse,
     summary="Executa a busca unificada",
+    responses={
+        status.HTTP_200_OK: {
+            "content": {NDJSON_MEDIA_TYPE: {}},
+            "description": (
+                f"Com 'Accept: {NDJSON_MEDIA_TYPE}', todos os resultados são enviados"
+                " em stream, um item por linha, ignorando limit e cursor"
+            ),
+        }
+    },
 )
 def search(
     q: Annotated[
@@ -31,7 +54,87 @@ def search(
     ],
     db: Annotated[Session, Depends(get_db)],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-) -> SearchResponse:
+    limit: Annotated[
+        int,
+        Query(
+            description="Quantidade máxima de resultados de cada tipo",
+            ge=1,
+            le=SEARCH_MAX_LIMIT,
+        ),
+    ] = SEARCH_DEFAULT_LIMIT,
+    cursor: Annotated[
+        str | None,
+        Query(description="Cursor retornado pela página anterior da busca"),
+    ] = None,
+    mode: Annotated[
+        SearchMode,
+        Query(
+            description=(
+                "'exact' busca pelo texto e 'fuzzy' tolera erros de digitação"
+                " comparando os nomes por similaridade"
+            )
+        ),
+    ] = SearchMode.EXACT,
+    notebook_id: Annotated[
+        uuid.UUID | None, Query(description="Busca apenas nas notas deste caderno")
+    ] = None,
+    tag_ids: Annotated[
+        list[uuid.UUID] | None,
+        Query(description="Busca apenas nas notas com estas tags"),
+    ] = None,
+    tag_match: Annotated[
+        TagMatch,
+        Query(description="'any' exige ao menos uma das tags e 'all' exige todas elas"),
+    ] = TagMatch.ANY,
+    favorites_only: Annotated[
+        bool, Query(description="Busca apenas nas notas favoritas")
+    ] = False,
+    accept: Annotated[str | None, Header()] = None,
+) -> SearchResponse | StreamingResponse:
     """Realiza a busca baseada na query passada por parâmetro"""
 
-    return search_service.search(db, q, user_id)
+    filters = SearchFilters(
+        notebook_id=notebook_id,
+        tag_ids=tag_ids or [],
+        tag_match=tag_match,
+        favorites_only=favorites_only,
+    )
+
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            search_service.stream_search(db, q, user_id, filters, mode),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    return search_service.search(db, q, user_id, limit, cursor, filters, mode)
+
+
+@router.get(
+    "/suggest",
+    status_code=status.HTTP_200_OK,
+    response_model=SuggestResponse,
+    summary="Sugere nomes enquanto o usuário digita",
+)
+def suggest(
+    prefix: Annotated[
+        str,
+        Query(
+            description="Início do nome de notas, cadernos, tags e templates",
+            min_length=1,
+            max_length=200,
+        ),
+    ],
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    limit: Annotated[
+        int,
+        Query(
+            description="Quantidade máxima de sugestões de cada tipo",
+            ge=1,
+            le=SUGGEST_MAX_LIMIT,
+        ),
+    ] = SUGGEST_DEFAULT_LIMIT,
+) -> SuggestResponse:
+    """Retorna as sugestões de autocompletar para o prefixo passado por parâmetro"""
+
+    return search_service.suggest(db, prefix, user_id, limit)
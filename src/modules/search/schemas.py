@@ -3,7 +3,7 @@
 import uuid
 from enum import Enum
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SearchResultType(str, Enum):
@@ -15,6 +15,41 @@ class SearchResultType(str, Enum):
     TEMPLATE = "template"
 
 
+class SearchMode(str, Enum):
+    """Enum com os modos de busca disponíveis"""
+
+    EXACT = "exact"
+    FUZZY = "fuzzy"
+
+
+class TagMatch(str, Enum):
+    """Enum com as formas de combinar as tags passadas no filtro da busca"""
+
+    ANY = "any"
+    ALL = "all"
+
+
+class SearchFilters(BaseModel):
+    """Schema com os filtros da busca. Quando usados, a busca retorna apenas notas"""
+
+    notebook_id: uuid.UUID | None = Field(
+        None, description="Busca apenas nas notas deste caderno"
+    )
+    tag_ids: list[uuid.UUID] = Field(
+        default_factory=list, description="Busca apenas nas notas com estas tags"
+    )
+    tag_match: TagMatch = Field(
+        TagMatch.ANY,
+        description="'any' exige ao menos uma das tags e 'all' exige todas elas",
+    )
+    favorites_only: bool = Field(False, description="Busca apenas nas notas favoritas")
+
+    @property
+    def is_active(self) -> bool:
+        """Indica se algum filtro foi informado"""
+        return bool(self.notebook_id or self.tag_ids or self.favorites_only)
+
+
 class SearchResultItem(BaseModel):
     """Schema com os dados para cada item encontrado na busca"""
 
@@ -22,6 +57,7 @@ class SearchResultItem(BaseModel):
     name: str
     type: SearchResultType
     snippet: str | None = None
+    score: float | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -30,3 +66,10 @@ class SearchResponse(BaseModel):
     """Schema de retorno geral com todos os itens encontrados na busca"""
 
     results: list[SearchResultItem]
+    next_cursor: str | None = None
+
+
+class SuggestResponse(BaseModel):
+    """Schema de retorno com os nomes sugeridos para um prefixo"""
+
+    suggestions: list[SearchResultItem]
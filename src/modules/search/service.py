@@ -1,23 +1,161 @@
 """Service do Módulo Search"""
 
 import uuid
+from collections import Counter
+from collections.abc import Iterator
 
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from src.core.cache import TTLCache, user_data_generations
+from src.core.config import settings
+from src.core.constants import SEARCH_DEFAULT_LIMIT, SUGGEST_DEFAULT_LIMIT
+from src.core.pagination import decode_cursor, encode_cursor
+
 from .repository import SearchRepository as search_repository
-from .schemas import SearchResponse, SearchResultItem
+from .schemas import (
+    SearchFilters,
+    SearchMode,
+    SearchResponse,
+    SearchResultItem,
+    SearchResultType,
+    SuggestResponse,
+)
+
+search_cache = TTLCache(
+    max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+    ttl=settings.SEARCH_CACHE_TTL_SECONDS,
+)
 
 
 class SearchService:
     """Classe do Service que conversa com o repository e retorna o resultado pro router"""
 
     @staticmethod
-    def search(db: Session, query_term: str, user_id: uuid.UUID) -> SearchResponse:
-        """Orquestra a busca no repositório e formata o resultado"""
-        query_result = search_repository.search_query(db, query_term, user_id)
+    def decode_search_cursor(
+        cursor: str,
+    ) -> dict[SearchResultType, tuple[float, uuid.UUID]]:
+        """Converte o cursor recebido nas posições (score, id) de cada tipo de resultado"""
+        try:
+            return {
+                SearchResultType(result_type): (float(score), uuid.UUID(last_id))
+                for result_type, (score, last_id) in decode_cursor(cursor).items()
+            }
+        except (TypeError, ValueError) as err:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+            ) from err
+
+    @staticmethod
+    def normalize_query(query_term: str) -> str:
+        """Padroniza o termo buscado para que variações de espaço e caixa usem o mesmo cache"""
+        return " ".join(query_term.split()).lower()
+
+    @staticmethod
+    def build_response(query_result: list, limit: int) -> SearchResponse:
+        """
+        Mantém até limit itens de cada tipo e gera o cursor com a posição do último
+        item mantido dos tipos que ainda têm resultados
+        """
         items: list[SearchResultItem] = []
+        type_counts: Counter = Counter()
+        last_rows = {}
+        next_positions = {}
 
         for row in query_result:
+            if type_counts[row.type] == limit:
+                last_row = last_rows[row.type]
+                next_positions[row.type] = [last_row.score, str(last_row.id)]
+                continue
+
             items.append(SearchResultItem.model_validate(row))
+            type_counts[row.type] += 1
+            last_rows[row.type] = row
+
+        next_cursor = encode_cursor(next_positions) if next_positions else None
+        return SearchResponse(results=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def search(
+        db: Session,
+        query_term: str,
+        user_id: uuid.UUID,
+        limit: int = SEARCH_DEFAULT_LIMIT,
+        cursor: str | None = None,
+        filters: SearchFilters | None = None,
+        mode: SearchMode = SearchMode.EXACT,
+    ) -> SearchResponse:
+        """
+        Orquestra a busca paginada no repositório e formata o resultado.
+        O resultado fica em cache até expirar ou até o usuário alterar seus dados.
+        """
+        positions = SearchService.decode_search_cursor(cursor) if cursor else None
+        query_term = SearchService.normalize_query(query_term)
+
+        cache_key = (
+            user_id,
+            user_data_generations.get(user_id),
+            query_term,
+            limit,
+            cursor,
+            filters.model_dump_json() if filters is not None else None,
+            mode,
+        )
+        cached_response = search_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+        query_result = search_repository.search_query(
+            db, query_term, user_id, limit, positions, filters, mode
+        )
+        response = SearchService.build_response(query_result, limit)
+        search_cache.set(cache_key, response)
+
+        return response
+
+    @staticmethod
+    def stream_search(
+        db: Session,
+        query_term: str,
+        user_id: uuid.UUID,
+        filters: SearchFilters | None = None,
+        mode: SearchMode = SearchMode.EXACT,
+    ) -> Iterator[str]:
+        """
+        Gera os itens da busca um a um, cada um em uma linha JSON (NDJSON).
+        A sessão é fechada ao final do stream, já que o corpo da resposta é
+        enviado depois que a dependência get_db é encerrada.
+        """
+        query_term = SearchService.normalize_query(query_term)
+
+        try:
+            rows = search_repository.stream_search_query(
+                db, query_term, user_id, filters, mode
+            )
+            for row in rows:
+                yield SearchResultItem.model_validate(row).model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    @staticmethod
+    def suggest(
+        db: Session,
+        prefix: str,
+        user_id: uuid.UUID,
+        limit: int = SUGGEST_DEFAULT_LIMIT,
+    ) -> SuggestResponse:
+        """Retorna as sugestões de nomes que começam com o prefixo digitado"""
+        prefix = prefix.lstrip().lower()
+
+        cache_key = ("suggest", user_id, user_data_generations.get(user_id), prefix, limit)
+        cached_response = search_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+        query_result = search_repository.suggest_query(db, prefix, user_id, limit)
+        response = SuggestResponse(
+            suggestions=[SearchResultItem.model_validate(row) for row in query_result]
+        )
+        search_cache.set(cache_key, response)
 
-        return SearchResponse(results=items)
+        return response
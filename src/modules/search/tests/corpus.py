@@ -0,0 +1,135 @@
+"""Gerador de corpus sintético usado nos benchmarks da busca"""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy.orm import Session
+
+from src.modules.notebooks.repository import NotebookRepository as notebook_repository
+from src.modules.notebooks.schemas import NotebookCreate
+from src.modules.notes.repository import NoteRepository as note_repository
+from src.modules.notes.schemas import NoteCreate
+from src.modules.tags.repository import TagRepository as tag_repository
+from src.modules.tags.schemas import TagCreate
+
+# Vocabulário ordenado do mais para o menos frequente, sorteado com pesos 1/posição
+VOCABULARY = (
+    "projeto reunião tarefa ideia cliente prazo relatório equipe código teste "
+    "banco dados busca nota caderno template usuário sistema versão entrega "
+    "planejamento orçamento contrato revisão documento pesquisa análise métrica "
+    "desempenho consulta índice servidor memória arquivo sincronização backup "
+    "viagem receita livro filme música treino saúde compras família estudo "
+    "curso aula prova artigo leitura resumo rascunho lembrete agenda evento "
+    "fornecedor proposta apresentação feedback objetivo resultado estratégia "
+    "migração deploy incidente alerta monitoramento latência cache fila"
+).split()
+
+# Termo raro plantado em uma pequena fração das notas para as buscas seletivas
+RARE_TERM = "zigurate"
+RARE_TERM_RATIO = 0.01
+
+
+@dataclass
+class CorpusSpec:
+    """Dimensões do corpus sintético gerado para cada usuário"""
+
+    notes_per_user: int
+    users: int = 3
+    notes_per_notebook: int = 50
+    tags_per_user: int = 25
+    max_tags_per_note: int = 3
+    seed: int = 42
+
+    @property
+    def notebooks_per_user(self) -> int:
+        """Quantidade de cadernos necessária para acomodar as notas de um usuário"""
+        return max(1, -(-self.notes_per_user // self.notes_per_notebook))
+
+    def as_dict(self) -> dict:
+        """Retorna as dimensões do corpus para o relatório dos benchmarks"""
+        return {
+            "users": self.users,
+            "notebooks_per_user": self.notebooks_per_user,
+            "notes_per_user": self.notes_per_user,
+            "tags_per_user": self.tags_per_user,
+            "max_tags_per_note": self.max_tags_per_note,
+            "seed": self.seed,
+        }
+
+
+@dataclass
+class Corpus:
+    """Usuários gerados e os termos úteis para as buscas dos benchmarks"""
+
+    spec: CorpusSpec
+    user_ids: list[uuid.UUID] = field(default_factory=list)
+
+    @property
+    def queries(self) -> dict[str, str]:
+        """Termos buscados nos benchmarks, do mais ao menos seletivo"""
+        return {
+            "common": VOCABULARY[0],
+            "rare": RARE_TERM,
+            "multi_word": "relatório de desempenho",
+            "no_match": "inexistente",
+        }
+
+
+class CorpusGenerator:
+    """Popula o banco com cadernos, notas e tags através dos repositories"""
+
+    WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+    def __init__(self, spec: CorpusSpec):
+        self.spec = spec
+        self.random = random.Random(spec.seed)
+
+    def words(self, count: int) -> str:
+        """Sorteia palavras do vocabulário seguindo uma distribuição de Zipf"""
+        return " ".join(self.random.choices(VOCABULARY, self.WEIGHTS, k=count))
+
+    def note_content(self) -> str:
+        """Gera o conteúdo de uma nota, com tamanho de distribuição log-normal"""
+        word_count = min(int(self.random.lognormvariate(5.0, 0.8)) + 1, 5000)
+        paragraphs = []
+        while word_count > 0:
+            paragraph_size = min(word_count, self.random.randint(20, 80))
+            paragraphs.append(self.words(paragraph_size))
+            word_count -= paragraph_size
+
+        if self.random.random() < RARE_TERM_RATIO:
+            paragraphs.append(RARE_TERM)
+        return "\n\n".join(paragraphs)
+
+    def seed_user(self, db: Session, user_id: uuid.UUID):
+        """Cria os cadernos, as tags e as notas de um usuário"""
+        tags = [
+            tag_repository.create_tag(db, TagCreate(name=f"tag-{index}"), user_id)
+            for index in range(self.spec.tags_per_user)
+        ]
+
+        remaining = self.spec.notes_per_user
+        for index in range(self.spec.notebooks_per_user):
+            notebook = notebook_repository.create_notebook(
+                db, NotebookCreate(name=f"Caderno {index} {self.words(2)}"), user_id
+            )
+            for _ in range(min(remaining, self.spec.notes_per_notebook)):
+                note_data = NoteCreate(
+                    title=self.words(self.random.randint(3, 8)).capitalize(),
+                    content=self.note_content(),
+                )
+                note = note_repository.create_note(db, note_data, notebook.id, user_id)
+                tag_count = self.random.randint(0, self.spec.max_tags_per_note)
+                for tag in self.random.sample(tags, k=min(tag_count, len(tags))):
+                    note_repository.add_tag_to_note(db, note, tag)
+            remaining -= self.spec.notes_per_notebook
+
+    def generate(self, db: Session) -> Corpus:
+        """Gera o corpus completo e retorna os usuários criados"""
+        corpus = Corpus(spec=self.spec)
+        for _ in range(self.spec.users):
+            user_id = uuid.uuid4()
+            self.seed_user(db, user_id)
+            corpus.user_ids.append(user_id)
+        return corpus
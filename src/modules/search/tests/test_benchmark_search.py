@@ -0,0 +1,99 @@
+"""Benchmarks da busca, executados apenas com a opção --benchmark"""
+
+import statistics
+import time
+import uuid
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.modules.search.repository import SearchRepository as search_repository
+from src.modules.search.schemas import SearchMode
+from src.modules.search.service import search_cache
+
+from .corpus import CorpusGenerator, CorpusSpec
+
+ITERATIONS = 20
+
+
+def measure(operation: Callable[[], int]) -> dict:
+    """Executa a operação várias vezes e resume os tempos em milissegundos"""
+    operation()
+    timings = []
+    rows = 0
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        rows = operation()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "iterations": ITERATIONS,
+        "rows": rows,
+        "min_ms": round(timings[0], 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+
+@pytest.mark.benchmark
+def test_benchmark_search(
+    db_session: Session,
+    client: TestClient,
+    corpus_size: int,
+    benchmark_report: dict,
+    auth_headers_for: Callable[[uuid.UUID], dict[str, str]],
+):
+    """Mede a busca no repository e na rota para um corpus do tamanho pedido"""
+    corpus = CorpusGenerator(CorpusSpec(notes_per_user=corpus_size)).generate(
+        db_session
+    )
+    db_session.execute(text("ANALYZE"))
+    benchmark_report.setdefault(
+        "postgres", db_session.execute(text("SHOW server_version")).scalar()
+    )
+
+    user_id = corpus.user_ids[0]
+
+    def repository_search(query_term: str, mode: SearchMode) -> int:
+        return len(
+            search_repository.search_query(db_session, query_term, user_id, mode=mode)
+        )
+
+    def route_search(query_term: str, cached: bool) -> int:
+        if not cached:
+            search_cache.clear()
+        response = client.get(
+            "/search/", params={"q": query_term}, headers=auth_headers_for(user_id)
+        )
+        assert response.status_code == 200
+        return len(response.json()["results"])
+
+    targets = {
+        "repository": lambda query_term: repository_search(
+            query_term, SearchMode.EXACT
+        ),
+        "repository_fuzzy": lambda query_term: repository_search(
+            query_term, SearchMode.FUZZY
+        ),
+        "route": lambda query_term: route_search(query_term, cached=False),
+        "route_cached": lambda query_term: route_search(query_term, cached=True),
+    }
+    for target, search in targets.items():
+        for query_name, query_term in corpus.queries.items():
+            result = measure(
+                lambda search=search, query_term=query_term: search(query_term)
+            )
+            benchmark_report["results"].append(
+                {
+                    "corpus": corpus.spec.as_dict(),
+                    "target": target,
+                    "query": query_name,
+                    "query_term": query_term,
+                    **result,
+                }
+            )
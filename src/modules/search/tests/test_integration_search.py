@@ -1,5 +1,7 @@
 """Arquivo com os testes de integração dos endpoints de Search"""
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -71,3 +73,306 @@ class TestSearchRoutes:
         """
         response = client.get("/search/?q=", headers=auth_headers)
         assert response.status_code == 422
+
+    def test_search_ranks_title_matches_above_content_matches(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se uma nota com o termo no título aparece antes de uma nota
+        que só possui o termo no conteúdo.
+        """
+        notebook_id = created_notebook["id"]
+        content_note = client.post(
+            f"/notebooks/{notebook_id}/notes/",
+            json={"title": "Anotações gerais", "content": "Estudos de astronomia"},
+            headers=auth_headers,
+        ).json()
+        title_note = client.post(
+            f"/notebooks/{notebook_id}/notes/",
+            json={"title": "Astronomia", "content": "Planetas e estrelas"},
+            headers=auth_headers,
+        ).json()
+
+        response = client.get("/search/?q=astronomia", headers=auth_headers)
+        note_ids = [
+            item["id"] for item in response.json()["results"] if item["type"] == "note"
+        ]
+
+        assert response.status_code == 200
+        assert note_ids == [title_note["id"], content_note["id"]]
+
+    def test_search_matches_substring_of_note_title(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se um trecho no meio do título de uma nota é encontrado,
+        mesmo não sendo uma palavra completa.
+        """
+        note = client.post(
+            f"/notebooks/{created_notebook['id']}/notes/",
+            json={"title": "Planejamento financeiro"},
+            headers=auth_headers,
+        ).json()
+
+        response = client.get("/search/?q=jamento", headers=auth_headers)
+        note_ids = [
+            item["id"] for item in response.json()["results"] if item["type"] == "note"
+        ]
+
+        assert response.status_code == 200
+        assert note_ids == [note["id"]]
+
+    def test_search_returns_bounded_highlighted_snippet(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se o snippet de uma nota longa é um trecho destacado ao redor
+        do termo encontrado, e não o conteúdo inteiro da nota.
+        """
+        filler = "palavra " * 2000
+        content = f"{filler}meteorito {filler}"
+        client.post(
+            f"/notebooks/{created_notebook['id']}/notes/",
+            json={"title": "Nota longa", "content": content},
+            headers=auth_headers,
+        )
+
+        response = client.get("/search/?q=meteorito", headers=auth_headers)
+        snippets = [
+            item["snippet"]
+            for item in response.json()["results"]
+            if item["type"] == "note"
+        ]
+
+        assert response.status_code == 200
+        assert len(snippets) == 1
+        assert "<mark>meteorito</mark>" in snippets[0]
+        assert len(snippets[0]) < 1000
+
+    def test_search_snippet_escapes_html_from_note_content(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se o HTML salvo no conteúdo da nota volta escapado no snippet, e só
+        o destaque do termo fica como tag
+        """
+        client.post(
+            f"/notebooks/{created_notebook['id']}/notes/",
+            json={
+                "title": "Nota com HTML",
+                "content": '<img src=x onerror="alert(1)"> cometa & <b>estrela</b>',
+            },
+            headers=auth_headers,
+        )
+
+        response = client.get("/search/?q=cometa", headers=auth_headers)
+        snippets = [
+            item["snippet"]
+            for item in response.json()["results"]
+            if item["type"] == "note"
+        ]
+
+        assert response.status_code == 200
+        assert len(snippets) == 1
+        assert "<img" not in snippets[0]
+        assert "<b>" not in snippets[0]
+        assert "<mark>cometa</mark> &amp; &lt;b&gt;estrela" in snippets[0]
+
+    def test_search_paginates_results_with_cursor(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se a busca respeita o limite por tipo e se o cursor retornado
+        traz os próximos resultados sem repetir itens.
+        """
+        for index in range(3):
+            client.post(
+                f"/notebooks/{created_notebook['id']}/notes/",
+                json={"title": f"Paginacao {index}"},
+                headers=auth_headers,
+            )
+
+        seen_ids = []
+        cursor = None
+        for _ in range(3):
+            params = {"q": "Paginacao", "limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/search/", params=params, headers=auth_headers)
+            data = response.json()
+
+            assert response.status_code == 200
+            assert len(data["results"]) == 1
+            seen_ids.append(data["results"][0]["id"])
+            cursor = data["next_cursor"]
+
+        assert len(set(seen_ids)) == 3
+        assert cursor is None
+
+    def test_search_with_invalid_cursor_returns_400(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """
+        Testa se um cursor inválido é rejeitado com erro 400.
+        """
+        response = client.get(
+            "/search/", params={"q": "BUSCA", "cursor": "xyz"}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_search_reflects_writes_made_after_a_cached_search(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """
+        Testa se uma busca repetida enxerga um item criado depois da primeira
+        busca, ou seja, se a escrita invalida o cache.
+        """
+        first_response = client.get("/search/?q=CacheInvalida", headers=auth_headers)
+        assert first_response.json()["results"] == []
+
+        client.post("/tags/", json={"name": "CacheInvalida"}, headers=auth_headers)
+
+        second_response = client.get("/search/?q=CacheInvalida", headers=auth_headers)
+        results = second_response.json()["results"]
+
+        assert len(results) == 1
+        assert results[0]["type"] == "tag"
+
+    def test_suggest_returns_names_starting_with_prefix(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se o autocompletar retorna apenas os nomes que começam com o
+        prefixo, sem diferenciar maiúsculas e minúsculas.
+        """
+        client.post(
+            f"/notebooks/{created_notebook['id']}/notes/",
+            json={"title": "Receita de bolo"},
+            headers=auth_headers,
+        )
+        client.post("/tags/", json={"name": "receitas"}, headers=auth_headers)
+        client.post(
+            "/notebooks/", json={"name": "Minhas receitas"}, headers=auth_headers
+        )
+
+        response = client.get("/search/suggest?prefix=RECEI", headers=auth_headers)
+        suggestions = response.json()["suggestions"]
+
+        assert response.status_code == 200
+        assert {(item["type"], item["name"]) for item in suggestions} == {
+            ("note", "Receita de bolo"),
+            ("tag", "receitas"),
+        }
+
+    def test_suggest_treats_like_wildcards_literally(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """
+        Testa se caracteres curinga do LIKE no prefixo não casam com qualquer nome.
+        """
+        client.post("/tags/", json={"name": "abc"}, headers=auth_headers)
+
+        response = client.get("/search/suggest?prefix=%25", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["suggestions"] == []
+
+    def test_search_streams_ndjson_when_requested(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """
+        Testa se a busca envia um item por linha quando o cliente pede NDJSON.
+        """
+        response = client.get(
+            "/search/?q=BUSCA_UNICA",
+            headers={**auth_headers, "Accept": "application/x-ndjson"},
+        )
+        items = [json.loads(line) for line in response.text.splitlines()]
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert {item["type"] for item in items} == {
+            "note",
+            "notebook",
+            "tag",
+            "template",
+        }
+
+    def test_search_filters_notes_by_notebook_tags_and_favorites(
+        self, client: TestClient, created_notebook: dict, auth_headers: dict
+    ):
+        """
+        Testa se os filtros de caderno, tags (any/all) e favoritas restringem
+        a busca às notas que atendem a eles.
+        """
+        notebook_id = created_notebook["id"]
+        other_notebook_id = client.post(
+            "/notebooks/", json={"name": "Outro caderno"}, headers=auth_headers
+        ).json()["id"]
+        tag_a = client.post("/tags/", json={"name": "filtro-a"}, headers=auth_headers)
+        tag_b = client.post("/tags/", json={"name": "filtro-b"}, headers=auth_headers)
+        tag_a_id, tag_b_id = tag_a.json()["id"], tag_b.json()["id"]
+
+        def create_note(target_notebook_id: str, title: str, tag_ids: list) -> str:
+            note_id = client.post(
+                f"/notebooks/{target_notebook_id}/notes/",
+                json={"title": title},
+                headers=auth_headers,
+            ).json()["id"]
+            for tag_id in tag_ids:
+                client.post(
+                    f"/notebooks/{target_notebook_id}/notes/{note_id}/tags/{tag_id}",
+                    headers=auth_headers,
+                )
+            return note_id
+
+        both_tags = create_note(notebook_id, "Filtravel ambos", [tag_a_id, tag_b_id])
+        only_a = create_note(notebook_id, "Filtravel apenas A", [tag_a_id])
+        other_notebook = create_note(other_notebook_id, "Filtravel outro", [])
+        client.patch(
+            f"/notebooks/{notebook_id}/notes/{only_a}",
+            json={"is_favorite": True},
+            headers=auth_headers,
+        )
+
+        def search_ids(params: dict) -> set:
+            response = client.get(
+                "/search/", params={"q": "Filtravel", **params}, headers=auth_headers
+            )
+            assert response.status_code == 200
+            results = response.json()["results"]
+            assert {item["type"] for item in results} <= {"note"}
+            return {item["id"] for item in results}
+
+        assert search_ids({"notebook_id": other_notebook_id}) == {other_notebook}
+        assert search_ids({"tag_ids": [tag_a_id, tag_b_id]}) == {both_tags, only_a}
+        assert search_ids({"tag_ids": [tag_a_id, tag_b_id], "tag_match": "all"}) == {
+            both_tags
+        }
+        assert search_ids({"favorites_only": True}) == {only_a}
+
+    def test_fuzzy_search_tolerates_typos_and_ranks_by_similarity(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """
+        Testa se o modo fuzzy encontra nomes digitados com erro, que a busca exata
+        não encontra, e se os resultados vêm ordenados pela similaridade.
+        """
+        client.post("/tags/", json={"name": "programacao"}, headers=auth_headers)
+        client.post("/tags/", json={"name": "programa"}, headers=auth_headers)
+        client.post("/tags/", json={"name": "culinaria"}, headers=auth_headers)
+
+        exact = client.get("/search/", params={"q": "progamacao"}, headers=auth_headers)
+        assert exact.json()["results"] == []
+
+        response = client.get(
+            "/search/", params={"q": "progamacao", "mode": "fuzzy"}, headers=auth_headers
+        )
+        results = response.json()["results"]
+
+        assert response.status_code == 200
+        assert [item["name"] for item in results][:1] == ["programacao"]
+        assert "culinaria" not in {item["name"] for item in results}
+        scores = [item["score"] for item in results]
+        assert scores == sorted(scores, reverse=True)
+        assert all(score > 0 for score in scores)
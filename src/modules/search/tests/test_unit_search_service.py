@@ -4,8 +4,11 @@ import uuid
 from unittest.mock import MagicMock, patch
 
 import pytest
+from fastapi import HTTPException
 
-from src.modules.search.schemas import SearchResultType
+from src.core.cache import user_data_generations
+from src.core.constants import SEARCH_DEFAULT_LIMIT
+from src.modules.search.schemas import SearchMode, SearchResultType
 from src.modules.search.service import SearchService
 
 TEST_USER_ID = uuid.uuid4()
@@ -36,6 +39,7 @@ class TestUnitSearchService:
         mock_row.name = "Resultado do Teste"
         mock_row.type = SearchResultType.NOTE
         mock_row.snippet = "Conteúdo do resultado"
+        mock_row.score = 0.5
 
         mock_search_repo.search_query.return_value = [mock_row]
 
@@ -44,7 +48,13 @@ class TestUnitSearchService:
 
         # --- Verificação ---
         mock_search_repo.search_query.assert_called_once_with(
-            mock_db_session, search_term, TEST_USER_ID
+            mock_db_session,
+            search_term,
+            TEST_USER_ID,
+            SEARCH_DEFAULT_LIMIT,
+            None,
+            None,
+            SearchMode.EXACT,
         )
 
         assert len(result.results) == 1
@@ -63,6 +73,157 @@ class TestUnitSearchService:
         result = SearchService.search(mock_db_session, search_term, TEST_USER_ID)
 
         mock_search_repo.search_query.assert_called_once_with(
-            mock_db_session, search_term, TEST_USER_ID
+            mock_db_session,
+            search_term,
+            TEST_USER_ID,
+            SEARCH_DEFAULT_LIMIT,
+            None,
+            None,
+            SearchMode.EXACT,
         )
         assert result.results == []
+
+    def test_search_limits_results_per_type_and_returns_cursor(
+        self, mock_search_repo: MagicMock
+    ):
+        """
+        Testa se o service mantém apenas limit itens de cada tipo e se o cursor
+        gerado leva à posição do último item mantido
+        """
+        mock_db_session = MagicMock()
+        rows = []
+        for score in (0.9, 0.8, 0.7):
+            row = MagicMock()
+            row.id = uuid.uuid4()
+            row.name = f"Nota {score}"
+            row.type = SearchResultType.NOTE
+            row.snippet = None
+            row.score = score
+            rows.append(row)
+
+        mock_search_repo.search_query.return_value = rows
+
+        result = SearchService.search(mock_db_session, "nota", TEST_USER_ID, limit=2)
+
+        assert [item.id for item in result.results] == [rows[0].id, rows[1].id]
+        assert result.next_cursor is not None
+        assert SearchService.decode_search_cursor(result.next_cursor) == {
+            SearchResultType.NOTE: (0.8, rows[1].id)
+        }
+
+        SearchService.search(
+            mock_db_session, "nota", TEST_USER_ID, 2, result.next_cursor
+        )
+        mock_search_repo.search_query.assert_called_with(
+            mock_db_session,
+            "nota",
+            TEST_USER_ID,
+            2,
+            {SearchResultType.NOTE: (0.8, rows[1].id)},
+            None,
+            SearchMode.EXACT,
+        )
+
+    def test_search_with_invalid_cursor_raises_400(
+        self, mock_search_repo: MagicMock
+    ):
+        """Testa se um cursor malformado levanta um erro 400"""
+        with pytest.raises(HTTPException) as exc_info:
+            SearchService.search(MagicMock(), "nota", TEST_USER_ID, cursor="invalido")
+
+        assert exc_info.value.status_code == 400
+        mock_search_repo.search_query.assert_not_called()
+
+    def test_repeated_search_is_served_from_cache(self, mock_search_repo: MagicMock):
+        """
+        Testa se a mesma busca, com variações de espaço e caixa, não volta ao
+        repository enquanto os dados do usuário não mudam
+        """
+        mock_db_session = MagicMock()
+        mock_search_repo.search_query.return_value = []
+
+        first = SearchService.search(mock_db_session, "Termo  Buscado", TEST_USER_ID)
+        second = SearchService.search(mock_db_session, " termo buscado", TEST_USER_ID)
+
+        mock_search_repo.search_query.assert_called_once_with(
+            mock_db_session,
+            "termo buscado",
+            TEST_USER_ID,
+            SEARCH_DEFAULT_LIMIT,
+            None,
+            None,
+            SearchMode.EXACT,
+        )
+        assert second is first
+
+    def test_write_to_user_data_invalidates_cached_search(
+        self, mock_search_repo: MagicMock
+    ):
+        """Testa se incrementar a geração do usuário faz a busca ir ao repository de novo"""
+        mock_db_session = MagicMock()
+        mock_search_repo.search_query.return_value = []
+
+        SearchService.search(mock_db_session, "termo", TEST_USER_ID)
+        user_data_generations.bump(TEST_USER_ID)
+        SearchService.search(mock_db_session, "termo", TEST_USER_ID)
+
+        assert mock_search_repo.search_query.call_count == 2
+
+    def test_suggest_normalizes_prefix_and_formats_response(
+        self, mock_search_repo: MagicMock
+    ):
+        """Testa se o prefixo é padronizado antes de ir ao repository"""
+        mock_db_session = MagicMock()
+        mock_row = MagicMock()
+        mock_row.id = uuid.uuid4()
+        mock_row.name = "Receitas"
+        mock_row.type = SearchResultType.NOTEBOOK
+        mock_row.snippet = None
+
+        mock_search_repo.suggest_query.return_value = [mock_row]
+
+        result = SearchService.suggest(mock_db_session, "  Rec", TEST_USER_ID, 3)
+
+        mock_search_repo.suggest_query.assert_called_once_with(
+            mock_db_session, "rec", TEST_USER_ID, 3
+        )
+        assert [item.id for item in result.suggestions] == [mock_row.id]
+
+    def test_stream_search_yields_one_json_line_per_row_and_closes_session(
+        self, mock_search_repo: MagicMock
+    ):
+        """Testa se o stream gera uma linha JSON por item e fecha a sessão no final"""
+        mock_db_session = MagicMock()
+        mock_row = MagicMock()
+        mock_row.id = uuid.uuid4()
+        mock_row.name = "Resultado"
+        mock_row.type = SearchResultType.TAG
+        mock_row.snippet = None
+
+        mock_search_repo.stream_search_query.return_value = iter([mock_row])
+
+        lines = list(SearchService.stream_search(mock_db_session, "Busca", TEST_USER_ID))
+
+        mock_search_repo.stream_search_query.assert_called_once_with(
+            mock_db_session, "busca", TEST_USER_ID, None, SearchMode.EXACT
+        )
+        assert len(lines) == 1
+        assert lines[0].endswith("\n")
+        assert str(mock_row.id) in lines[0]
+        mock_db_session.close.assert_called_once()
+
+    def test_expired_generation_does_not_reuse_cached_search(
+        self, mock_search_repo: MagicMock
+    ):
+        """
+        Testa se uma geração descartada é trocada por uma nova, em vez de voltar a
+        um valor que uma busca antiga ainda tenha na chave do cache
+        """
+        mock_db_session = MagicMock()
+        mock_search_repo.search_query.return_value = []
+
+        SearchService.search(mock_db_session, "termo", TEST_USER_ID)
+        user_data_generations.clear()
+        SearchService.search(mock_db_session, "termo", TEST_USER_ID)
+
+        assert mock_search_repo.search_query.call_count == 2
@@ -0,0 +1,96 @@
+"""Repository do Módulo Sync"""
+
+import uuid
+
+from sqlalchemy import Row, false, literal, select, text, true, tuple_, union_all
+from sqlalchemy.orm import Session, selectinload
+
+from src.core.models import Note, Notebook, Tag, Template, Tombstone
+
+from .schemas import SyncEntityType
+
+SYNCED_MODELS = {
+    SyncEntityType.NOTEBOOK: Notebook,
+    SyncEntityType.NOTE: Note,
+    SyncEntityType.TAG: Tag,
+    SyncEntityType.TEMPLATE: Template,
+}
+
+
+class SyncRepository:
+    """Classe do Repository do Sync com os métodos que conversam com o banco"""
+
+    @staticmethod
+    def get_sync_horizon(db: Session) -> int:
+        """
+        Retorna o horizonte do /sync: o xmin do snapshot atual, o id da transação
+        mais antiga ainda em andamento. Toda transação com id menor já terminou,
+        então as alterações abaixo dele estão completas, e as confirmadas depois
+        sempre ficam acima. Uma transação longa atrasa o horizonte enquanto estiver
+        aberta, mas nenhuma alteração é pulada. Se a própria transação já tiver
+        escrito, as alterações dela também ficam acima do horizonte
+        """
+        return db.execute(
+            text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        ).scalar_one()
+
+    @staticmethod
+    def get_changes(
+        db: Session,
+        user_id: uuid.UUID,
+        horizon: int,
+        limit: int,
+        position: tuple[int, uuid.UUID] | None = None,
+    ) -> list[Row]:
+        """
+        Junta as alterações de cada tabela e as lápides em ordem de (sync_xid,
+        entity_id), a partir da posição do cursor e abaixo do horizonte. Cada parte
+        lê no máximo limit + 1 linhas pelo índice (user_id, sync_xid, id)
+        """
+        sources = [
+            (literal(entity_type.value), model.id, model.updated_at, false(), model)
+            for entity_type, model in SYNCED_MODELS.items()
+        ]
+        sources.append(
+            (
+                Tombstone.entity_type,
+                Tombstone.entity_id,
+                Tombstone.deleted_at,
+                true(),
+                Tombstone,
+            )
+        )
+
+        parts = []
+        for entity_type, entity_id, changed_at, deleted, model in sources:
+            part = select(
+                entity_type.label("entity_type"),
+                entity_id.label("entity_id"),
+                changed_at.label("changed_at"),
+                model.sync_xid.label("sync_xid"),
+                deleted.label("deleted"),
+            ).where(model.user_id == user_id, model.sync_xid < horizon)
+            if position is not None:
+                part = part.where(tuple_(model.sync_xid, entity_id) > tuple_(*position))
+            parts.append(part.order_by(model.sync_xid, entity_id).limit(limit + 1))
+
+        changes = union_all(*parts).subquery()
+        return db.execute(
+            select(changes)
+            .order_by(changes.c.sync_xid, changes.c.entity_id)
+            .limit(limit + 1)
+        ).all()
+
+    @staticmethod
+    def get_entities(
+        db: Session, entity_type: SyncEntityType, entity_ids: list[uuid.UUID]
+    ) -> list[Notebook | Note | Tag | Template]:
+        """Carrega as entidades alteradas de um tipo com uma única consulta"""
+        if not entity_ids:
+            return []
+
+        model = SYNCED_MODELS[entity_type]
+        query = db.query(model).filter(model.id.in_(entity_ids))
+        if model is Note:
+            query = query.options(selectinload(Note.tags))
+        return query.order_by(model.updated_at, model.id).all()
@@ -0,0 +1,41 @@
+"""Router do módulo Sync"""
+
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from src.core.constants import SYNC_DEFAULT_LIMIT, SYNC_MAX_LIMIT
+from src.core.database import get_db
+from src.core.security import get_current_user_id
+
+from .schemas import SyncResponse
+from .service import SyncService as sync_service
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get(
+    "/",
+    response_model=SyncResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Lista as alterações feitas desde a última sincronização",
+)
+def get_changes_since(
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    since: Annotated[
+        str | None,
+        Query(description="Cursor retornado pela sincronização anterior"),
+    ] = None,
+    limit: Annotated[
+        int,
+        Query(description="Quantidade máxima de alterações", ge=1, le=SYNC_MAX_LIMIT),
+    ] = SYNC_DEFAULT_LIMIT,
+) -> SyncResponse:
+    """
+    Retorna as entidades criadas ou alteradas e as lápides das apagadas desde o
+    cursor. Sem cursor, retorna todos os dados do usuário
+    """
+    return sync_service.get_changes_since(db, user_id, since, limit)
@@ -0,0 +1,47 @@
+"""Schemas para o módulo sync"""
+
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict
+
+from src.modules.notebooks.schemas import NotebookResponse
+from src.modules.notes.schemas import NoteResponse
+from src.modules.tags.schemas import TagResponse
+from src.modules.templates.schemas import TemplateResponse
+
+
+class SyncEntityType(str, Enum):
+    """Enum com os tipos de entidades sincronizadas"""
+
+    NOTEBOOK = "notebook"
+    NOTE = "note"
+    TAG = "tag"
+    TEMPLATE = "template"
+
+
+class SyncTombstone(BaseModel):
+    """Schema de retorno com uma entidade apagada"""
+
+    entity_type: SyncEntityType
+    id: uuid.UUID
+    deleted_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SyncResponse(BaseModel):
+    """
+    Schema de retorno com as entidades criadas ou alteradas e as apagadas desde o
+    cursor. Enquanto has_more for verdadeiro, o cliente pede a próxima página com
+    next_cursor; depois guarda o último next_cursor para a próxima sincronização
+    """
+
+    notebooks: list[NotebookResponse] = []
+    notes: list[NoteResponse] = []
+    tags: list[TagResponse] = []
+    templates: list[TemplateResponse] = []
+    deleted: list[SyncTombstone] = []
+    next_cursor: str | None = None
+    has_more: bool = False
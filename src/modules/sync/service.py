@@ -0,0 +1,82 @@
+"""Service do Módulo Sync"""
+
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from src.core.constants import SYNC_DEFAULT_LIMIT
+from src.core.pagination import decode_cursor, encode_cursor
+
+from .repository import SyncRepository as sync_repository
+from .schemas import SyncEntityType, SyncResponse, SyncTombstone
+
+
+class SyncService:
+    """Classe do Service que conversa com o repository e retorna o resultado pro router"""
+
+    @staticmethod
+    def decode_sync_cursor(since: str) -> tuple[int, uuid.UUID]:
+        """Decodifica o cursor do /sync na posição (sync_xid, id) da última mudança"""
+        position = decode_cursor(since)
+        try:
+            return int(position["xid"]), uuid.UUID(position["id"])
+        except (KeyError, TypeError, ValueError) as err:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+            ) from err
+
+    @staticmethod
+    def get_changes_since(
+        db: Session,
+        user_id: uuid.UUID,
+        since: str | None = None,
+        limit: int = SYNC_DEFAULT_LIMIT,
+    ) -> SyncResponse:
+        """
+        Retorna até limit alterações feitas depois do cursor, com os dados atuais
+        das entidades alteradas e as lápides das apagadas. Sem cursor, retorna
+        todas as entidades do usuário, em páginas
+        """
+        position = SyncService.decode_sync_cursor(since) if since else None
+        horizon = sync_repository.get_sync_horizon(db)
+        changes = sync_repository.get_changes(db, user_id, horizon, limit, position)
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if not changes:
+            return SyncResponse(next_cursor=since)
+
+        changed_ids: dict[SyncEntityType, list[uuid.UUID]] = {
+            entity_type: [] for entity_type in SyncEntityType
+        }
+        deleted = []
+        for change in changes:
+            if change.deleted:
+                deleted.append(
+                    SyncTombstone(
+                        entity_type=change.entity_type,
+                        id=change.entity_id,
+                        deleted_at=change.changed_at,
+                    )
+                )
+            else:
+                changed_ids[SyncEntityType(change.entity_type)].append(change.entity_id)
+
+        entities = {
+            entity_type: sync_repository.get_entities(db, entity_type, entity_ids)
+            for entity_type, entity_ids in changed_ids.items()
+        }
+        last_change = changes[-1]
+        next_cursor = encode_cursor(
+            {"xid": last_change.sync_xid, "id": str(last_change.entity_id)}
+        )
+        return SyncResponse(
+            notebooks=entities[SyncEntityType.NOTEBOOK],
+            notes=entities[SyncEntityType.NOTE],
+            tags=entities[SyncEntityType.TAG],
+            templates=entities[SyncEntityType.TEMPLATE],
+            deleted=deleted,
+            next_cursor=next_cursor,
+            has_more=has_more,
+        )
@@ -0,0 +1,160 @@
+"""Arquivo com os testes de integração do endpoint de Sync"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.core.models import Tag
+
+
+@pytest.fixture
+def db_session(committed_db_session: Session) -> Session:
+    """
+    Usa uma sessão que confirma os commits: o /sync só entrega as alterações de
+    transações já terminadas, e não as da transação que envolve cada teste
+    """
+    return committed_db_session
+
+
+def sync_all(client: TestClient, auth_headers: dict, since: str | None = None) -> dict:
+    """Percorre todas as páginas do /sync e junta os resultados"""
+    merged = {"notebooks": [], "notes": [], "tags": [], "templates": [], "deleted": []}
+    while True:
+        params = {"since": since} if since else {}
+        response = client.get("/sync/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+
+        page = response.json()
+        for key, items in merged.items():
+            items.extend(page[key])
+        since = page["next_cursor"]
+        if not page["has_more"]:
+            return {**merged, "next_cursor": since}
+
+
+class TestSyncRoutes:
+    """Agrupa todos os testes para a rota do módulo Sync."""
+
+    def test_sync_returns_only_changes_since_cursor(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        created_note: dict,
+        created_template: dict,
+        auth_headers: dict,
+    ):
+        """
+        Testa se a primeira sincronização traz todos os dados e se as seguintes
+        trazem apenas o que foi criado ou alterado depois do cursor
+        """
+        tag = client.post("/tags/", json={"name": "Tag sync"}, headers=auth_headers).json()
+
+        initial = sync_all(client, auth_headers)
+
+        assert [notebook["id"] for notebook in initial["notebooks"]] == [
+            created_notebook["id"]
+        ]
+        assert [note["id"] for note in initial["notes"]] == [created_note["id"]]
+        assert [item["id"] for item in initial["tags"]] == [tag["id"]]
+        assert [item["id"] for item in initial["templates"]] == [created_template["id"]]
+        assert initial["deleted"] == []
+
+        unchanged = sync_all(client, auth_headers, initial["next_cursor"])
+        assert not any(unchanged[key] for key in ("notebooks", "notes", "tags"))
+        assert unchanged["next_cursor"] == initial["next_cursor"]
+
+        client.patch(
+            f"/notebooks/{created_notebook['id']}/notes/{created_note['id']}",
+            json={"content": "Editada depois da sincronização"},
+            headers=auth_headers,
+        )
+        changed = sync_all(client, auth_headers, initial["next_cursor"])
+
+        assert [note["content"] for note in changed["notes"]] == [
+            "Editada depois da sincronização"
+        ]
+        assert changed["notebooks"] == changed["tags"] == changed["templates"] == []
+
+    def test_sync_records_cascade_deletes_as_tombstones(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        created_note: dict,
+        auth_headers: dict,
+    ):
+        """
+        Testa se apagar um caderno gera as lápides dele e das notas apagadas em
+        cascada pelo banco
+        """
+        cursor = sync_all(client, auth_headers)["next_cursor"]
+
+        client.delete(f"/notebooks/{created_notebook['id']}", headers=auth_headers)
+        changes = sync_all(client, auth_headers, cursor)
+
+        deleted = {(item["entity_type"], item["id"]) for item in changes["deleted"]}
+        assert deleted == {
+            ("notebook", created_notebook["id"]),
+            ("note", created_note["id"]),
+        }
+        assert changes["notebooks"] == changes["notes"] == []
+
+    def test_sync_pages_do_not_repeat_or_skip_changes(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """Testa se as alterações são divididas em páginas de no máximo limit itens"""
+        tag_ids = [
+            client.post(
+                "/tags/", json={"name": f"Tag {index}"}, headers=auth_headers
+            ).json()["id"]
+            for index in range(5)
+        ]
+
+        synced_ids = []
+        since = None
+        while True:
+            params = {"limit": 2, **({"since": since} if since else {})}
+            page = client.get("/sync/", params=params, headers=auth_headers).json()
+            assert len(page["tags"]) <= 2
+            synced_ids.extend(tag["id"] for tag in page["tags"])
+            since = page["next_cursor"]
+            if not page["has_more"]:
+                break
+
+        assert synced_ids == tag_ids
+
+    def test_sync_with_invalid_cursor_returns_400(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """Testa se um cursor que não foi gerado pelo sync é rejeitado"""
+        response = client.get("/sync/", params={"since": "invalido"}, headers=auth_headers)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Cursor inválido"
+
+    def test_sync_waits_for_open_write_transactions(
+        self, client: TestClient, auth_headers: dict, other_db_session: Session
+    ):
+        """
+        Testa se uma transação de escrita aberta em outra conexão segura as
+        alterações dela e as confirmadas depois, sem pular nenhuma, até terminar
+        """
+        tag = client.post("/tags/", json={"name": "Tag aberta"}, headers=auth_headers)
+        cursor = sync_all(client, auth_headers)["next_cursor"]
+
+        other_db_session.get(Tag, uuid.UUID(tag.json()["id"])).name = "Tag renomeada"
+        other_db_session.flush()
+        client.post("/tags/", json={"name": "Tag depois"}, headers=auth_headers)
+
+        pending = sync_all(client, auth_headers, cursor)
+        assert pending["tags"] == []
+        assert pending["next_cursor"] == cursor
+
+        other_db_session.commit()
+        changed = sync_all(client, auth_headers, cursor)
+
+        assert [item["name"] for item in changed["tags"]] == [
+            "Tag renomeada",
+            "Tag depois",
+        ]
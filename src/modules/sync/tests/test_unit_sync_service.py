@@ -0,0 +1,101 @@
+"""Arquivo com os testes unitários do service de Sync"""
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.constants import SYNC_DEFAULT_LIMIT
+from src.core.models import Tag
+from src.core.pagination import decode_cursor, encode_cursor
+from src.modules.sync.schemas import SyncEntityType
+from src.modules.sync.service import SyncService
+
+TEST_USER_ID = uuid.uuid4()
+HORIZON = 1000
+
+
+@pytest.fixture
+def mock_sync_repo():
+    """Retorna um mock do repository de sync"""
+    with patch(
+        "src.modules.sync.service.sync_repository", new_callable=MagicMock
+    ) as mock:
+        mock.get_sync_horizon.return_value = HORIZON
+        yield mock
+
+
+def make_change(entity_type: SyncEntityType, deleted: bool, sync_xid: int):
+    """Cria uma linha de alteração como a retornada pelo repository"""
+    return SimpleNamespace(
+        entity_type=entity_type.value,
+        entity_id=uuid.uuid4(),
+        changed_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        sync_xid=sync_xid,
+        deleted=deleted,
+    )
+
+
+class TestUnitSyncService:
+    """Agrupa todos os testes unitários para o SyncService."""
+
+    def test_get_changes_groups_entities_and_tombstones(
+        self, mock_sync_repo: MagicMock
+    ):
+        """
+        Testa se as alterações são separadas por tipo, se a linha a mais vira
+        has_more e se o cursor aponta para a última alteração retornada
+        """
+        mock_db_session = MagicMock()
+        tag_change = make_change(SyncEntityType.TAG, deleted=False, sync_xid=997)
+        note_tombstone = make_change(SyncEntityType.NOTE, deleted=True, sync_xid=998)
+        extra_change = make_change(SyncEntityType.TAG, deleted=False, sync_xid=999)
+        mock_sync_repo.get_changes.return_value = [
+            tag_change,
+            note_tombstone,
+            extra_change,
+        ]
+        mock_sync_repo.get_entities.side_effect = (
+            lambda db, entity_type, entity_ids: [
+                Tag(id=entity_id, name="Tag") for entity_id in entity_ids
+            ]
+            if entity_type == SyncEntityType.TAG
+            else []
+        )
+
+        result = SyncService.get_changes_since(mock_db_session, TEST_USER_ID, limit=2)
+
+        mock_sync_repo.get_changes.assert_called_once_with(
+            mock_db_session, TEST_USER_ID, HORIZON, 2, None
+        )
+        assert [tag.id for tag in result.tags] == [tag_change.entity_id]
+        assert [item.id for item in result.deleted] == [note_tombstone.entity_id]
+        assert result.has_more is True
+        assert decode_cursor(result.next_cursor) == {
+            "xid": note_tombstone.sync_xid,
+            "id": str(note_tombstone.entity_id),
+        }
+
+    def test_get_changes_without_changes_keeps_cursor(
+        self, mock_sync_repo: MagicMock
+    ):
+        """Testa se o cursor recebido é devolvido quando nada mudou"""
+        mock_sync_repo.get_changes.return_value = []
+        position = uuid.uuid4()
+        since = encode_cursor({"xid": HORIZON - 1, "id": str(position)})
+        mock_db_session = MagicMock()
+
+        result = SyncService.get_changes_since(mock_db_session, TEST_USER_ID, since)
+
+        mock_sync_repo.get_changes.assert_called_once_with(
+            mock_db_session,
+            TEST_USER_ID,
+            HORIZON,
+            SYNC_DEFAULT_LIMIT,
+            (HORIZON - 1, position),
+        )
+        assert result.next_cursor == since
+        assert result.has_more is False
+        mock_sync_repo.get_entities.assert_not_called()
@@ -2,9 +2,10 @@
 
 import uuid
 
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from src.core.models import Tag
+from src.core.models import Note, Tag, note_tags
 from src.modules.tags.schemas import TagCreate, TagUpdate
 
 
@@ -18,7 +19,6 @@ class TagRepository:
 
         db.add(new_tag)
         db.commit()
-        db.refresh(new_tag)
 
         return new_tag
 
@@ -32,20 +32,46 @@ class TagRepository:
         """Busca e retorna uma tag com o id igual ao passado"""
         return db.query(Tag).filter(Tag.id == tag_id, Tag.user_id == user_id).first()
 
+    @staticmethod
+    def get_existing_tag_ids(
+        db: Session, tag_ids: set[uuid.UUID], user_id: uuid.UUID
+    ) -> set[uuid.UUID]:
+        """Retorna, entre os IDs passados, os das tags que existem para o usuário"""
+        rows = db.query(Tag.id).filter(Tag.id.in_(tag_ids), Tag.user_id == user_id)
+        return {tag_id for (tag_id,) in rows}
+
+    @staticmethod
+    def bump_tagged_note_row_versions(db: Session, tag: Tag):
+        """
+        Incrementa a versão da linha das notas que têm a tag, já que elas retornam
+        o nome da tag e as suas ETags deixam de valer quando ela muda. A versão do
+        conteúdo, base do content_patch, não muda
+        """
+        tagged_note_ids = select(note_tags.c.note_id).where(note_tags.c.tag_id == tag.id)
+        db.execute(
+            update(Note)
+            .where(Note.id.in_(tagged_note_ids))
+            .values(row_version=Note.row_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
     @staticmethod
     def update_tag(db: Session, tag: Tag, tag_update_data: TagUpdate) -> Tag:
         """Atualiza os dados de uma tag"""
         updated_data = tag_update_data.model_dump(exclude_unset=True)
+        name_changed = updated_data.get("name", tag.name) != tag.name
 
         for key, value in updated_data.items():
             setattr(tag, key, value)
 
+        if name_changed:
+            TagRepository.bump_tagged_note_row_versions(db, tag)
         db.commit()
-        db.refresh(tag)
         return tag
 
     @staticmethod
     def delete_tag(db: Session, tag: Tag):
         """Deleta uma tag do Banco"""
+        TagRepository.bump_tagged_note_row_versions(db, tag)
         db.delete(tag)
         db.commit()
@@ -6,6 +6,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.core.cache import user_data_generations
 from src.core.models import Tag
 
 from .repository import TagRepository as tag_repository
@@ -19,7 +20,7 @@ class TagService:
     def create_tag(db: Session, tag_data: TagCreate, user_id: uuid.UUID) -> Tag:
         """Cria uma nova tag"""
         try:
-            return tag_repository.create_tag(db, tag_data, user_id)
+            new_tag = tag_repository.create_tag(db, tag_data, user_id)
         except IntegrityError as err:
             db.rollback()
             raise HTTPException(
@@ -27,6 +28,9 @@ class TagService:
                 detail="Uma tag com esse nome já existe",
             ) from err
 
+        user_data_generations.bump(user_id)
+        return new_tag
+
     @staticmethod
     def get_all_tags(db: Session, user_id: uuid.UUID) -> list[Tag]:
         """Retorna uma lista com todas as tags"""
@@ -42,6 +46,17 @@ class TagService:
             )
         return tag
 
+    @staticmethod
+    def ensure_tags_exist(db: Session, tag_ids: set[uuid.UUID], user_id: uuid.UUID):
+        """Verifica com uma única consulta se todas as tags pertencem ao usuário"""
+        if not tag_ids:
+            return
+
+        if tag_repository.get_existing_tag_ids(db, tag_ids, user_id) != tag_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="A tag não foi encontrada"
+            )
+
     @staticmethod
     def update_tag(
         db: Session, tag_id: uuid.UUID, tag_update_data: TagUpdate, user_id: uuid.UUID
@@ -50,7 +65,7 @@ class TagService:
         tag_to_update = TagService.get_tag_by_id(db, tag_id, user_id)
 
         try:
-            return tag_repository.update_tag(db, tag_to_update, tag_update_data)
+            updated_tag = tag_repository.update_tag(db, tag_to_update, tag_update_data)
         except IntegrityError as err:
             db.rollback()
             raise HTTPException(
@@ -58,8 +73,12 @@ class TagService:
                 detail="Uma tag com esse nome já existe",
             ) from err
 
+        user_data_generations.bump(user_id)
+        return updated_tag
+
     @staticmethod
     def delete_tag(db: Session, tag_id: uuid.UUID, user_id: uuid.UUID):
         """Deleta uma tag do Banco"""
         tag_to_delete = TagService.get_tag_by_id(db, tag_id, user_id)
         tag_repository.delete_tag(db, tag_to_delete)
+        user_data_generations.bump(user_id)
@@ -21,7 +21,6 @@ class TemplateRepository:
 
         db.add(new_template)
         db.commit()
-        db.refresh(new_template)
 
         return new_template
 
@@ -52,7 +51,6 @@ class TemplateRepository:
             setattr(template, key, value)
 
         db.commit()
-        db.refresh(template)
         return template
 
     @staticmethod
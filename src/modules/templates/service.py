@@ -6,6 +6,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.core.cache import user_data_generations
 from src.core.models import Template
 
 from .repository import TemplateRepository as template_repository
@@ -21,7 +22,9 @@ class TemplateService:
     ) -> Template:
         """Cria um novo template e chama o repository para salvar no DB"""
         try:
-            return template_repository.create_template(db, template_data, user_id)
+            new_template = template_repository.create_template(
+                db, template_data, user_id
+            )
         except IntegrityError as err:
             db.rollback()
             raise HTTPException(
@@ -29,6 +32,9 @@ class TemplateService:
                 detail="Um template com esse nome já existe",
             ) from err
 
+        user_data_generations.bump(user_id)
+        return new_template
+
     @staticmethod
     def get_all_templates(db: Session, user_id: uuid.UUID) -> list[Template]:
         """Retornar uma lista com todos os templates"""
@@ -60,7 +66,7 @@ class TemplateService:
         )
 
         try:
-            return template_repository.update_template(
+            updated_template = template_repository.update_template(
                 db, template_to_update, template_update_data
             )
         except IntegrityError as err:
@@ -70,6 +76,9 @@ class TemplateService:
                 detail="Um template com esse nome já existe",
             ) from err
 
+        user_data_generations.bump(user_id)
+        return updated_template
+
     @staticmethod
     def delete_template_by_id(db: Session, template_id: uuid.UUID, user_id: uuid.UUID):
         """Deleta um template existente"""
@@ -77,3 +86,4 @@ class TemplateService:
             db, template_id, user_id
         )
         template_repository.delete_template(db, template_to_delete)
+        user_data_generations.bump(user_id)
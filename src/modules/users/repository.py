@@ -1,14 +1,19 @@
 """Repository para ações relacionadas ao usuário"""
 
 import uuid
+from typing import Iterator
 
+from sqlalchemy import ARRAY, Row, String, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from src.core.models import Notebook, Tag, Template
+from src.core.constants import EXPORT_BATCH_SIZE
+from src.core.models import Note, Notebook, Tag, Template, note_tags
 
 
 class UserRepository:
-    """Agrupa os métodos de banco para limpar os dados de um usuário"""
+    """Agrupa os métodos de banco para limpar, exportar e importar dados do usuário"""
 
     @staticmethod
     def clear_all_user_data(db: Session, user_id: uuid.UUID):
@@ -22,3 +27,127 @@ class UserRepository:
         )
 
         db.commit()
+
+    @staticmethod
+    def stream_user_entities(
+        db: Session, model: type[Notebook | Tag | Template], user_id: uuid.UUID
+    ) -> Iterator[Notebook | Tag | Template]:
+        """
+        Percorre os cadernos, as tags ou os templates de um usuário com um cursor
+        no servidor, em lotes, sem carregar todos de uma vez
+        """
+        query = (
+            select(model)
+            .where(model.user_id == user_id)
+            .order_by(model.name, model.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        yield from db.scalars(query)
+
+    @staticmethod
+    def stream_notes_for_export(db: Session, user_id: uuid.UUID) -> Iterator[Row]:
+        """
+        Percorre as notas de um usuário com um cursor no servidor, em lotes, junto
+        com o nome do caderno e os nomes das tags de cada uma
+        """
+        tag_names = (
+            select(Tag.name)
+            .join(note_tags, note_tags.c.tag_id == Tag.id)
+            .where(note_tags.c.note_id == Note.id)
+            .order_by(Tag.name)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                Note.id,
+                Note.title,
+                Note.content,
+                Note.is_favorite,
+                Note.created_at,
+                Note.updated_at,
+                Notebook.name.label("notebook_name"),
+                func.array(tag_names, type_=ARRAY(String)).label("tag_names"),
+            )
+            .join(Notebook, Notebook.id == Note.notebook_id)
+            .where(Note.user_id == user_id)
+            .order_by(Note.notebook_id, Note.updated_at.desc(), Note.id.desc())
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        yield from db.execute(query)
+
+    @staticmethod
+    def upsert_named_entities(
+        db: Session, model: type[Notebook | Tag], names: set[str], user_id: uuid.UUID
+    ) -> tuple[dict[str, uuid.UUID], int]:
+        """
+        Cria de uma vez os cadernos ou as tags que ainda não existem, deixando o
+        ON CONFLICT da unicidade do nome resolver os que já existem. Retorna o ID
+        de todos pelo nome e a quantidade criada
+        """
+        created_ids = db.scalars(
+            insert(model)
+            .values([{"name": name, "user_id": user_id} for name in names])
+            .on_conflict_do_nothing(index_elements=["user_id", "name"])
+            .returning(model.id)
+        ).all()
+        ids_by_name = db.execute(
+            select(model.name, model.id).where(
+                model.user_id == user_id, model.name.in_(names)
+            )
+        ).all()
+
+        return dict(ids_by_name), len(created_ids)
+
+    @staticmethod
+    def insert_templates(db: Session, template_rows: list[dict]) -> int:
+        """
+        Cria os templates com um único INSERT, ignorando os que já existem com o
+        mesmo nome, e faz o commit junto com o que já foi feito na transação.
+        Retorna a quantidade de templates criados
+        """
+        created_ids = []
+        if template_rows:
+            created_ids = db.scalars(
+                insert(Template)
+                .values(template_rows)
+                .on_conflict_do_nothing(index_elements=["user_id", "name"])
+                .returning(Template.id)
+            ).all()
+        db.commit()
+
+        return len(created_ids)
+
+    @staticmethod
+    def insert_notes(
+        db: Session, note_rows: list[dict], tag_rows: list[dict]
+    ) -> list[uuid.UUID]:
+        """
+        Cria um lote de notas e as suas associações com tags em INSERTs de várias
+        linhas, fazendo o commit do lote. Os IDs vêm prontos em note_rows para
+        ligar as tags. Se o banco recusar o lote, as notas são gravadas uma a uma,
+        cada uma em um savepoint, e o ID das recusadas é retornado
+        """
+        try:
+            with db.begin_nested():
+                db.execute(insert(Note), note_rows)
+                if tag_rows:
+                    db.execute(insert(note_tags), tag_rows)
+        # O psycopg2 levanta ValueError para valores que nem chegam a ser enviados
+        except (SQLAlchemyError, ValueError):
+            rejected_ids = []
+            for note_row in note_rows:
+                note_tag_rows = [
+                    row for row in tag_rows if row["note_id"] == note_row["id"]
+                ]
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(Note), [note_row])
+                        if note_tag_rows:
+                            db.execute(insert(note_tags), note_tag_rows)
+                except (SQLAlchemyError, ValueError):
+                    rejected_ids.append(note_row["id"])
+            db.commit()
+            return rejected_ids
+
+        db.commit()
+        return []
@@ -1,14 +1,19 @@
 """Router para ações relacionadas ao usuário"""
 
+import tempfile
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from src.core.constants import IMPORT_SPOOL_SIZE, ZIP_MEDIA_TYPE
 from src.core.database import get_db
 from src.core.security import get_current_user_id
 
+from .schemas import UserImportResponse
 from .service import UserService as user_service
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -29,3 +34,57 @@ def delete_all_user_data(
     """
     user_service.clear_all_user_data(db, user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get(
+    "/me/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Exporta todos os dados do usuário logado em um zip",
+    responses={status.HTTP_200_OK: {"content": {ZIP_MEDIA_TYPE: {}}}},
+)
+def export_user_data(
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+) -> StreamingResponse:
+    """
+    Envia em stream um zip com as notas em Markdown, organizadas por caderno,
+    e um manifest.json com os cadernos, as tags e os templates
+    """
+    return StreamingResponse(
+        user_service.export_user_data(db, user_id),
+        media_type=ZIP_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="estrato-export.zip"'},
+    )
+
+
+@router.post(
+    "/me/import",
+    response_model=UserImportResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Importa para o usuário logado um zip de notas em Markdown",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                ZIP_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}
+            },
+        }
+    },
+)
+async def import_user_data(
+    request: Request,
+    db: Annotated[Session, Depends(get_db)],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+) -> UserImportResponse:
+    """
+    Recebe o zip no corpo da requisição, como o gerado pela exportação, e cria
+    os cadernos, as tags e as notas dos arquivos Markdown dele. O corpo é gravado
+    em um arquivo temporário, que só fica em memória enquanto for pequeno, e tanto
+    a gravação quanto a importação rodam fora do event loop
+    """
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE) as archive_file:
+        await user_service.receive_archive(request.stream(), archive_file)
+        return await run_in_threadpool(
+            user_service.import_user_data, db, archive_file, user_id
+        )
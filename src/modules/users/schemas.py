@@ -0,0 +1,16 @@
+"""Schemas para o módulo users"""
+
+from pydantic import BaseModel
+
+
+class UserImportResponse(BaseModel):
+    """
+    Schema de retorno com o resumo de uma importação e os arquivos .md que não
+    puderam ser lidos e foram ignorados
+    """
+
+    notebooks_created: int = 0
+    tags_created: int = 0
+    templates_created: int = 0
+    notes_imported: int = 0
+    skipped_files: list[str] = []
@@ -1,10 +1,85 @@
 """Service para ações relacionadas ao usuário"""
 
+import json
+import re
 import uuid
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import PurePosixPath
+from typing import IO, AsyncIterator, Iterator
 
+import yaml
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
+from src.core.cache import user_data_generations
+from src.core.constants import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMAT_VERSION,
+    IMPORT_BATCH_SIZE,
+    IMPORT_DEFAULT_NOTEBOOK_NAME,
+    IMPORT_MAX_ARCHIVE_SIZE,
+    IMPORT_MAX_NOTE_SIZE,
+)
+from src.core.models import Note, Notebook, Tag, Template
+from src.core.zipstream import ZipStream
+from src.modules.notebooks.schemas import NotebookResponse
+from src.modules.tags.schemas import TagResponse
+from src.modules.templates.schemas import TemplateResponse
+
 from .repository import UserRepository as user_repository
+from .schemas import UserImportResponse
+
+# Caracteres que não podem aparecer em nomes de arquivos no Windows, macOS ou Linux
+UNSAFE_FILENAME_CHARACTERS = re.compile(r'[\x00-\x1f<>:"/\\|?*]')
+MAX_FILENAME_LENGTH = 100
+
+MANIFEST_SECTIONS: list[tuple[str, type[Notebook | Tag | Template], type[BaseModel]]] = [
+    ("notebooks", Notebook, NotebookResponse),
+    ("tags", Tag, TagResponse),
+    ("templates", Template, TemplateResponse),
+]
+
+# Front matter YAML no início do arquivo, entre duas linhas "---"
+FRONT_MATTER = re.compile(
+    r"\A---[ \t]*\r?\n(.*?)^---[ \t]*(?:\r?\n|\Z)(?:[ \t]*\r?\n)?",
+    re.DOTALL | re.MULTILINE,
+)
+# Sufixo " (1a2b3c4d)" que a exportação coloca no nome dos arquivos das notas
+EXPORTED_ID_SUFFIX = re.compile(r" \([0-9a-f]{8}\)$")
+
+# Tamanhos das colunas: nomes maiores são cortados em vez de recusar a nota
+MAX_TITLE_LENGTH = Note.__table__.c.title.type.length
+MAX_NOTEBOOK_NAME_LENGTH = Notebook.__table__.c.name.type.length
+MAX_TAG_NAME_LENGTH = Tag.__table__.c.name.type.length
+MAX_TEMPLATE_NAME_LENGTH = Template.__table__.c.name.type.length
+
+
+@dataclass
+class ImportedNote:
+    """Nota lida de um arquivo Markdown do zip importado"""
+
+    path: str
+    title: str
+    content: str
+    notebook: str
+    tags: list[str]
+    is_favorite: bool
+    created_at: datetime | None
+
+
+@dataclass
+class ImportState:
+    """Resumo de uma importação em andamento e os IDs já resolvidos pelo nome"""
+
+    result: UserImportResponse = field(default_factory=UserImportResponse)
+    notebook_ids: dict[str, uuid.UUID] = field(default_factory=dict)
+    tag_ids: dict[str, uuid.UUID] = field(default_factory=dict)
 
 
 class UserService:
@@ -14,3 +89,397 @@ class UserService:
     def clear_all_user_data(db: Session, user_id: uuid.UUID):
         """Chama o repositório para limpar os dados do usuário"""
         user_repository.clear_all_user_data(db, user_id)
+        user_data_generations.bump(user_id)
+
+    @staticmethod
+    def safe_filename(name: str, fallback: str) -> str:
+        """Troca os caracteres proibidos em nomes de arquivos e limita o tamanho"""
+        cleaned = UNSAFE_FILENAME_CHARACTERS.sub("_", name).strip(" .")
+        return cleaned[:MAX_FILENAME_LENGTH].strip() or fallback
+
+    @staticmethod
+    def note_archive_path(note: Row) -> str:
+        """Monta o caminho da nota no zip: uma pasta por caderno e o ID no nome"""
+        notebook = UserService.safe_filename(note.notebook_name, "Caderno")
+        title = UserService.safe_filename(note.title, "Nota")
+        return f"notes/{notebook}/{title} ({note.id.hex[:8]}).md"
+
+    @staticmethod
+    def render_note_markdown(note: Row) -> str:
+        """Gera o Markdown da nota, com os metadados em um front matter YAML"""
+        front_matter = {
+            "id": str(note.id),
+            "title": note.title,
+            "notebook": note.notebook_name,
+            "tags": note.tag_names,
+            "is_favorite": note.is_favorite,
+            "created_at": note.created_at.isoformat(),
+            "updated_at": note.updated_at.isoformat(),
+        }
+        # Valores em JSON também são YAML válido
+        lines = [f"{key}: {json.dumps(value)}" for key, value in front_matter.items()]
+        return "---\n" + "\n".join(lines) + "\n---\n\n" + (note.content or "")
+
+    @staticmethod
+    def write_manifest(
+        archive: ZipStream, db: Session, user_id: uuid.UUID
+    ) -> Iterator[bytes]:
+        """
+        Escreve o manifest.json item a item, retornando os bytes do zip sempre
+        que passarem de EXPORT_CHUNK_SIZE
+        """
+        with archive.open_entry("manifest.json") as manifest:
+            exported_at = datetime.now(timezone.utc).isoformat()
+            manifest.write(
+                f'{{"format_version": {EXPORT_FORMAT_VERSION}, '
+                f'"exported_at": "{exported_at}"'.encode()
+            )
+            for section, model, schema in MANIFEST_SECTIONS:
+                manifest.write(f', "{section}": ['.encode())
+                entities = user_repository.stream_user_entities(db, model, user_id)
+                for index, entity in enumerate(entities):
+                    separator = ", " if index else ""
+                    item = schema.model_validate(entity).model_dump_json()
+                    manifest.write(f"{separator}{item}".encode())
+                    if archive.pending_size >= EXPORT_CHUNK_SIZE:
+                        yield archive.flush()
+                manifest.write(b"]")
+            manifest.write(b"}")
+
+    @staticmethod
+    def export_user_data(db: Session, user_id: uuid.UUID) -> Iterator[bytes]:
+        """
+        Gera em partes um zip com uma pasta Markdown por caderno e um manifest.json
+        com os cadernos, as tags e os templates. Cada consulta usa um cursor no
+        servidor e os bytes são enviados a cada EXPORT_CHUNK_SIZE, então a memória
+        não cresce com o número de notas. A sessão é fechada ao final do stream,
+        já que o corpo da resposta é enviado depois que a dependência get_db é
+        encerrada.
+        """
+        try:
+            with ZipStream() as archive:
+                yield from UserService.write_manifest(archive, db, user_id)
+
+                for note in user_repository.stream_notes_for_export(db, user_id):
+                    archive.write_text(
+                        UserService.note_archive_path(note),
+                        UserService.render_note_markdown(note),
+                        note.updated_at,
+                    )
+                    if archive.pending_size >= EXPORT_CHUNK_SIZE:
+                        yield archive.flush()
+
+                yield archive.finish()
+        finally:
+            db.close()
+
+    @staticmethod
+    async def receive_archive(body: AsyncIterator[bytes], archive_file: IO[bytes]):
+        """
+        Grava em partes o corpo da requisição no arquivo temporário, recusando
+        zips maiores que IMPORT_MAX_ARCHIVE_SIZE. Cada parte é gravada no
+        threadpool, já que o arquivo vai para o disco depois de IMPORT_SPOOL_SIZE
+        """
+        size = 0
+        async for chunk in body:
+            size += len(chunk)
+            if size > IMPORT_MAX_ARCHIVE_SIZE:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="O arquivo enviado é grande demais",
+                )
+            await run_in_threadpool(archive_file.write, chunk)
+
+    @staticmethod
+    def clip_text(value, max_length: int, fallback: str = "") -> str:
+        """
+        Corta um texto do front matter no tamanho da coluna. Valores que não são
+        texto, como listas, números ou mapas, viram o fallback
+        """
+        if not isinstance(value, str):
+            return fallback
+
+        text = value.replace("\x00", "").strip()[:max_length].strip()
+        return text or fallback
+
+    @staticmethod
+    def split_front_matter(text: str) -> tuple[dict, str]:
+        """
+        Separa o front matter YAML do conteúdo da nota. Um front matter inválido
+        é mantido no conteúdo, para que nada do arquivo se perca
+        """
+        match = FRONT_MATTER.match(text)
+        if match is None:
+            return {}, text
+
+        try:
+            metadata = yaml.safe_load(match.group(1)) or {}
+        except yaml.YAMLError:
+            return {}, text
+        if not isinstance(metadata, dict):
+            return {}, text
+
+        return metadata, text[match.end() :]
+
+    @staticmethod
+    def parse_tag_names(value) -> list[str]:
+        """Lê as tags do front matter, em lista ou separadas por vírgula"""
+        if isinstance(value, str):
+            value = value.split(",")
+        if not isinstance(value, list):
+            return []
+
+        names = (
+            UserService.clip_text(name.strip().lstrip("#"), MAX_TAG_NAME_LENGTH)
+            for name in value
+            if isinstance(name, str)
+        )
+        return list(dict.fromkeys(name for name in names if name))
+
+    @staticmethod
+    def parse_datetime(value) -> datetime | None:
+        """Lê uma data do front matter, que o YAML pode já ter convertido"""
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return None
+        if not isinstance(value, datetime):
+            return None
+
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+    @staticmethod
+    def parse_note_markdown(path: str, text: str) -> ImportedNote:
+        """
+        Lê uma nota em Markdown exportada pelo Estrato ou por outra ferramenta.
+        Sem front matter, o caderno é a pasta do arquivo e o título é o nome dele
+        """
+        metadata, content = UserService.split_front_matter(text)
+        file_path = PurePosixPath(path.replace("\\", "/"))
+        file_title = EXPORTED_ID_SUFFIX.sub("", file_path.stem)
+
+        return ImportedNote(
+            path=path,
+            title=UserService.clip_text(metadata.get("title"), MAX_TITLE_LENGTH)
+            or UserService.clip_text(file_title, MAX_TITLE_LENGTH, "Nota"),
+            content=content,
+            notebook=UserService.clip_text(
+                metadata.get("notebook"), MAX_NOTEBOOK_NAME_LENGTH
+            )
+            or UserService.clip_text(
+                file_path.parent.name,
+                MAX_NOTEBOOK_NAME_LENGTH,
+                IMPORT_DEFAULT_NOTEBOOK_NAME,
+            ),
+            tags=UserService.parse_tag_names(metadata.get("tags")),
+            is_favorite=metadata.get("is_favorite") is True,
+            created_at=UserService.parse_datetime(metadata.get("created_at")),
+        )
+
+    @staticmethod
+    def read_archive_note(
+        archive: zipfile.ZipFile, info: zipfile.ZipInfo
+    ) -> ImportedNote | None:
+        """
+        Lê uma nota do zip, ou retorna None se o arquivo for grande demais, não
+        estiver em UTF-8 ou não puder ser descomprimido
+        """
+        if info.file_size > IMPORT_MAX_NOTE_SIZE:
+            return None
+
+        try:
+            with archive.open(info) as file:
+                # O tamanho declarado no zip pode ser falso, então a leitura tem limite
+                data = file.read(IMPORT_MAX_NOTE_SIZE + 1)
+            # O Postgres não aceita o caractere NUL em colunas de texto
+            text = data.decode("utf-8-sig").replace("\x00", "")
+        except (zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError):
+            # RuntimeError é o que o zipfile levanta para arquivos com senha
+            return None
+        except UnicodeDecodeError:
+            return None
+        if len(data) > IMPORT_MAX_NOTE_SIZE:
+            return None
+
+        return UserService.parse_note_markdown(info.filename, text)
+
+    @staticmethod
+    def read_manifest(archive: zipfile.ZipFile) -> dict:
+        """Lê o manifest.json de um zip exportado pelo Estrato, se houver um válido"""
+        try:
+            with archive.open("manifest.json") as file:
+                # Um manifest maior que o limite fica truncado e é ignorado
+                manifest = json.loads(file.read(IMPORT_MAX_ARCHIVE_SIZE))
+        except (KeyError, ValueError, zipfile.BadZipFile, zlib.error):
+            return {}
+
+        return manifest if isinstance(manifest, dict) else {}
+
+    @staticmethod
+    def ensure_named_entities(
+        db: Session,
+        model: type[Notebook | Tag],
+        names: set[str],
+        known_ids: dict[str, uuid.UUID],
+        user_id: uuid.UUID,
+    ) -> int:
+        """
+        Garante que os cadernos ou as tags existam, indo ao banco só com os nomes
+        ainda não resolvidos na importação. Retorna a quantidade criada
+        """
+        missing_names = names - known_ids.keys()
+        if not missing_names:
+            return 0
+
+        ids_by_name, created = user_repository.upsert_named_entities(
+            db, model, missing_names, user_id
+        )
+        known_ids.update(ids_by_name)
+        return created
+
+    @staticmethod
+    def import_manifest(
+        db: Session, manifest: dict, user_id: uuid.UUID, state: ImportState
+    ):
+        """
+        Cria em uma transação os cadernos, as tags e os templates listados no
+        manifest.json, inclusive os que não têm notas
+        """
+
+        def items(section: str) -> list[dict]:
+            entries = manifest.get(section)
+            if not isinstance(entries, list):
+                return []
+            return [entry for entry in entries if isinstance(entry, dict)]
+
+        notebook_names = {
+            UserService.clip_text(item.get("name"), MAX_NOTEBOOK_NAME_LENGTH)
+            for item in items("notebooks")
+        }
+        tag_names = {
+            UserService.clip_text(item.get("name"), MAX_TAG_NAME_LENGTH)
+            for item in items("tags")
+        }
+        template_rows = [
+            {
+                "name": UserService.clip_text(
+                    item.get("name"), MAX_TEMPLATE_NAME_LENGTH, "Template"
+                ),
+                "content": (
+                    item["content"].replace("\x00", "")
+                    if isinstance(item.get("content"), str)
+                    else None
+                ),
+                "user_id": user_id,
+            }
+            for item in items("templates")
+        ]
+
+        state.result.notebooks_created += UserService.ensure_named_entities(
+            db, Notebook, notebook_names - {""}, state.notebook_ids, user_id
+        )
+        state.result.tags_created += UserService.ensure_named_entities(
+            db, Tag, tag_names - {""}, state.tag_ids, user_id
+        )
+        state.result.templates_created += user_repository.insert_templates(
+            db, template_rows
+        )
+        user_data_generations.bump(user_id)
+
+    @staticmethod
+    def import_notes_batch(
+        db: Session, notes: list[ImportedNote], user_id: uuid.UUID, state: ImportState
+    ):
+        """
+        Grava um lote de notas em uma transação: os cadernos e as tags que faltam
+        com um upsert cada e as notas e as suas tags com INSERTs de várias linhas.
+        As notas que o banco recusar entram em skipped_files
+        """
+        state.result.notebooks_created += UserService.ensure_named_entities(
+            db, Notebook, {note.notebook for note in notes}, state.notebook_ids, user_id
+        )
+        state.result.tags_created += UserService.ensure_named_entities(
+            db,
+            Tag,
+            {tag for note in notes for tag in note.tags},
+            state.tag_ids,
+            user_id,
+        )
+
+        note_rows = []
+        tag_rows = []
+        paths_by_id = {}
+        for note in notes:
+            note_id = uuid.uuid4()
+            paths_by_id[note_id] = note.path
+            note_row = {
+                "id": note_id,
+                "title": note.title,
+                "content": note.content,
+                "is_favorite": note.is_favorite,
+                "notebook_id": state.notebook_ids[note.notebook],
+                "user_id": user_id,
+            }
+            # O updated_at fica com o horário da importação, para aparecer no /sync
+            if note.created_at is not None:
+                note_row["created_at"] = note.created_at
+            note_rows.append(note_row)
+            tag_rows.extend(
+                {"note_id": note_id, "tag_id": state.tag_ids[tag]} for tag in note.tags
+            )
+
+        rejected_ids = user_repository.insert_notes(db, note_rows, tag_rows)
+        # Cada lote já está confirmado, mesmo que a importação falhe mais adiante
+        user_data_generations.bump(user_id)
+        state.result.notes_imported += len(notes) - len(rejected_ids)
+        state.result.skipped_files.extend(
+            paths_by_id[note_id] for note_id in rejected_ids
+        )
+
+    @staticmethod
+    def import_user_data(
+        db: Session, archive_file: IO[bytes], user_id: uuid.UUID
+    ) -> UserImportResponse:
+        """
+        Importa um zip de arquivos Markdown com front matter. Os arquivos são lidos
+        um a um e gravados em lotes de IMPORT_BATCH_SIZE notas, cada lote em uma
+        transação. Cadernos e tags com nomes já existentes são reaproveitados. Se
+        houver o manifest.json da exportação, os cadernos, as tags e os templates
+        dele também são criados. As notas sempre ganham IDs novos
+        """
+        try:
+            archive = zipfile.ZipFile(archive_file)
+        except zipfile.BadZipFile as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="O arquivo enviado não é um zip válido",
+            ) from exc
+
+        state = ImportState()
+        with archive:
+            manifest = UserService.read_manifest(archive)
+            if manifest:
+                UserService.import_manifest(db, manifest, user_id, state)
+
+            batch: list[ImportedNote] = []
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(".md"):
+                    continue
+                if info.filename.startswith("__MACOSX/"):
+                    continue
+
+                note = UserService.read_archive_note(archive, info)
+                if note is None:
+                    state.result.skipped_files.append(info.filename)
+                    continue
+
+                batch.append(note)
+                if len(batch) == IMPORT_BATCH_SIZE:
+                    UserService.import_notes_batch(db, batch, user_id, state)
+                    batch = []
+
+            if batch:
+                UserService.import_notes_batch(db, batch, user_id, state)
+
+        return state.result
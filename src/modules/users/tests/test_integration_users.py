@@ -0,0 +1,246 @@
+"""Arquivo com os testes de integração dos endpoints de Users"""
+
+import io
+import json
+import secrets
+import zipfile
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.core.constants import EXPORT_FORMAT_VERSION
+from src.modules.users.service import UserService
+
+
+class TestUserRoutes:
+    """Agrupa todos os testes para as rotas do módulo Users."""
+
+    def test_export_streams_zip_with_notes_and_manifest(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        created_template: dict,
+        auth_headers: dict,
+    ):
+        """
+        Testa se a exportação gera um zip com uma pasta por caderno, as notas em
+        Markdown com as tags no front matter e o manifest com os demais dados
+        """
+        notebook_id = created_notebook["id"]
+        note = client.post(
+            f"/notebooks/{notebook_id}/notes/",
+            json={"title": "Ata: reunião 1/2", "content": "# Pauta\n\n- item"},
+            headers=auth_headers,
+        ).json()
+        tag = client.post(
+            "/tags/", json={"name": "Trabalho"}, headers=auth_headers
+        ).json()
+        client.post(
+            f"/notebooks/{notebook_id}/notes/{note['id']}/tags/{tag['id']}",
+            headers=auth_headers,
+        )
+
+        with client.stream("GET", "/users/me/export", headers=auth_headers) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/zip"
+            assert "attachment" in response.headers["content-disposition"]
+            body = response.read()
+
+        note_path = (
+            f"notes/{created_notebook['name']}/Ata_ reunião 1_2 ({note['id'][:8]}).md"
+        )
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            manifest = json.loads(archive.read("manifest.json"))
+            markdown = archive.read(note_path).decode()
+
+        assert manifest["format_version"] == EXPORT_FORMAT_VERSION
+        assert [item["id"] for item in manifest["notebooks"]] == [notebook_id]
+        assert [item["name"] for item in manifest["tags"]] == ["Trabalho"]
+        assert [item["content"] for item in manifest["templates"]] == [
+            created_template["content"]
+        ]
+        assert markdown.startswith("---\n")
+        assert f'id: "{note["id"]}"' in markdown
+        assert 'tags: ["Trabalho"]' in markdown
+        assert markdown.endswith("---\n\n# Pauta\n\n- item")
+
+    def test_export_without_data_returns_only_manifest(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """Testa se a exportação de um usuário sem dados gera um zip válido"""
+        response = client.get("/users/me/export", headers=auth_headers)
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            names = archive.namelist()
+            manifest = json.loads(archive.read("manifest.json"))
+
+        assert response.status_code == 200
+        assert names == ["manifest.json"]
+        assert manifest["notebooks"] == manifest["tags"] == manifest["templates"] == []
+
+    def test_import_of_export_reuses_notebooks_and_tags(
+        self,
+        client: TestClient,
+        created_notebook: dict,
+        created_template: dict,
+        auth_headers: dict,
+    ):
+        """
+        Testa se reimportar uma exportação reaproveita os cadernos, as tags e os
+        templates existentes e recria as notas com IDs novos e as mesmas tags
+        """
+        notebook_id = created_notebook["id"]
+        note = client.post(
+            f"/notebooks/{notebook_id}/notes/",
+            json={"title": "Ata", "content": "# Pauta\n\n- item"},
+            headers=auth_headers,
+        ).json()
+        tag = client.post(
+            "/tags/", json={"name": "Trabalho"}, headers=auth_headers
+        ).json()
+        client.post(
+            f"/notebooks/{notebook_id}/notes/{note['id']}/tags/{tag['id']}",
+            headers=auth_headers,
+        )
+        archive = client.get("/users/me/export", headers=auth_headers).content
+
+        response = client.post(
+            "/users/me/import",
+            content=archive,
+            headers={**auth_headers, "Content-Type": "application/zip"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "notebooks_created": 0,
+            "tags_created": 0,
+            "templates_created": 0,
+            "notes_imported": 1,
+            "skipped_files": [],
+        }
+        notes = client.get(
+            f"/notebooks/{notebook_id}/notes/", headers=auth_headers
+        ).json()["notes"]
+        imported = next(item for item in notes if item["id"] != note["id"])
+        assert len(notes) == 2
+        assert imported["title"] == note["title"]
+        assert imported["content"] == note["content"]
+        assert imported["created_at"] == note["created_at"]
+        assert [item["id"] for item in imported["tags"]] == [tag["id"]]
+        templates = client.get("/templates/", headers=auth_headers).json()
+        assert [item["id"] for item in templates] == [created_template["id"]]
+
+    def test_import_markdown_from_other_tools(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """
+        Testa se arquivos sem front matter usam a pasta como caderno e o nome do
+        arquivo como título, e se arquivos ilegíveis são ignorados e listados
+        """
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr(
+                "Vault/Projetos/Plano.md",
+                "---\ntags: [obra, '#casa']\nis_favorite: true\n---\n# Etapas",
+            )
+            archive.writestr("Vault/Solta.md", "Sem metadados")
+            archive.writestr("Vault/imagem.png", b"\x89PNG")
+            archive.writestr("Vault/quebrada.md", b"\xff\xfe\xfa")
+
+        response = client.post(
+            "/users/me/import", content=buffer.getvalue(), headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "notebooks_created": 2,
+            "tags_created": 2,
+            "templates_created": 0,
+            "notes_imported": 2,
+            "skipped_files": ["Vault/quebrada.md"],
+        }
+        notes = client.get("/notes/", headers=auth_headers).json()["notes"]
+        notebooks = client.get("/notebooks/", headers=auth_headers).json()
+        notebook_names = {item["id"]: item["name"] for item in notebooks}
+        imported = {
+            item["title"]: (notebook_names[item["notebook_id"]], item) for item in notes
+        }
+        assert imported["Plano"][0] == "Projetos"
+        assert imported["Plano"][1]["is_favorite"] is True
+        assert imported["Plano"][1]["content"] == "# Etapas"
+        assert {item["name"] for item in imported["Plano"][1]["tags"]} == {
+            "obra",
+            "casa",
+        }
+        assert imported["Solta"][0] == "Vault"
+        assert imported["Solta"][1]["content"] == "Sem metadados"
+
+    def test_import_cleans_notes_the_database_would_refuse(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """
+        Testa se caracteres NUL são removidos, se metadados que não são texto dão
+        lugar à pasta e ao nome do arquivo e se uma nota com muitos termos
+        distintos é importada
+        """
+        dense_content = " ".join(secrets.token_hex(4) for _ in range(200_000))
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("Vault/nul.md", "Antes\x00depois")
+            archive.writestr(
+                "Vault/Lista.md", "---\ntitle: [1, 2]\nnotebook: {a: 1}\n---\nTexto"
+            )
+            archive.writestr("Vault/densa.md", dense_content)
+
+        response = client.post(
+            "/users/me/import", content=buffer.getvalue(), headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["notes_imported"] == 3
+        assert response.json()["skipped_files"] == []
+        notes = client.get("/notes/", headers=auth_headers).json()["notes"]
+        notebooks = client.get("/notebooks/", headers=auth_headers).json()
+        assert [item["name"] for item in notebooks] == ["Vault"]
+        imported = {item["title"]: item["content"] for item in notes}
+        assert imported["nul"] == "Antesdepois"
+        assert imported["Lista"] == "Texto"
+        assert imported["densa"] == dense_content
+
+    def test_import_skips_notes_refused_by_the_database(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """
+        Testa se uma nota recusada pelo banco é listada em skipped_files sem
+        impedir a gravação das outras notas do mesmo lote
+        """
+        read_archive_note = UserService.read_archive_note
+
+        def read_with_nul(archive, info):
+            note = read_archive_note(archive, info)
+            if info.filename == "ruim.md":
+                note.content = "\x00"
+            return note
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("boa.md", "Texto")
+            archive.writestr("ruim.md", "Texto")
+
+        with patch.object(UserService, "read_archive_note", side_effect=read_with_nul):
+            response = client.post(
+                "/users/me/import", content=buffer.getvalue(), headers=auth_headers
+            )
+
+        assert response.status_code == 200
+        assert response.json()["notes_imported"] == 1
+        assert response.json()["skipped_files"] == ["ruim.md"]
+        notes = client.get("/notes/", headers=auth_headers).json()["notes"]
+        assert [item["title"] for item in notes] == ["boa"]
+
+    def test_import_rejects_invalid_zip(self, client: TestClient, auth_headers: dict):
+        """Testa se um corpo que não é um zip é recusado"""
+        response = client.post(
+            "/users/me/import", content=b"nao e um zip", headers=auth_headers
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,206 @@
+"""Arquivo com os testes unitários do service de Users"""
+
+import io
+import secrets
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.constants import IMPORT_DEFAULT_NOTEBOOK_NAME
+from src.modules.users.service import UserService
+
+TEST_USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def mock_user_repo():
+    """Retorna um mock do repository de users"""
+    with patch(
+        "src.modules.users.service.user_repository", new_callable=MagicMock
+    ) as mock:
+        yield mock
+
+
+def make_note(index: int) -> SimpleNamespace:
+    """Cria uma linha de nota como a retornada pelo repository"""
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        title=f"Nota {index}",
+        content=secrets.token_hex(20_000),
+        is_favorite=False,
+        created_at=now,
+        updated_at=now,
+        notebook_name="Caderno",
+        tag_names=[],
+    )
+
+
+class TestUnitUserService:
+    """Agrupa todos os testes unitários para o UserService."""
+
+    @pytest.mark.parametrize(
+        "name, expected",
+        [
+            ("Projetos", "Projetos"),
+            ('a/b\\c:d*e?f"g<h>i|j', "a_b_c_d_e_f_g_h_i_j"),
+            ("  ..  ", "Padrão"),
+            ("x" * 300, "x" * 100),
+        ],
+    )
+    def test_safe_filename(self, name: str, expected: str):
+        """Testa se os nomes viram nomes de arquivo válidos em qualquer sistema"""
+        assert UserService.safe_filename(name, "Padrão") == expected
+
+    def test_export_user_data_streams_in_chunks(self, mock_user_repo: MagicMock):
+        """
+        Testa se o zip é enviado em várias partes enquanto as notas são lidas,
+        e se a sessão é fechada ao final do stream
+        """
+        mock_db_session = MagicMock()
+        notes = [make_note(index) for index in range(20)]
+        mock_user_repo.stream_user_entities.return_value = iter([])
+        mock_user_repo.stream_notes_for_export.return_value = iter(notes)
+
+        chunks = list(UserService.export_user_data(mock_db_session, TEST_USER_ID))
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            names = archive.namelist()
+
+        assert len(chunks) > 1
+        assert len(names) == len(notes) + 1
+        mock_db_session.close.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "path, text, expected",
+        [
+            (
+                "notes/Caderno/Ata (1a2b3c4d).md",
+                '---\ntitle: "Ata: 1/2"\nnotebook: "Reuniões"\n'
+                'tags: ["a", "b", "a"]\n---\n\nTexto',
+                {
+                    "title": "Ata: 1/2",
+                    "notebook": "Reuniões",
+                    "tags": ["a", "b"],
+                    "content": "Texto",
+                },
+            ),
+            (
+                "Pasta\\Sub\\Ideia (rascunho).md",
+                "\n---\ntags: x\n---\n",
+                {
+                    "title": "Ideia (rascunho)",
+                    "notebook": "Sub",
+                    "tags": [],
+                    "content": "\n---\ntags: x\n---\n",
+                },
+            ),
+            (
+                "solta.md",
+                '---\ntags: "um, #dois, muito-longo-para-uma-tag"\n---\n',
+                {
+                    "title": "solta",
+                    "notebook": IMPORT_DEFAULT_NOTEBOOK_NAME,
+                    "tags": ["um", "dois", "muito-longo-para-uma"],
+                    "content": "",
+                },
+            ),
+            (
+                "Caderno/Lista.md",
+                "---\ntitle: [1, 2]\nnotebook: {a: 1}\ntags: [1, \"ok\", null]\n---\n",
+                {
+                    "title": "Lista",
+                    "notebook": "Caderno",
+                    "tags": ["ok"],
+                    "content": "",
+                },
+            ),
+            (
+                "sem-pasta.md",
+                "---\ntitle: 42\nnotebook: [x]\n---\nA\x00B",
+                {
+                    "title": "sem-pasta",
+                    "notebook": IMPORT_DEFAULT_NOTEBOOK_NAME,
+                    "tags": [],
+                    "content": "A\x00B",
+                },
+            ),
+            (
+                "Caderno/x.md",
+                "---\n: [inválido\n---\nTexto",
+                {
+                    "title": "x",
+                    "notebook": "Caderno",
+                    "tags": [],
+                    "content": "---\n: [inválido\n---\nTexto",
+                },
+            ),
+        ],
+    )
+    def test_parse_note_markdown(self, path: str, text: str, expected: dict):
+        """
+        Testa se os metadados vêm do front matter e, na falta deles ou se não forem
+        texto, da pasta e do nome do arquivo, mantendo no conteúdo um front matter
+        inválido
+        """
+        note = UserService.parse_note_markdown(path, text)
+
+        assert {key: getattr(note, key) for key in expected} == expected
+
+    def test_import_user_data_writes_notes_in_batches(self, mock_user_repo: MagicMock):
+        """
+        Testa se as notas são gravadas em lotes e se os cadernos já resolvidos em
+        um lote não são consultados de novo nos seguintes
+        """
+        mock_db_session = MagicMock()
+        notebook_id = uuid.uuid4()
+        mock_user_repo.upsert_named_entities.return_value = (
+            {"Caderno": notebook_id},
+            1,
+        )
+        mock_user_repo.insert_notes.return_value = []
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for index in range(5):
+                archive.writestr(f"Caderno/Nota {index}.md", f"Conteúdo {index}")
+
+        with patch("src.modules.users.service.IMPORT_BATCH_SIZE", 2):
+            result = UserService.import_user_data(
+                mock_db_session, buffer, TEST_USER_ID
+            )
+
+        batch_sizes = [
+            len(call.args[1]) for call in mock_user_repo.insert_notes.call_args_list
+        ]
+        assert batch_sizes == [2, 2, 1]
+        mock_user_repo.upsert_named_entities.assert_called_once()
+        assert result.notebooks_created == 1
+        assert result.notes_imported == 5
+
+    def test_import_user_data_bumps_generation_for_each_committed_batch(
+        self, mock_user_repo: MagicMock
+    ):
+        """
+        Testa se os caches do usuário são invalidados a cada lote gravado, mesmo
+        quando um lote seguinte falha
+        """
+        mock_user_repo.upsert_named_entities.return_value = (
+            {"Caderno": uuid.uuid4()},
+            1,
+        )
+        mock_user_repo.insert_notes.side_effect = [[], RuntimeError("falha")]
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for index in range(4):
+                archive.writestr(f"Caderno/Nota {index}.md", f"Conteúdo {index}")
+
+        with patch("src.modules.users.service.IMPORT_BATCH_SIZE", 2), patch(
+            "src.modules.users.service.user_data_generations"
+        ) as generations:
+            with pytest.raises(RuntimeError):
+                UserService.import_user_data(MagicMock(), buffer, TEST_USER_ID)
+
+        generations.bump.assert_called_once_with(TEST_USER_ID)